@@ -11,6 +11,10 @@ setup(
     package_dir={"": "src"},
     python_requires=">=3.8",
     install_requires=[],
+    extras_require={
+        "milp": ["pulp<4"],
+        "simulation": ["numpy"],
+    },
     tests_require=["pytest"],
 )
 
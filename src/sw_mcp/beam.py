@@ -0,0 +1,140 @@
+"""근사 탐색 (빔 서치 + 룬 교체 언덕 오르기, mode="fast")"""
+
+from typing import List, Tuple
+from .index import SlotIndex
+from .state import Frontier, trace_choices
+from .scoring import score_from_totals, set_signature_feasible
+from .constraints import bound_vector, floor_vector
+from .collectors import TopCollector
+
+
+class BeamSearch:
+    """
+    슬롯 1~6 빔 서치 후 상위 빌드를 룬 교체로 개선하는 근사 탐색
+
+    - 빔 서치: 슬롯마다 부분 빌드를 확장하고, 제약 조건/세트 조건을 만족할 수 없는
+      상태는 버린 뒤 objective 상한(SearchEngine과 같은 상한 벡터)이 큰 beam_width개만 남긴다.
+    - 언덕 오르기: 수집기의 상위 빌드마다 한 슬롯의 룬을 바꿔 objective가 가장 크게
+      좋아지는 교체를 더 이상 개선이 없을 때까지 반복한다.
+    - 최적성 상한: 빔 폭 때문에 버린 상태의 상한 중 최대값과 찾은 최고값 중 큰 값.
+      이보다 좋은 빌드는 존재할 수 없다 (제약/세트 조건으로 버린 상태는 해가 없으므로 제외).
+
+    TopCollector(top_n / all_at_best)만 지원한다.
+    """
+
+    def __init__(self, index: SlotIndex, target: str = "B", base_atk: int = 900,
+                 base_spd: int = 104, beam_width: int = 200, max_rounds: int = 20):
+        self.index = index
+        self.target = target
+        self.base_atk = base_atk
+        self.base_spd = base_spd
+        self.beam_width = beam_width
+        self.max_rounds = max_rounds
+
+    def run(self, collector: TopCollector) -> float:
+        """
+        빔 서치 + 언덕 오르기로 collector를 채운다
+        Returns: objective 최적값의 상한 (찾은 빌드가 없고 버린 상태도 없으면 -inf)
+        """
+        discarded = self._beam(collector)
+        self._hill_climb(collector)
+        best = max((collector.value(r["score"], r["stats"]) for r in collector.results()),
+                   default=float("-inf"))
+        return max(best, discarded)
+
+    def _beam(self, collector: TopCollector) -> float:
+        """빔 서치 후 완성 빌드를 collector에 넣고, 빔 폭 때문에 버린 상태의 최대 상한 반환"""
+        index = self.index
+        plan = collector.plan
+        objective_index = collector.objective_index
+        discarded = float("-inf")
+        frontiers = [Frontier.root()]
+
+        for slot in range(1, 7):
+            previous = frontiers[-1]
+            remaining_max = index.suffix_max[slot + 1]
+            remaining_min = index.suffix_min[slot + 1]
+            vectors = index.vectors[slot]
+            slot_counts = index.set_counts[slot]
+            candidates = []  # (objective 상한, 부모 상태, 후보 인덱스)
+            for i in range(len(previous)):
+                totals = previous.totals(i)
+                counts = previous.set_counts(i)
+                for k in range(index.cr_feasible_count(slot, totals[0])):
+                    child_counts = tuple(a + b for a, b in zip(counts, slot_counts[k]))
+                    if not set_signature_feasible(child_counts, 6 - slot, self.target):
+                        continue
+                    child_totals = tuple(a + b for a, b in zip(totals, vectors[k]))
+                    bound = bound_vector(child_totals, child_counts, slot, remaining_max,
+                                         self.base_atk, self.base_spd)
+                    floor = None
+                    if plan.needs_floor:
+                        floor = floor_vector(child_totals, remaining_min, self.base_atk, self.base_spd)
+                    if not plan.admits(bound, floor):
+                        continue
+                    candidates.append((bound[objective_index], i, k))
+
+            if len(candidates) > self.beam_width:
+                candidates.sort(reverse=True)
+                discarded = max(discarded, candidates[self.beam_width][0])
+                del candidates[self.beam_width:]
+
+            frontier = Frontier()
+            for _, i, k in candidates:
+                frontier.append(i, k, vectors[k], slot_counts[k], previous)
+            frontiers.append(frontier)
+
+        for i in range(len(frontiers[-1])):
+            self._offer(collector, trace_choices(frontiers, i))
+        return discarded
+
+    def _totals(self, positions: List[int]) -> Tuple[List[float], List[int]]:
+        """슬롯별 후보 인덱스의 스탯 벡터 합과 세트 개수"""
+        index = self.index
+        totals = [0.0] * 5
+        counts = [0] * 4
+        for slot, k in zip(range(1, 7), positions):
+            totals = [a + b for a, b in zip(totals, index.vectors[slot][k])]
+            counts = [a + b for a, b in zip(counts, index.set_counts[slot][k])]
+        return totals, counts
+
+    def _offer(self, collector: TopCollector, positions: List[int]) -> None:
+        totals, counts = self._totals(positions)
+        assignment, score, stats = score_from_totals(tuple(totals), tuple(counts),
+                                                     self.target, self.base_atk)
+        if score > 0:
+            # seed: 빔/언덕 오르기에서 같은 빌드를 여러 번 만나도 한 번만 채택
+            runes = [self.index.runes[slot][k] for slot, k in zip(range(1, 7), positions)]
+            collector.seed(score, stats, assignment, runes)
+
+    def _hill_climb(self, collector: TopCollector) -> None:
+        """상위 빌드마다 한 슬롯 룬 교체로 objective를 개선 (최선 개선 우선)"""
+        index = self.index
+        plan = collector.plan
+        for result in collector.results():
+            positions = [index.locate(rune.rune_id)[1] for rune in result["runes"]]
+            current = collector.value(result["score"], result["stats"])
+            for _ in range(self.max_rounds):
+                totals, counts = self._totals(positions)
+                best_move = None
+                for slot in range(1, 7):
+                    # 이 슬롯의 룬을 뺀 나머지 합에 후보 룬을 더해 평가
+                    original = positions[slot - 1]
+                    rest_totals = [a - b for a, b in zip(totals, index.vectors[slot][original])]
+                    rest_counts = [a - b for a, b in zip(counts, index.set_counts[slot][original])]
+                    for k, (vector, slot_counts) in enumerate(zip(index.vectors[slot], index.set_counts[slot])):
+                        if k == original:
+                            continue
+                        _, score, stats = score_from_totals(
+                            tuple(a + b for a, b in zip(rest_totals, vector)),
+                            tuple(a + b for a, b in zip(rest_counts, slot_counts)),
+                            self.target, self.base_atk)
+                        if score > 0 and plan.accepts(stats):
+                            value = collector.value(score, stats)
+                            if value > current:
+                                current = value
+                                best_move = (slot, k)
+                if best_move is None:
+                    break
+                positions[best_move[0] - 1] = best_move[1]
+                self._offer(collector, positions)
@@ -0,0 +1,661 @@
+"""탐색 결과 수집기 (쿼리별 pruning 조건 + 결과 보관)"""
+
+import bisect
+import heapq
+from typing import List, Dict, Tuple, Optional
+from .constraints import BOUND_INDEX, ConstraintPlan
+
+# PARETO 모드에서 비교할 수 있는 스탯
+PARETO_STATS = ("SCORE", "SPD", "CR", "CD", "ATK_PCT", "ATK_FLAT", "ATK_BONUS", "ATK_TOTAL")
+
+# objective -> 결과 stats 키
+OBJECTIVE_STAT_KEY = {
+    "ATK_TOTAL": "atk_total",
+    "ATK_BONUS": "atk_bonus",
+    "CD": "cd_total",
+}
+
+def build_metrics(score: float, stats: dict, base_spd: int) -> Dict[str, float]:
+    """완성된 빌드의 스탯 값 (optimistic_stats와 같은 키, SPD는 기본 속도 포함)"""
+    return {
+        "SCORE": score,
+        "SPD": base_spd + stats["spd_total"],
+        "CR": stats["cr_total"],
+        "CD": stats["cd_total"],
+        "ATK_PCT": stats["atk_pct_total"],
+        "ATK_FLAT": stats["atk_flat_total"],
+        "ATK_BONUS": stats["atk_bonus"],
+        "ATK_TOTAL": stats["atk_total"],
+    }
+
+
+def _build_key(runes: List) -> Tuple[int, ...]:
+    """빌드 식별 키 (슬롯 순서 rune_id)"""
+    return tuple(rune.rune_id for rune in runes)
+
+
+def objective_value(result: Dict, objective: str) -> float:
+    """결과의 objective 값 (알 수 없는 objective는 SCORE)"""
+    key = OBJECTIVE_STAT_KEY.get(objective)
+    if key is None:
+        return result["score"]
+    return result["stats"][key]
+
+
+def dominates(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    """a가 b를 지배하는지 (모든 스탯 >= 이고 하나 이상 >)"""
+    return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+
+def front_dominates(front: List[Dict], vector: Tuple[float, ...]) -> bool:
+    """비지배 집합의 어떤 빌드가 vector를 지배하는지"""
+    return any(dominates(result["pareto_vector"], vector) for result in front)
+
+
+def update_front(front: List[Dict], result: Dict) -> List[Dict]:
+    """비지배 집합에 빌드 추가 (지배당하면 그대로, 지배하는 빌드는 제거)"""
+    vector = result["pareto_vector"]
+    if front_dominates(front, vector):
+        return front
+    front = [r for r in front if not dominates(vector, r["pareto_vector"])]
+    front.append(result)
+    return front
+
+
+def validate_pareto_stats(pareto_stats: Optional[List[str]]) -> List[str]:
+    """PARETO 비교 스탯 검증 (기본값 ["SPD", "SCORE"])"""
+    pareto_stats = list(pareto_stats or ["SPD", "SCORE"])
+    if not 2 <= len(pareto_stats) <= 3:
+        raise ValueError(f"pareto_stats는 2~3개여야 합니다: {pareto_stats}")
+    for name in pareto_stats:
+        if name not in PARETO_STATS:
+            raise ValueError(f"알 수 없는 pareto 스탯: {name}")
+    return pareto_stats
+
+
+class TopCollector:
+    """
+    objective 상위 결과 수집기 (return_policy "top_n" / "all_at_best")
+
+    - top_n: objective 상위 top_n개를 최소 힙으로 유지하고, 힙이 차면
+      objective 상한이 N번째 값 이하인 서브트리를 잘라낸다.
+    - all_at_best: 최고 objective 값의 결과만 (앞에서부터 top_n개) 유지하고,
+      상한이 현재 최고값보다 낮은 서브트리를 잘라낸다.
+    같은 값이면 먼저 찾은 결과가 앞에 온다. max_results는 채택된 결과 수 제한이다.
+    raise_floor로 다른 탐색(분산 탐색의 다른 작업자)이 이미 확보한 임계값을 받으면
+    그보다 나을 수 없는 서브트리도 잘라낸다.
+    """
+
+    uses_picks = False
+
+    def __init__(self, constraints: Dict[str, float] = None, objective: str = "SCORE",
+                 top_n: int = 20, return_policy: str = "top_n",
+                 max_results: Optional[int] = 2000, base_spd: int = 104):
+        self.plan = ConstraintPlan(constraints, base_spd)
+        self.objective = objective
+        self.objective_key = OBJECTIVE_STAT_KEY.get(objective)
+        # 상한 벡터 인덱스도 value와 같은 표에서 정한다 (OBJECTIVE_STAT_KEY에 없는 objective는 SCORE)
+        self.objective_index = BOUND_INDEX[objective] if self.objective_key is not None else BOUND_INDEX["SCORE"]
+        self.top_n = top_n
+        self.all_at_best = return_policy == "all_at_best"
+        self.max_results = max_results
+        self.accepted = 0
+        self._seq = 0
+        self._heap = []  # top_n: (value, -순번, result) 최소 힙
+        self._best_value = None  # all_at_best: 현재 최고값
+        self._best = []  # all_at_best: 최고값 결과
+        self._seeded = set()  # 시드로 넣은 빌드 (rune_id 튜플)
+        self._floor = None  # 외부 임계값 (raise_floor)
+
+    @property
+    def done(self) -> bool:
+        """더 이상 결과를 받지 않는지"""
+        return self.max_results is not None and self.accepted >= self.max_results
+
+    def raise_floor(self, value: float) -> None:
+        """
+        외부에서 확보한 objective 임계값으로 올리기
+        top_n: 이 값 이하, all_at_best: 이 값 미만의 빌드는 더 이상 받지 않는다.
+        """
+        if self._floor is None or value > self._floor:
+            self._floor = value
+
+    def admits(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]] = None) -> bool:
+        """상한/하한 벡터로 서브트리가 아직 결과를 낼 수 있는지 (floor는 최대 조건이 있을 때만)"""
+        if not self.plan.admits(bound, floor):
+            return False
+        return self.admits_value(bound[self.objective_index])
+
+    def admits_value(self, value: float) -> bool:
+        """objective 상한 value인 빌드가 아직 채택될 수 있는지"""
+        if self._floor is not None and (value < self._floor if self.all_at_best else value <= self._floor):
+            return False
+        if self.all_at_best:
+            return self._best_value is None or value >= self._best_value
+        if self.top_n <= 0:
+            return False
+        heap = self._heap
+        return len(heap) < self.top_n or value > heap[0][0]
+
+    def value(self, score: float, stats: dict) -> float:
+        """완성 빌드의 objective 값"""
+        return score if self.objective_key is None else stats[self.objective_key]
+
+    def offer(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        """완성된 빌드 제안 (채택되면 True)"""
+        if not self.plan.accepts(stats):
+            return False
+        value = score if self.objective_key is None else stats[self.objective_key]
+        if self._floor is not None and (value < self._floor if self.all_at_best else value <= self._floor):
+            return False
+
+        if self.all_at_best:
+            if self._best_value is not None and value < self._best_value:
+                return False
+            if self._seeded and _build_key(runes) in self._seeded:
+                return False
+            if self._best_value is None or value > self._best_value:
+                self._best_value = value
+                self._best = []
+            if len(self._best) >= self.top_n:
+                return False
+            self._best.append(self._make_result(score, stats, assignment, runes))
+        else:
+            heap = self._heap
+            if len(heap) >= self.top_n and (not heap or value <= heap[0][0]):
+                return False
+            if self._seeded and _build_key(runes) in self._seeded:
+                return False
+            if len(heap) >= self.top_n:
+                self._seq += 1
+                heapq.heapreplace(heap, (value, -self._seq, self._make_result(score, stats, assignment, runes)))
+            else:
+                self._seq += 1
+                heapq.heappush(heap, (value, -self._seq, self._make_result(score, stats, assignment, runes)))
+        self.accepted += 1
+        return True
+
+    def seed(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        """탐색 전 시드 빌드 제안 (탐색 중 같은 빌드를 다시 만나면 무시)"""
+        key = _build_key(runes)
+        if key in self._seeded:
+            return False
+        accepted = self.offer(score, stats, assignment, runes)
+        self._seeded.add(key)
+        return accepted
+
+    def _make_result(self, score: float, stats: dict, assignment: str, runes: List) -> Dict:
+        return {
+            "runes": list(runes),
+            "score": score,
+            "stats": stats,
+            "intangible_assignment": assignment,
+        }
+
+    def results(self) -> List[Dict]:
+        """objective 내림차순 결과 (같은 값이면 먼저 찾은 순서)"""
+        if self.all_at_best:
+            return list(self._best)
+        ranked = sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))
+        return [result for _, _, result in ranked]
+
+
+class PageCollector(TopCollector):
+    """
+    다음 페이지 수집기 (objective 내림차순 페이지 나누기, pagination.SearchCursor 참고)
+    이전 페이지 마지막 값(ceiling)보다 큰 빌드와, 같은 값이면서 이미 돌려준 빌드(returned)는
+    받지 않는다. 나머지는 TopCollector와 같다 (top_n = 페이지 크기).
+    log가 주어지면 이 페이지에 들지 못할 수도 있는 부분을 DFS 순서로 기록해 다음 페이지가
+    그 부분만 탐색하게 한다.
+    - objective 상한이 임계값 이하여서 잘라낸 서브트리: (상한, 부분 빌드 rune_id)
+    - 조건을 만족하고 아직 돌려주지 않은 완성 빌드: (값, rune_id 6개)
+    """
+
+    uses_picks = True
+
+    def __init__(self, ceiling: Optional[float] = None, returned: List[Tuple[int, ...]] = (),
+                 log: Optional[List[Tuple[float, Tuple[int, ...]]]] = None, **options):
+        super().__init__(**options)
+        self.ceiling = ceiling
+        self.returned = {tuple(key) for key in returned}
+        self.log = log
+
+    def admits_picks(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]],
+                     picks: List, depth: int) -> bool:
+        if not self.plan.admits(bound, floor):
+            return False
+        value = bound[self.objective_index]
+        if self.admits_value(value):
+            return True
+        if self.log is not None:
+            self.log.append((value, _build_key(picks[:depth])))
+        return False
+
+    def offer(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        value = self.value(score, stats)
+        if self.ceiling is not None:
+            if value > self.ceiling or (value == self.ceiling and _build_key(runes) in self.returned):
+                return False
+        if self.log is not None and self.plan.accepts(stats):
+            self.log.append((value, _build_key(runes)))
+        return super().offer(score, stats, assignment, runes)
+
+
+class DiverseCollector(TopCollector):
+    """
+    서로 다른 상위 빌드 수집기 (search_builds의 min_diff / max_reuse)
+
+    objective 내림차순(같은 값이면 먼저 찾은 순서)으로 앞선 결과와 충분히 다른 빌드만
+    고르는 탐욕 선택이다.
+    - min_diff: 이미 고른 모든 결과와 min_diff개 이상의 슬롯에서 룬이 달라야 한다.
+    - max_reuse: 한 룬은 고른 결과 중 최대 max_reuse개에만 쓰인다.
+    찾은 빌드를 pool에 모아 탐욕 선택을 유지하고, 다음 서브트리를 잘라낸다.
+    - objective 상한이 N번째 선택 값보다 작은 서브트리
+    - 부분 빌드(SearchEngine이 admits_picks로 넘겨줌)가 상한보다 값이 큰 선택 결과와 너무
+      겹치거나, 상한보다 값이 큰 선택 결과들이 이미 max_reuse번 쓴 룬을 포함한 서브트리
+    나중에 찾은 빌드가 앞선 선택을 밀어내면 잘라낼 때 근거가 된 선택이 바뀔 수 있으므로,
+    탐색이 끝나면 모든 가지치기의 근거가 최종 선택에서도 유효한지 확인하고(next_pass),
+    근거가 사라진 부분 빌드의 서브트리만 pool을 유지한 채 다시 탐색한다. 임계값이 탐색 중
+    쓴 값보다 내려갔으면 전체를 다시 탐색한다 (새 빌드를 찾지 못한 탐색은 항상 유효).
+    return_policy "all_at_best"는 지원하지 않는다.
+    """
+
+    uses_picks = True
+
+    def __init__(self, min_diff: Optional[int] = None, max_reuse: Optional[int] = None, **options):
+        if options.get("return_policy", "top_n") != "top_n":
+            raise ValueError("다양성 조건은 return_policy top_n만 지원합니다")
+        if min_diff is None and max_reuse is None:
+            raise ValueError("min_diff 또는 max_reuse가 필요합니다")
+        if min_diff is not None and not 1 <= min_diff <= 6:
+            raise ValueError(f"min_diff는 1~6이어야 합니다: {min_diff}")
+        if max_reuse is not None and max_reuse < 1:
+            raise ValueError(f"max_reuse는 1 이상이어야 합니다: {max_reuse}")
+        super().__init__(**options)
+        self.max_shared = 6 - min_diff if min_diff is not None else 6  # 고른 결과와 겹칠 수 있는 룬 수
+        self.max_reuse = max_reuse
+        self._pool: List[tuple] = []  # 찾은 빌드 (-value, 순번, rune_id 튜플, result), 선택 순서로 정렬
+        self._pool_keys = set()
+        self._selected: List[tuple] = []  # 탐욕 선택 (pool 항목)
+        self._by_slot: List[Dict[int, int]] = [{} for _ in range(6)]  # 슬롯별 rune_id -> 선택 번호 비트마스크
+        self._blocked_by: Dict[Tuple[int, ...], Tuple[int, int]] = {}  # pool 빌드 -> 막은 (선택 번호, 순번)
+        self._blockers: List[Tuple[float, Tuple[int, ...]]] = []  # min_diff: 선택 결과 (값, rune_id 튜플)
+        self._exhausted: Dict[int, float] = {}  # max_reuse: 다 쓴 rune_id -> 그 룬을 쓴 선택 결과의 최소값
+        self._threshold = None  # N번째 선택 값 (N개를 고르기 전에는 None)
+        self._threshold_max = None  # 이번 탐색에서 가지치기에 쓴 최대 임계값
+        # 선택 결과 때문에 잘라낸 부분 빌드 (근거 ("build", 키) / ("rune", id), 상한, 부분 빌드 rune_id)
+        self._prunes: List[Tuple[tuple, float, Tuple[int, ...]]] = []
+
+    def _blocker(self, key: Tuple[int, ...], by_slot: List[Dict[int, int]], limit: int) -> Optional[int]:
+        """
+        빌드 key가 앞쪽 limit개 선택 결과와 너무 겹치거나 그 결과들이 다 쓴 룬을 포함하면
+        그 충돌을 만든 선택 번호 (없으면 None)
+        by_slot: 슬롯별 rune_id -> 그 룬을 쓴 선택 번호 비트마스크
+        """
+        within = (1 << limit) - 1
+        masks = [by_slot[i].get(key[i], 0) & within for i in range(6)]
+        if self.max_reuse is not None:
+            for mask in masks:
+                if bin(mask).count("1") >= self.max_reuse:
+                    for _ in range(self.max_reuse - 1):
+                        mask &= mask - 1
+                    return (mask & -mask).bit_length() - 1
+        max_shared = self.max_shared
+        if max_shared < 6:
+            # at_least[t]: t개 이상의 슬롯에서 key와 룬이 같은 선택 결과 비트마스크
+            at_least = [within] + [0] * (max_shared + 1)
+            for mask in masks:
+                if mask:
+                    for t in range(max_shared + 1, 0, -1):
+                        at_least[t] |= at_least[t - 1] & mask
+            blocked = at_least[max_shared + 1]
+            if blocked:
+                return (blocked & -blocked).bit_length() - 1
+        return None
+
+    def _select(self, start: int = 0, keep: int = 0) -> None:
+        """pool[start:]부터 탐욕 선택을 다시 계산하고 임계값 / 가지치기 근거 갱신 (앞쪽 keep개 선택은 유지)"""
+        pool = self._pool
+        chosen = []
+        by_slot: List[Dict[int, int]] = [{} for _ in range(6)]
+
+        def choose(entry):
+            bit = 1 << len(chosen)
+            for i, rune_id in enumerate(entry[2]):
+                by_slot[i][rune_id] = by_slot[i].get(rune_id, 0) | bit
+            chosen.append(entry)
+
+        for entry in self._selected[:keep]:
+            choose(entry)
+        blocked_by = self._blocked_by
+        for entry in pool[start:]:
+            if len(chosen) >= self.top_n:
+                break
+            # 유지한 앞쪽 선택에 막힌 빌드는 그대로 막힘
+            cached = blocked_by.get(entry[2])
+            if cached is not None and cached[0] < keep and chosen[cached[0]][1] == cached[1]:
+                continue
+            j = self._blocker(entry[2], by_slot, len(chosen))
+            if j is None:
+                choose(entry)
+            else:
+                blocked_by[entry[2]] = (j, chosen[j][1])
+
+        self._selected = chosen
+        self._blockers = [(-entry[0], entry[2]) for entry in chosen] if self.max_shared < 6 else []
+        self._by_slot = by_slot
+        self._exhausted = {}
+        if self.max_reuse is not None:
+            for users in by_slot:
+                for rune_id, mask in users.items():
+                    if bin(mask).count("1") >= self.max_reuse:
+                        # 그 룬을 쓴 선택 결과 중 최소값 (마지막 선택)
+                        self._exhausted[rune_id] = -chosen[mask.bit_length() - 1][0]
+        previous = self._threshold
+        if len(chosen) >= self.top_n:
+            self._threshold = -chosen[-1][0]
+            if self._threshold_max is None or self._threshold > self._threshold_max:
+                self._threshold_max = self._threshold
+            if previous is None or self._threshold > previous:
+                # 임계값 아래 빌드는 선택될 수 없음 (임계값이 내려가면 어차피 다시 탐색)
+                cut = bisect.bisect_right(pool, (-self._threshold, float("inf")))
+                for entry in pool[cut:]:
+                    self._pool_keys.discard(entry[2])
+                    self._blocked_by.pop(entry[2], None)
+                del pool[cut:]
+        else:
+            self._threshold = None
+
+    def admits_value(self, value: float) -> bool:
+        if self._floor is not None and value <= self._floor:
+            return False
+        if self.top_n <= 0:
+            return False
+        return self._threshold is None or value >= self._threshold
+
+    def admits(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]] = None) -> bool:
+        return self.admits_picks(bound, floor, [], 0)
+
+    def admits_picks(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]],
+                     picks: List, depth: int) -> bool:
+        """부분 빌드 picks[:depth]의 서브트리에 선택될 수 있는 빌드가 있을 수 있는지"""
+        if not self.plan.admits(bound, floor):
+            return False
+        value = bound[self.objective_index]
+        if not self.admits_value(value):
+            return False
+        prunes = self._prunes
+        if self._exhausted:
+            for rune in picks[:depth]:
+                used_value = self._exhausted.get(rune.rune_id)
+                if used_value is not None and used_value > value:
+                    prunes.append((("rune", rune.rune_id), value, _build_key(picks[:depth])))
+                    return False
+        if self.max_shared < depth:
+            for selected_value, key in self._blockers:
+                if selected_value <= value:
+                    continue
+                shared = 0
+                for i in range(depth):
+                    if picks[i].rune_id == key[i]:
+                        shared += 1
+                if shared > self.max_shared:
+                    prunes.append((("build", key), value, _build_key(picks[:depth])))
+                    return False
+        return True
+
+    def offer(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        if not self.plan.accepts(stats):
+            return False
+        value = self.value(score, stats)
+        if not self.admits_value(value):
+            return False
+        key = _build_key(runes)
+        if key in self._pool_keys:
+            return False
+        self._seq += 1
+        entry = (-value, self._seq, key, self._make_result(score, stats, assignment, runes))
+        position = bisect.bisect_left(self._pool, entry)
+        self._pool.insert(position, entry)
+        self._pool_keys.add(key)
+        # 앞선 선택 결과와 충돌하면 선택은 그대로
+        keep = bisect.bisect_left(self._selected, entry)
+        j = self._blocker(key, self._by_slot, keep)
+        if j is not None:
+            self._blocked_by[key] = (j, self._selected[j][1])
+            return False
+        self._select(position, keep)
+        self.accepted += 1
+        return True
+
+    def next_pass(self) -> List[Tuple[int, ...]]:
+        """
+        끝난 탐색의 가지치기가 최종 선택 기준으로도 유효했는지 확인
+        Returns: 다시 탐색할 부분 빌드(슬롯 1부터의 rune_id) 목록 (모두 유효하면 빈 목록,
+            임계값이 내려갔으면 전체 탐색 [()])
+        """
+        if self.done:
+            return []
+        cut = self._threshold
+        if self._threshold_max is not None and (cut is None or cut < self._threshold_max):
+            rerun = [()]
+        else:
+            selected_keys = {entry[2] for entry in self._selected}
+            rerun = []
+            for (kind, token), bound, prefix in self._prunes:
+                if cut is not None and bound < cut:
+                    continue  # 잘라낸 빌드는 N번째 선택보다 낮음
+                if kind == "build":
+                    still = token in selected_keys
+                else:
+                    still = self._exhausted.get(token, float("-inf")) > bound
+                if not still:
+                    rerun.append(prefix)
+            # 다른 부분 빌드에 포함되는 부분 빌드는 제외
+            rerun.sort()
+            kept = []
+            for prefix in rerun:
+                if not kept or prefix[:len(kept[-1])] != kept[-1]:
+                    kept.append(prefix)
+            rerun = kept
+        self._threshold_max = self._threshold
+        self._prunes = []
+        return rerun
+
+    def results(self) -> List[Dict]:
+        """선택 순서(objective 내림차순, 같은 값이면 먼저 찾은 순서) 결과"""
+        return [entry[3] for entry in self._selected]
+
+
+class ParetoCollector:
+    """
+    비지배 집합 수집기 (objective "PARETO")
+    상한 벡터가 이미 찾은 빌드에 엄격히 지배당하는 서브트리를 잘라낸다.
+    """
+
+    uses_picks = False
+
+    def __init__(self, constraints: Dict[str, float] = None, pareto_stats: List[str] = None,
+                 max_results: Optional[int] = 2000, base_spd: int = 104):
+        self.plan = ConstraintPlan(constraints, base_spd)
+        self.pareto_stats = validate_pareto_stats(pareto_stats)
+        self.pareto_index = [BOUND_INDEX[name] for name in self.pareto_stats]
+        self.max_results = max_results
+        self.base_spd = base_spd
+        self.front: List[Dict] = []
+        self._seeded = set()  # 시드로 넣은 빌드 (rune_id 튜플)
+
+    @property
+    def done(self) -> bool:
+        return self.max_results is not None and len(self.front) >= self.max_results
+
+    def admits(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]] = None) -> bool:
+        if not self.plan.admits(bound, floor):
+            return False
+        return not front_dominates(self.front, tuple(bound[i] for i in self.pareto_index))
+
+    def offer(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        if not self.plan.accepts(stats):
+            return False
+        metrics = build_metrics(score, stats, self.base_spd)
+        result = {
+            "runes": list(runes),
+            "score": score,
+            "stats": stats,
+            "intangible_assignment": assignment,
+            "pareto_values": {name: metrics[name] for name in self.pareto_stats},
+            "pareto_vector": tuple(metrics[name] for name in self.pareto_stats),
+        }
+        if front_dominates(self.front, result["pareto_vector"]):
+            return False
+        if self._seeded and _build_key(runes) in self._seeded:
+            return False
+        self.front = update_front(self.front, result)
+        return True
+
+    def seed(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        """탐색 전 시드 빌드 제안 (탐색 중 같은 빌드를 다시 만나면 무시)"""
+        key = _build_key(runes)
+        if key in self._seeded:
+            return False
+        accepted = self.offer(score, stats, assignment, runes)
+        self._seeded.add(key)
+        return accepted
+
+    def results(self) -> List[Dict]:
+        """비지배 집합 전체를 첫 번째 스탯 내림차순으로"""
+        return sorted(self.front, key=lambda x: x["pareto_vector"], reverse=True)
+
+
+class MarginalCollector:
+    """
+    룬별 최고 빌드 스코어 수집기 (룬 가치 순위용)
+
+    candidates: 후보 rune_id -> (슬롯, 그 룬을 포함한 빌드의 정적 스코어 상한, 부족분)
+        부족분: 서브트리 상한에서 그 슬롯을 스탯별 최대값 대신 이 룬으로 채울 때
+        스코어 상한이 적어도 줄어드는 양 (치피/공격력 선형 차이 - 반올림 1)
+    모든 후보에 대해 그 룬을 포함한 최고 스코어(best_with)를 기록한다. 부분 빌드의
+    서브트리에 들어갈 수 있는 후보는 이미 고른 룬과 남은 슬롯의 후보뿐이므로,
+    서브트리 스코어 상한이 그중 아직 개선될 수 있는 후보(best_with < 정적 상한)의
+    best_with + 부족분(고른 룬은 0) 최소값 이하이면 잘라낸다
+    (SearchEngine이 admits_picks로 부분 빌드를 넘겨줌).
+    window가 있으면 현재 최고값 - window 미만의 빌드도 잘라낸다 (그 아래의 best_with는 기록되지 않음).
+    """
+
+    uses_picks = True
+
+    def __init__(self, candidates: Dict[int, Tuple[int, float, float]], constraints: Dict[str, float] = None,
+                 window: Optional[float] = None, base_spd: int = 104):
+        self.plan = ConstraintPlan(constraints, base_spd)
+        self.window = window
+        self.best = float("-inf")
+        self.best_with: Dict[int, float] = {rune_id: float("-inf") for rune_id in candidates}
+        self._slot = {rune_id: entry[0] for rune_id, entry in candidates.items()}
+        self._upper = {rune_id: entry[1] for rune_id, entry in candidates.items()}
+        self._deficit = {rune_id: entry[2] for rune_id, entry in candidates.items()}
+        # 슬롯별로 아직 개선될 수 있는 후보의 (best_with + 부족분, rune_id) 최소 힙
+        # (오래된 항목은 꺼낼 때 버림)
+        self._open: List[list] = [[] for _ in range(8)]
+        for rune_id, (slot, upper, _) in candidates.items():
+            if upper > float("-inf"):
+                self._open[slot].append((float("-inf"), rune_id))
+
+    def _slot_threshold(self, slot: int) -> float:
+        """슬롯 slot의 열린 후보 best_with + 부족분 최소값 (없으면 inf)"""
+        heap = self._open[slot]
+        best_with = self.best_with
+        deficit = self._deficit
+        while heap and heap[0][0] != best_with[heap[0][1]] + deficit[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else float("inf")
+
+    def _threshold(self, picks: List, depth: int) -> float:
+        """이 값 이하의 빌드는 부분 빌드 picks[:depth]의 서브트리 안에서 어떤 best_with도 바꾸지 못함"""
+        threshold = float("inf")
+        for rune in picks[:depth]:
+            value = self.best_with[rune.rune_id]
+            if value < threshold and value < self._upper[rune.rune_id]:
+                threshold = value
+        for slot in range(depth + 1, 7):
+            value = self._slot_threshold(slot)
+            if value < threshold:
+                threshold = value
+        return threshold
+
+    @property
+    def done(self) -> bool:
+        """모든 후보의 best_with가 정적 상한에 도달했는지"""
+        return self._threshold([], 0) == float("inf")
+
+    def admits(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]] = None) -> bool:
+        return self.admits_picks(bound, floor, [], 0)
+
+    def admits_picks(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]],
+                     picks: List, depth: int) -> bool:
+        """부분 빌드 picks[:depth]의 서브트리가 어떤 후보의 best_with를 개선할 수 있는지"""
+        if not self.plan.admits(bound, floor):
+            return False
+        value = bound[BOUND_INDEX["SCORE"]]
+        if self.window is not None and value < self.best - self.window:
+            return False
+        return value > self._threshold(picks, depth)
+
+    def offer(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        if not self.plan.accepts(stats):
+            return False
+        if score > self.best:
+            self.best = score
+        improved = False
+        for rune in runes:
+            rune_id = rune.rune_id
+            if score > self.best_with[rune_id]:
+                self.best_with[rune_id] = score
+                if score < self._upper[rune_id]:
+                    heapq.heappush(self._open[self._slot[rune_id]], (score + self._deficit[rune_id], rune_id))
+                improved = True
+        return improved
+
+    def seed(self, score: float, stats: dict, assignment: str, runes: List) -> bool:
+        """시드 빌드도 일반 빌드와 같이 기록 (같은 빌드를 다시 만나도 결과는 같음)"""
+        return self.offer(score, stats, assignment, runes)
+
+    def results(self) -> Dict[int, float]:
+        """후보 rune_id -> 그 룬을 포함한 최고 스코어 (window 밖이거나 유효 빌드가 없으면 -inf)"""
+        if self.window is None:
+            return dict(self.best_with)
+        cutoff = self.best - self.window
+        return {rune_id: (value if value >= cutoff else float("-inf"))
+                for rune_id, value in self.best_with.items()}
+
+
+def make_collector(query: Dict, base_spd: int = 104):
+    """search_builds 쿼리 딕셔너리로 수집기 생성"""
+    diverse = query.get("min_diff") is not None or query.get("max_reuse") is not None
+    if query.get("objective", "SCORE") == "PARETO":
+        if diverse:
+            raise ValueError("PARETO objective는 다양성 조건(min_diff / max_reuse)을 지원하지 않습니다")
+        return ParetoCollector(
+            constraints=query.get("constraints"),
+            pareto_stats=query.get("pareto_stats"),
+            max_results=query.get("max_results", 2000),
+            base_spd=base_spd,
+        )
+    if diverse:
+        return DiverseCollector(
+            min_diff=query.get("min_diff"),
+            max_reuse=query.get("max_reuse"),
+            constraints=query.get("constraints"),
+            objective=query.get("objective", "SCORE"),
+            top_n=query.get("top_n", 20),
+            return_policy=query.get("return_policy", "top_n"),
+            max_results=query.get("max_results", 2000),
+            base_spd=base_spd,
+        )
+    return TopCollector(
+        constraints=query.get("constraints"),
+        objective=query.get("objective", "SCORE"),
+        top_n=query.get("top_n", 20),
+        return_policy=query.get("return_policy", "top_n"),
+        max_results=query.get("max_results", 2000),
+        base_spd=base_spd,
+    )
@@ -0,0 +1,252 @@
+"""압축 룬 인벤토리 (struct-of-arrays 숫자 표현, 공유 메모리 / mmap 파일 내보내기)"""
+
+import mmap
+import struct
+from array import array
+from multiprocessing import shared_memory
+from typing import List, Tuple, Optional
+from .types import Rune, SubStat
+from .scoring import STAT_VECTOR_IDS
+
+# 룬당 서브 스탯 칸 수 (비어 있는 칸은 stat_id 0)
+MAX_SUBS = 4
+
+# 열 이름, array 타입 코드, 룬당 칸 수
+COLUMNS = (
+    ("rune_id", "q", 1),
+    ("slot", "b", 1),
+    ("set_id", "h", 1),
+    ("level", "h", 1),
+    ("quality", "h", 1),
+    ("main_stat_id", "h", 1),
+    ("main_stat_value", "d", 1),
+    ("prefix_stat_id", "h", 1),
+    ("prefix_stat_value", "d", 1),
+    ("sub_stat_id", "h", MAX_SUBS),
+    ("sub_value", "d", MAX_SUBS),
+    ("sub_enchanted", "b", MAX_SUBS),
+    ("sub_grind", "d", MAX_SUBS),
+)
+
+# 공유 메모리 / 파일 레이아웃: 헤더(매직 + 룬 수) 뒤에 열을 COLUMNS 순서로 8바이트 정렬해 배치
+MAGIC = b"SWRUNES1"
+HEADER = struct.Struct("<8sq")
+ALIGN = 8
+
+
+def _layout(count: int) -> Tuple[List[Tuple[str, str, int, int]], int]:
+    """룬 count개의 열 배치 [(이름, 타입 코드, 시작 오프셋, 칸 수)]와 전체 바이트 수"""
+    layout = []
+    offset = HEADER.size
+    for name, typecode, per_rune in COLUMNS:
+        offset = (offset + ALIGN - 1) // ALIGN * ALIGN
+        items = count * per_rune
+        layout.append((name, typecode, offset, items))
+        offset += items * array(typecode).itemsize
+    return layout, offset
+
+
+class CompactRunes:
+    """
+    룬 목록을 열별 배열로 저장한 인벤토리
+
+    룬 i의 값은 각 열의 i번째 값이고, 서브 스탯은 sub_* 열의
+    i * MAX_SUBS ~ i * MAX_SUBS + MAX_SUBS - 1 칸에 들어 있다.
+    Rune 객체는 필요할 때 rune(i) / to_runes()로 만든다.
+
+    export_shared / export_file로 한 덩어리 버퍼에 내보내면 다른 프로세스가
+    attach_shared / open_file로 복사 없이 붙을 수 있다. 붙은 인벤토리의 열은 버퍼를
+    가리키는 읽기 전용 memoryview이며 (append 불가), 다 쓰면 close()로 놓는다.
+    """
+
+    __slots__ = tuple(name for name, _, _ in COLUMNS) + ("_buffer",)
+
+    def __init__(self):
+        for name, typecode, _ in COLUMNS:
+            setattr(self, name, array(typecode))
+        self._buffer = None  # 붙은 공유 메모리 / mmap (직접 만든 인벤토리는 None)
+
+    def __len__(self) -> int:
+        return len(self.rune_id)
+
+    def append(self, rune_id: int, slot: int, set_id: int, level: int, quality: int,
+               main_stat_id: int, main_stat_value: float,
+               prefix_stat_id: int, prefix_stat_value: float,
+               subs: List[Tuple[int, float, int, float]]):
+        """
+        룬 하나 추가
+        subs: [(stat_id, 최종 값, enchanted, grind)] (MAX_SUBS개 이하, 나머지 칸은 0)
+        서브 스탯이 MAX_SUBS개보다 많으면 ValueError (아무 열도 바뀌지 않음)
+        """
+        if len(subs) > MAX_SUBS:
+            raise ValueError(f"룬 {rune_id}의 서브 스탯이 {MAX_SUBS}개보다 많습니다: {len(subs)}")
+        n = len(self)
+        try:
+            self.rune_id.append(rune_id)
+            self.slot.append(slot)
+            self.set_id.append(set_id)
+            self.level.append(level)
+            self.quality.append(quality)
+            self.main_stat_id.append(main_stat_id)
+            self.main_stat_value.append(main_stat_value)
+            self.prefix_stat_id.append(prefix_stat_id)
+            self.prefix_stat_value.append(prefix_stat_value)
+            for stat_id, value, enchanted, grind in subs:
+                self.sub_stat_id.append(stat_id)
+                self.sub_value.append(value)
+                self.sub_enchanted.append(enchanted)
+                self.sub_grind.append(grind)
+            for _ in range(MAX_SUBS - len(subs)):
+                self.sub_stat_id.append(0)
+                self.sub_value.append(0.0)
+                self.sub_enchanted.append(0)
+                self.sub_grind.append(0.0)
+        except (TypeError, ValueError, OverflowError):
+            # 일부 열만 추가된 상태가 남지 않도록 되돌린다
+            self.truncate(n)
+            raise
+
+    def truncate(self, n: int) -> None:
+        """앞쪽 n개 룬만 남긴다"""
+        for name, _, per_rune in COLUMNS:
+            del getattr(self, name)[n * per_rune:]
+
+    @classmethod
+    def from_runes(cls, runes: List[Rune]) -> "CompactRunes":
+        """Rune 목록을 압축 표현으로 변환 (서브 스탯이 MAX_SUBS개보다 많은 룬이 있으면 ValueError)"""
+        compact = cls()
+        for rune in runes:
+            compact.append(
+                rune.rune_id, rune.slot, rune.set_id, rune.level, rune.quality,
+                rune.main_stat_id, rune.main_stat_value,
+                rune.prefix_stat_id, rune.prefix_stat_value,
+                [(sub.stat_id, sub.value, 1 if sub.enchanted else 0, sub.grind)
+                 for sub in rune.subs],
+            )
+        return compact
+
+    def rune(self, i: int) -> Rune:
+        """룬 i를 Rune 객체로 복원"""
+        subs = []
+        for j in range(i * MAX_SUBS, i * MAX_SUBS + MAX_SUBS):
+            if self.sub_stat_id[j]:
+                subs.append(SubStat(
+                    stat_id=self.sub_stat_id[j],
+                    value=self.sub_value[j],
+                    enchanted=bool(self.sub_enchanted[j]),
+                    grind=self.sub_grind[j],
+                ))
+        return Rune(
+            rune_id=self.rune_id[i],
+            slot=self.slot[i],
+            set_id=self.set_id[i],
+            main_stat_id=self.main_stat_id[i],
+            main_stat_value=self.main_stat_value[i],
+            subs=subs,
+            level=self.level[i],
+            quality=self.quality[i],
+            prefix_stat_id=self.prefix_stat_id[i],
+            prefix_stat_value=self.prefix_stat_value[i],
+        )
+
+    def to_runes(self, indices: Optional[List[int]] = None) -> List[Rune]:
+        """룬을 Rune 객체로 복원 (indices가 없으면 전부)"""
+        if indices is None:
+            indices = range(len(self))
+        return [self.rune(i) for i in indices]
+
+    def has_sub_stat(self, i: int, stat_id: int) -> bool:
+        """룬 i에 stat_id 서브 스탯이 있는지 (Rune.has_sub_stat과 같음)"""
+        return stat_id in self.sub_stat_id[i * MAX_SUBS:i * MAX_SUBS + MAX_SUBS]
+
+    def stat_vector(self, i: int) -> Tuple[float, float, float, float, float]:
+        """룬 i의 (CR, CD, ATK%, ATK+, SPD) 합계 (scoring.rune_stat_vector와 같은 값)"""
+        totals = [0.0] * len(STAT_VECTOR_IDS)
+        entries = [(self.main_stat_id[i], self.main_stat_value[i]),
+                   (self.prefix_stat_id[i], self.prefix_stat_value[i])]
+        entries.extend((self.sub_stat_id[j], self.sub_value[j])
+                       for j in range(i * MAX_SUBS, i * MAX_SUBS + MAX_SUBS))
+        for stat_id, value in entries:
+            if stat_id in STAT_VECTOR_IDS:
+                totals[STAT_VECTOR_IDS.index(stat_id)] += value
+        return tuple(totals)
+
+    def _write(self, buffer) -> None:
+        """레이아웃대로 헤더와 열을 buffer(쓰기 가능한 버퍼)에 복사"""
+        layout, _ = _layout(len(self))
+        HEADER.pack_into(buffer, 0, MAGIC, len(self))
+        for name, typecode, offset, items in layout:
+            data = getattr(self, name).tobytes()
+            buffer[offset:offset + len(data)] = data
+
+    @property
+    def nbytes(self) -> int:
+        """export_shared / export_file이 쓰는 바이트 수"""
+        return _layout(len(self))[1]
+
+    @classmethod
+    def _from_buffer(cls, view: memoryview, owner) -> "CompactRunes":
+        """버퍼의 열을 복사 없이 가리키는 인벤토리 (owner: 수명을 유지할 공유 메모리 / mmap)"""
+        magic, count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("압축 룬 인벤토리 버퍼가 아닙니다")
+        compact = cls.__new__(cls)
+        for name, typecode, offset, items in _layout(count)[0]:
+            size = items * array(typecode).itemsize
+            setattr(compact, name, view[offset:offset + size].cast(typecode))
+        compact._buffer = owner
+        return compact
+
+    def export_shared(self, name: Optional[str] = None) -> shared_memory.SharedMemory:
+        """
+        공유 메모리 블록을 만들어 인벤토리를 한 번 복사하고 블록을 반환
+        만든 쪽이 블록을 들고 있다가 작업이 끝나면 close() / unlink()한다.
+        """
+        block = shared_memory.SharedMemory(name=name, create=True, size=self.nbytes)
+        self._write(block.buf)
+        return block
+
+    @classmethod
+    def attach_shared(cls, name: str) -> "CompactRunes":
+        """
+        export_shared로 만든 공유 메모리 블록에 복사 없이 붙기
+        (Python 3.13 미만은 붙는 프로세스도 resource tracker에 등록되므로
+        블록을 만든 프로세스의 자식 프로세스(프로세스 풀 작업자)에서 붙는다)
+        """
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python 3.13 미만
+            block = shared_memory.SharedMemory(name=name)
+        return cls._from_buffer(block.buf, block)
+
+    def export_file(self, path: str) -> None:
+        """인벤토리를 open_file로 mmap할 수 있는 파일로 저장"""
+        buffer = bytearray(self.nbytes)
+        self._write(buffer)
+        with open(path, "wb") as f:
+            f.write(buffer)
+
+    @classmethod
+    def open_file(cls, path: str) -> "CompactRunes":
+        """export_file로 저장한 파일을 읽기 전용 mmap으로 열기 (페이지 캐시를 프로세스끼리 공유)"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls._from_buffer(memoryview(mapped), mapped)
+
+    def close(self) -> None:
+        """붙은 버퍼 놓기 (열 memoryview를 먼저 해제하고 빈 배열로 바꿈)"""
+        if self._buffer is None:
+            return
+        for name, typecode, _ in COLUMNS:
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                column.release()
+            setattr(self, name, array(typecode))
+        self._buffer.close()
+        self._buffer = None
+
+    def __enter__(self) -> "CompactRunes":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,156 @@
+"""제약 조건 컴파일 (쿼리별 최소/최대 조건 평가 계획)"""
+
+from typing import List, Dict, Tuple, Optional
+from .types import BASE_CR, BASE_CD, BLADE_2SET_CR, RAGE_4SET_CD, FATAL_4SET_ATK_PCT
+
+# SearchEngine이 내부 노드마다 계산하는 상한/하한 벡터의 순서
+BOUND_KEYS = ("CR", "CD", "SPD", "ATK_PCT", "ATK_FLAT", "ATK_BONUS", "ATK_TOTAL", "SCORE")
+BOUND_INDEX = {key: i for i, key in enumerate(BOUND_KEYS)}
+
+# 최소 조건 키 -> (완성 빌드 stats 키, 벡터 키)
+CONSTRAINT_KEYS = {
+    "CR": ("cr_total", "CR"),
+    "CD": ("cd_total", "CD"),
+    "SPD": ("spd_total", "SPD"),
+    "ATK_BONUS": ("atk_bonus", "ATK_BONUS"),
+    "ATK_TOTAL": ("atk_total", "ATK_TOTAL"),
+    "ATK_PCT": ("atk_pct_total", "ATK_PCT"),
+    "ATK_FLAT": ("atk_flat_total", "ATK_FLAT"),
+    "MIN_SCORE": ("score", "SCORE"),
+}
+
+# 최대 조건 키 (예: "MAX_SPD": 속도 상한, "MAX_CR": 치확 초과 방지)
+MAX_CONSTRAINT_KEYS = {
+    "MAX_CR": ("cr_total", "CR"),
+    "MAX_CD": ("cd_total", "CD"),
+    "MAX_SPD": ("spd_total", "SPD"),
+    "MAX_ATK_BONUS": ("atk_bonus", "ATK_BONUS"),
+    "MAX_ATK_TOTAL": ("atk_total", "ATK_TOTAL"),
+    "MAX_ATK_PCT": ("atk_pct_total", "ATK_PCT"),
+    "MAX_ATK_FLAT": ("atk_flat_total", "ATK_FLAT"),
+    "MAX_SCORE": ("score", "SCORE"),
+}
+
+
+def bound_vector(totals: Tuple[float, ...], set_counts: Tuple[int, int, int, int], picked: int,
+                 remaining_max: Tuple[float, ...], base_atk: int, base_spd: int) -> Tuple[float, ...]:
+    """
+    룬 picked개를 고른 부분 빌드의 상한 벡터 (BOUND_KEYS 순서, SearchEngine 내부 노드와 같은 값)
+    남은 슬롯은 스탯별 최대값으로 채우고, 세트 보너스는 아직 가능하면 적용한다
+    (무형은 어느 쪽에든 붙을 수 있고, Rage/Fatal은 함께 카운트되므로 두 보너스 모두 상한에 포함).
+    """
+    rage, fatal, blade, intangible = set_counts
+    remaining = 6 - picked
+    joker = 1 if intangible else 0
+    cr = BASE_CR + totals[0] + remaining_max[0]
+    if blade + remaining + joker >= 2:
+        cr += BLADE_2SET_CR
+    cd = BASE_CD + totals[1] + remaining_max[1]
+    atk_pct = totals[2] + remaining_max[2]
+    if rage + fatal + remaining + joker >= 4:
+        cd += RAGE_4SET_CD
+        atk_pct += FATAL_4SET_ATK_PCT
+    atk_flat = totals[3] + remaining_max[3]
+    atk_bonus = round(base_atk * (atk_pct / 100.0) + atk_flat)
+    return (
+        cr,
+        cd,
+        base_spd + totals[4] + remaining_max[4],
+        atk_pct,
+        atk_flat,
+        atk_bonus,
+        base_atk + atk_bonus,
+        (cd * 10) + atk_bonus + 200,
+    )
+
+
+def floor_vector(totals: Tuple[float, ...], remaining_min: Tuple[float, ...],
+                 base_atk: int, base_spd: int) -> Tuple[float, ...]:
+    """
+    남은 슬롯을 스탯별 최소값으로 채웠을 때의 하한 벡터 (BOUND_KEYS 순서)
+    totals / remaining_min: rune_stat_vector 순서 (CR, CD, ATK%, ATK+, SPD)
+    세트 조건을 만족하는 빌드는 항상 Blade 2세트이므로 CR에는 Blade 보너스를 더한다.
+    """
+    floor = [0.0] * len(BOUND_KEYS)
+    fill_floor(floor, totals[0], totals[1], totals[2], totals[3], totals[4], remaining_min, base_atk, base_spd)
+    return tuple(floor)
+
+
+def fill_floor(out: List[float], cr: float, cd: float, atk_pct: float, atk_flat: float, spd: float,
+               remaining_min: Tuple[float, ...], base_atk: int, base_spd: int) -> None:
+    """
+    floor_vector를 미리 할당한 out에 채우기 (SearchEngine 내부 루프용, 누적 스탯은 값으로 받음)
+    """
+    cr = BASE_CR + BLADE_2SET_CR + cr + remaining_min[0]
+    cd = BASE_CD + cd + remaining_min[1]
+    atk_pct = atk_pct + remaining_min[2]
+    atk_flat = atk_flat + remaining_min[3]
+    atk_bonus = round(base_atk * (atk_pct / 100.0) + atk_flat)
+    out[0] = cr
+    out[1] = cd
+    out[2] = base_spd + spd + remaining_min[4]
+    out[3] = atk_pct
+    out[4] = atk_flat
+    out[5] = atk_bonus
+    out[6] = base_atk + atk_bonus
+    out[7] = (cd * 10) + atk_bonus + 200
+
+
+class ConstraintPlan:
+    """
+    쿼리 제약 조건을 한 번 컴파일한 평가 계획
+
+    - 최소 조건 (CONSTRAINT_KEYS): 내부 노드에서 상한 벡터와 비교
+    - 최대 조건 (MAX_CONSTRAINT_KEYS): 내부 노드에서 하한 벡터와 비교
+    실제로 있는 키만 (벡터 인덱스, 임계값) 목록으로 남기고, 리프에서는 완성 빌드
+    stats에서 같은 값을 꺼내 비교한다. 알 수 없는 키는 무시한다.
+    """
+
+    __slots__ = ("lower", "upper", "leaf_lower", "leaf_upper")
+
+    def __init__(self, constraints: Optional[Dict[str, float]] = None, base_spd: int = 104):
+        self.lower: List[Tuple[int, float]] = []
+        self.upper: List[Tuple[int, float]] = []
+        self.leaf_lower: List[Tuple[str, float, float]] = []
+        self.leaf_upper: List[Tuple[str, float, float]] = []
+        for key, value in (constraints or {}).items():
+            if key in CONSTRAINT_KEYS:
+                stats_key, bound_key = CONSTRAINT_KEYS[key]
+                checks, leaf_checks = self.lower, self.leaf_lower
+            elif key in MAX_CONSTRAINT_KEYS:
+                stats_key, bound_key = MAX_CONSTRAINT_KEYS[key]
+                checks, leaf_checks = self.upper, self.leaf_upper
+            else:
+                continue
+            checks.append((BOUND_INDEX[bound_key], value))
+            # 완성 빌드의 spd_total은 룬 속도 합이므로 기본 속도를 더해 비교
+            leaf_checks.append((stats_key, base_spd if bound_key == "SPD" else 0, value))
+
+    def __bool__(self) -> bool:
+        return bool(self.lower or self.upper)
+
+    @property
+    def needs_floor(self) -> bool:
+        """최대 조건이 있어 하한 벡터가 필요한지"""
+        return bool(self.upper)
+
+    def admits(self, bound: Tuple[float, ...], floor: Optional[Tuple[float, ...]] = None) -> bool:
+        """상한/하한 벡터로 서브트리가 아직 조건을 만족할 수 있는지"""
+        for i, minimum in self.lower:
+            if bound[i] < minimum:
+                return False
+        if floor is not None:
+            for i, maximum in self.upper:
+                if floor[i] > maximum:
+                    return False
+        return True
+
+    def accepts(self, stats: dict) -> bool:
+        """완성 빌드가 모든 조건을 만족하는지"""
+        for key, add, minimum in self.leaf_lower:
+            if add + stats[key] < minimum:
+                return False
+        for key, add, maximum in self.leaf_upper:
+            if add + stats[key] > maximum:
+                return False
+        return True
@@ -0,0 +1,353 @@
+"""분산 탐색 (접두사 서브트리 작업 분배, 작업 훔치기, 임계값 방송)"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import select
+import selectors
+import socket
+from collections import deque
+from dataclasses import asdict
+from typing import List, Dict, Optional, Tuple
+from .types import Rune, SubStat
+from .index import SlotIndex
+from .collectors import TopCollector
+from .engine import SearchEngine
+from .optimizer import filter_rune_by_slot, _format_results
+
+
+def rune_to_dict(rune: Rune) -> Dict:
+    """Rune을 JSON으로 보낼 수 있는 딕셔너리로 변환"""
+    return asdict(rune)
+
+
+def rune_from_dict(data: Dict) -> Rune:
+    """rune_to_dict의 역변환"""
+    data = dict(data)
+    data["subs"] = [SubStat(**sub) for sub in data["subs"]]
+    return Rune(**data)
+
+
+class _Channel:
+    """
+    줄 단위 JSON 메시지 소켓 (메시지 하나 = JSON 한 줄)
+    받은 바이트는 버퍼에 모아 완성된 줄만 메시지로 꺼낸다.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._buffer = b""
+        self._messages = deque()
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def send(self, message: Dict) -> None:
+        self.sock.sendall(json.dumps(message).encode() + b"\n")
+
+    def feed(self) -> None:
+        """소켓에서 한 번 읽어 완성된 메시지를 쌓는다 (연결이 끊겼으면 ConnectionError)"""
+        data = self.sock.recv(65536)
+        if not data:
+            raise ConnectionError("상대 프로세스와의 연결이 끊어졌습니다")
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+        self._messages.extend(json.loads(line) for line in lines if line)
+
+    def pending(self) -> List[Dict]:
+        """쌓인 메시지를 모두 꺼냄"""
+        messages = list(self._messages)
+        self._messages.clear()
+        return messages
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        메시지 하나 받기
+        timeout초 안에 완성된 메시지가 없으면 None (None이면 올 때까지 대기, 0이면 대기하지 않음)
+        """
+        while not self._messages:
+            if timeout is not None and not select.select([self.sock], [], [], timeout)[0]:
+                return None
+            self.feed()
+        return self._messages.popleft()
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def _slot_index(runes: List[Rune], target: str) -> Optional[SlotIndex]:
+    """search_builds와 같은 슬롯 후보 인덱스 (후보가 없는 슬롯이 있으면 None)"""
+    slot_runes = {slot: filter_rune_by_slot(runes, slot, target) for slot in range(1, 7)}
+    if not all(slot_runes.values()):
+        return None
+    return SlotIndex(slot_runes)
+
+
+def _expand(index: SlotIndex, prefix: List[int], depth: int) -> List[List[int]]:
+    """접두사를 슬롯 depth까지 늘린 하위 접두사 목록 (이미 depth 이상이면 그대로)"""
+    if len(prefix) >= depth:
+        return [list(prefix)]
+    ranges = [range(len(index.runes[slot])) for slot in range(len(prefix) + 1, depth + 1)]
+    return [list(prefix) + list(rest) for rest in itertools.product(*ranges)]
+
+
+def run_worker(host: str, port: int) -> Dict[str, int]:
+    """
+    작업자: 조정자에 접속해 작업 하나를 처리하고 통계를 반환
+
+    조정자가 보낸 룬과 조건으로 같은 SlotIndex를 만들고, 받은 접두사를 split_depth까지
+    펼친 하위 접두사(단위)를 로컬 큐에서 하나씩 SearchEngine.run(prefix=...)으로 탐색한다.
+    단위 사이마다 조정자 메시지를 확인해 임계값을 올리고(threshold), 훔치기 요청(steal)에는
+    로컬 큐 뒤쪽 절반을 돌려준다. 단위마다 상위 결과(rune_id와 objective 값)를 보고한다.
+    """
+    with socket.create_connection((host, port)) as sock:
+        channel = _Channel(sock)
+        job = channel.recv()
+        runes = [rune_from_dict(data) for data in job["runes"]]
+        index = _slot_index(runes, job["target"])
+        engine = SearchEngine(index, job["target"], job["base_atk"], job["base_spd"])
+        collector = TopCollector(constraints=job["constraints"], objective=job["objective"],
+                                 top_n=job["top_n"], return_policy=job["return_policy"],
+                                 max_results=None, base_spd=job["base_spd"])
+        units = deque()
+        stats = {"units": 0, "nodes": 0}
+        channel.send({"type": "idle"})
+
+        while True:
+            message = channel.recv(0 if units else None)
+            if message is None:
+                accepted = collector.accepted
+                engine.run([collector], units.popleft())
+                stats["units"] += 1
+                stats["nodes"] += engine.nodes
+                progress = {"type": "progress", "remaining": len(units)}
+                if collector.accepted != accepted:
+                    progress["results"] = [
+                        [collector.value(result["score"], result["stats"]),
+                         [rune.rune_id for rune in result["runes"]]]
+                        for result in collector.results()
+                    ]
+                channel.send(progress)
+                if not units:
+                    channel.send({"type": "idle"})
+            elif message["type"] == "task":
+                units.extend(_expand(index, message["prefix"], job["split_depth"]))
+            elif message["type"] == "threshold":
+                collector.raise_floor(message["value"])
+            elif message["type"] == "steal":
+                stolen = [units.pop() for _ in range(len(units) // 2)]
+                channel.send({"type": "stolen", "prefixes": stolen[::-1]})
+            elif message["type"] == "finish":
+                channel.send(dict(stats, type="done"))
+                return stats
+
+
+class SearchCoordinator:
+    """
+    분산 탐색 조정자 (search_builds의 dfs 탐색을 여러 작업자 프로세스로 나눔)
+
+    - 작업: 슬롯 1 후보 위치 하나로 고정한 접두사 서브트리. 작업자는 이를 슬롯 split_depth까지
+      펼쳐 로컬 큐에 넣고 차례로 탐색한다.
+    - 작업 훔치기: 남은 작업이 없는데 쉬는 작업자가 있으면, 로컬 큐가 가장 긴 작업자에게
+      절반을 돌려받아 다시 분배한다 (서브트리 크기가 고르지 않아도 작업자가 놀지 않음).
+    - 임계값 방송: 작업자가 보고한 결과를 합쳐 top_n번째 값(all_at_best는 최고값)이
+      오르면 모든 작업자에게 보내 각자의 가지치기에 반영한다 (TopCollector.raise_floor).
+    - 병합: 모은 rune_id 빌드를 조정자에서 다시 채점해 상위 결과를 만든다.
+
+    통신은 로컬(또는 사설망) TCP 소켓 위의 줄 단위 JSON이다. 작업자는 run_worker(host, port)로
+    접속하며, 다른 장비에서는 python -m sw_mcp.distributed HOST PORT로 띄울 수 있다.
+    결과 점수는 search_builds와 같고, 동점 빌드의 선택만 달라질 수 있다.
+    max_results(채택 수 제한)는 적용하지 않으며 PARETO objective는 지원하지 않는다.
+    """
+
+    def __init__(self, runes: List[Rune], target: str = "B",
+                 base_atk: int = 900, base_spd: int = 104,
+                 constraints: Dict[str, float] = None,
+                 objective: str = "SCORE", top_n: int = 20,
+                 return_policy: str = "top_n", split_depth: int = 2,
+                 host: str = "127.0.0.1", port: int = 0):
+        if objective == "PARETO":
+            raise ValueError("분산 탐색은 PARETO objective를 지원하지 않습니다")
+        if not 1 <= split_depth <= 6:
+            raise ValueError(f"split_depth는 1~6이어야 합니다: {split_depth}")
+        self.target = target
+        self.base_atk = base_atk
+        self.base_spd = base_spd
+        self.query = {
+            "constraints": constraints,
+            "objective": objective,
+            "top_n": top_n,
+            "return_policy": return_policy,
+        }
+        self.split_depth = split_depth
+        # 슬롯 후보만 보내고 작업자도 같은 순서로 같은 인덱스를 만든다 (접두사 위치가 일치)
+        self.candidates = [rune for slot in range(1, 7) for rune in filter_rune_by_slot(runes, slot, target)]
+        self.index = _slot_index(self.candidates, target)
+        self.listener = socket.create_server((host, port))
+        self.stats = {"tasks": 0, "steals": 0, "stolen": 0, "broadcasts": 0, "units": 0, "nodes": 0}
+        self._best: Dict[Tuple[int, ...], float] = {}  # 작업자가 보고한 빌드 -> objective 값
+        self._threshold = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """작업자가 접속할 (host, port)"""
+        return self.listener.getsockname()[:2]
+
+    def _job(self) -> Dict:
+        return dict(
+            self.query,
+            type="job",
+            runes=[rune_to_dict(rune) for rune in self.candidates],
+            target=self.target,
+            base_atk=self.base_atk,
+            base_spd=self.base_spd,
+            split_depth=self.split_depth,
+        )
+
+    def _merge(self, results: List) -> Optional[float]:
+        """작업자 결과 병합, 임계값이 올랐으면 새 임계값 반환"""
+        for value, rune_ids in results:
+            self._best[tuple(rune_ids)] = value
+        values = sorted(self._best.values(), reverse=True)
+        if not values:
+            return None
+        if self.query["return_policy"] == "all_at_best":
+            threshold = values[0]
+        elif len(values) >= self.query["top_n"] > 0:
+            threshold = values[self.query["top_n"] - 1]
+        else:
+            return None
+        # 임계값 미만의 빌드는 최종 결과에 들 수 없으므로 버림
+        self._best = {key: value for key, value in self._best.items() if value >= threshold}
+        if self._threshold is not None and threshold <= self._threshold:
+            return None
+        self._threshold = threshold
+        return threshold
+
+    def run(self, workers: int, timeout: float = 60.0) -> List[Dict]:
+        """
+        작업자 workers개의 접속을 받아 탐색을 마치고 search_builds 형식의 결과를 반환
+        timeout초 동안 접속이나 메시지가 없으면 TimeoutError
+        """
+        if workers < 1:
+            raise ValueError(f"workers는 1 이상이어야 합니다: {workers}")
+        channels = []
+        selector = selectors.DefaultSelector()
+        try:
+            self.listener.settimeout(timeout)
+            job = self._job()
+            for _ in range(workers):
+                try:
+                    sock, _ = self.listener.accept()
+                except socket.timeout:
+                    raise TimeoutError("작업자 접속을 기다리다 시간이 초과되었습니다")
+                sock.settimeout(None)
+                channel = _Channel(sock)
+                channel.send(job)
+                channels.append(channel)
+                selector.register(sock, selectors.EVENT_READ, channel)
+            if self.index is not None:
+                self._distribute(channels, selector, timeout)
+            for channel in channels:
+                channel.send({"type": "finish"})
+            for channel in channels:
+                while True:
+                    message = channel.recv(timeout)
+                    if message is None:
+                        raise TimeoutError("작업자 종료를 기다리다 시간이 초과되었습니다")
+                    if message["type"] == "done":
+                        self.stats["nodes"] += message["nodes"]
+                        break
+        finally:
+            selector.close()
+            for channel in channels:
+                channel.close()
+            self.listener.close()
+        return self._results()
+
+    def _distribute(self, channels: List[_Channel], selector, timeout: float) -> None:
+        """모든 작업이 끝날 때까지 작업 분배 / 훔치기 / 임계값 방송"""
+        queue = deque([k] for k in range(len(self.index.runes[1])))
+        idle = set()
+        remaining = {channel: 0 for channel in channels}
+        stealing = None  # 훔치기 응답을 기다리는 작업자
+        while True:
+            # 쉬는 작업자에게 작업 분배, 작업이 없으면 가장 바쁜 작업자에게서 훔치기
+            while idle and queue:
+                channel = idle.pop()
+                channel.send({"type": "task", "prefix": queue.popleft()})
+                remaining[channel] = 0
+                self.stats["tasks"] += 1
+            if idle and not queue and stealing is None:
+                busy = [channel for channel in channels if channel not in idle and remaining[channel] >= 2]
+                if busy:
+                    stealing = max(busy, key=remaining.get)
+                    stealing.send({"type": "steal"})
+                    self.stats["steals"] += 1
+            if not queue and stealing is None and len(idle) == len(channels):
+                return
+
+            events = selector.select(timeout)
+            if not events:
+                raise TimeoutError("작업자 응답을 기다리다 시간이 초과되었습니다")
+            for key, _ in events:
+                channel = key.data
+                channel.feed()
+                for message in channel.pending():
+                    kind = message["type"]
+                    if kind == "idle":
+                        idle.add(channel)
+                        remaining[channel] = 0
+                    elif kind == "progress":
+                        remaining[channel] = message["remaining"]
+                        self.stats["units"] += 1
+                        threshold = self._merge(message.get("results", []))
+                        if threshold is not None:
+                            for other in channels:
+                                other.send({"type": "threshold", "value": threshold})
+                            self.stats["broadcasts"] += 1
+                    elif kind == "stolen":
+                        queue.extend(message["prefixes"])
+                        self.stats["stolen"] += len(message["prefixes"])
+                        stealing = None
+
+    def _results(self) -> List[Dict]:
+        """병합한 빌드를 다시 채점해 search_builds 형식으로 (동점이면 슬롯별 후보 위치 순서)"""
+        if self.index is None:
+            return []
+        collector = TopCollector(constraints=self.query["constraints"], objective=self.query["objective"],
+                                 top_n=self.query["top_n"], return_policy=self.query["return_policy"],
+                                 max_results=None, base_spd=self.base_spd)
+        engine = SearchEngine(self.index, self.target, self.base_atk, self.base_spd)
+        order = {key: sorted(self.index.locate(rune_id) for rune_id in key) for key in self._best}
+        seeds = sorted(self._best, key=lambda key: (-self._best[key], order[key]))
+        engine.seed([collector], seeds)
+        return _format_results(collector.results(), self.index.equivalent_ids())
+
+
+def search_builds_distributed(runes: List[Rune], workers: int = 2,
+                              timeout: float = 60.0, **options) -> List[Dict]:
+    """
+    로컬 작업자 프로세스 workers개로 분산 탐색 (SearchCoordinator 참고)
+    options: SearchCoordinator 인자 (target, base_atk, base_spd, constraints, objective,
+        top_n, return_policy, split_depth)
+    """
+    coordinator = SearchCoordinator(runes, **options)
+    host, port = coordinator.address
+    processes = [multiprocessing.Process(target=run_worker, args=(host, port), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        return coordinator.run(workers, timeout)
+    finally:
+        for process in processes:
+            process.join(timeout)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분산 탐색 작업자")
+    parser.add_argument("host")
+    parser.add_argument("port", type=int)
+    args = parser.parse_args()
+    print(run_worker(args.host, args.port))
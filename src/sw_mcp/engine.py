@@ -0,0 +1,467 @@
+"""반복형 DFS 탐색 엔진"""
+
+import math
+import sys
+from typing import List, Iterable, Optional, Sequence, Tuple
+from .types import BASE_CR, BASE_CD, RAGE_4SET_CD, FATAL_4SET_ATK_PCT, BLADE_2SET_CR
+from .scoring import score_from_totals, set_signature_feasible
+from .index import SlotIndex, SpeedIndex
+from .constraints import BOUND_KEYS, BOUND_INDEX, fill_floor
+from .state import DepthAccumulator
+from .ordering import MoveOrder, need_mask
+
+
+class SearchEngine:
+    """
+    명시적 스택 기반 DFS 탐색 엔진
+
+    슬롯 1~6의 치확 100에 도달 가능한 후보를 ordering.MoveOrder 순서(objective / 조건
+    기여가 큰 후보, 아직 필요한 세트를 채우는 후보부터)로 탐색해 좋은 빌드를 일찍 찾는다
+    (move_order=False이면 CR 내림차순 인덱스 순서). 내부 노드에서는 상한 벡터
+    (constraints.BOUND_KEYS 순서)를 한 번 계산해 모든 수집기가 공유하고, 최대 조건이
+    있는 수집기가 있으면 하한 벡터도 함께 계산한다. 리프에서는 누적 스탯으로 한 번만
+    정확한 스코어를 계산해 각 수집기에 제안한다. 세트 시그니처(rage, fatal, blade,
+    intangible)를 함께 누적해 세트 조건을 만족할 수 없는 자식은 진입하지 않으므로,
+    리프의 무형 배치는 canonical_assignment 한 번으로 결정된다.
+    모든 수집기에 최소 SPD 조건이 있으면 index.SpeedIndex의 SPD 구간별 결합 최대로
+    남은 슬롯 상한을 조이고, SPD 조건에 도달할 수 없는 자식은 진입하지 않는다.
+    수집기마다 기본 스탯(base_atk, base_spd)이 다르면(run의 bases) 누적 스탯은 공유하고,
+    기본 스탯에 따라 달라지는 상한 벡터 항목(공격력 보너스 / 총 공격력 / 스코어 / SPD)과
+    리프 스코어만 기본 스탯 조합마다 계산한다.
+    수집기마다 target이 다르면(run의 targets) 더 느슨한 세트 조건(A)으로 탐색하고,
+    B 수집기는 Fatal 조건을 더 이상 만족할 수 없는 노드에서 제외한다 (리프 스코어는 target별).
+
+    수집기는 다음 인터페이스를 가진다 (collectors.TopCollector 참고):
+        done: 더 이상 결과를 받지 않으면 True
+        plan: constraints.ConstraintPlan
+        admits(bound, floor) -> bool: 서브트리가 아직 결과를 낼 수 있는지
+        uses_picks: True이면 admits 대신 admits_picks(bound, floor, picks, depth)로
+            부분 빌드(picks[:depth], 슬롯 순서 룬)까지 함께 받는다
+        offer(score, stats, assignment, runes) -> bool: 완성 빌드 제안
+        seed(score, stats, assignment, runes) -> bool: 탐색 전 시드 빌드 제안 (이후 같은 빌드는 무시)
+    """
+
+    def __init__(self, index: SlotIndex, target: str = "B",
+                 base_atk: int = 900, base_spd: int = 104, move_order: bool = True):
+        self.index = index
+        self.target = target
+        self.base_atk = base_atk
+        self.base_spd = base_spd
+        self.move_order = move_order
+        self._orders = {}  # 수집기 objective / 조건별 MoveOrder
+        self._speed = None  # SpeedIndex (속도 조건이 있는 run에서 처음 만든다)
+        self.nodes = 0  # 마지막 run에서 방문한 노드 수 (리프 포함)
+        self.position = None  # 마지막 run이 node_limit로 중단된 위치 (끝까지 탐색했으면 None)
+
+    def seed(self, collectors: List, seeds: Iterable[Sequence[int]],
+             bases: Optional[Sequence[Tuple[int, int]]] = None,
+             targets: Optional[Sequence[str]] = None) -> int:
+        """
+        이전 결과 빌드(rune_id 6개)를 현재 조건으로 다시 채점해 수집기에 먼저 넣는다
+        수집기의 임계값이 처음부터 높아져 이어지는 run의 가지치기가 강해진다.
+        후보가 아닌 룬이 있거나 슬롯 1~6을 채우지 못하는 빌드는 무시한다.
+        bases / targets: 수집기별 기본 스탯 / target (run 참고, None이면 엔진의 값)
+        Returns: 유효한(어느 수집기 기준으로든 점수 > 0) 시드 빌드 수
+        """
+        index = self.index
+        atks = [self.base_atk] * len(collectors) if bases is None else [atk for atk, _ in bases]
+        keys = list(zip([self.target] * len(collectors) if targets is None else targets, atks))
+        used = 0
+        for seed in seeds:
+            positions = [index.locate(rune_id) for rune_id in seed]
+            if None in positions or sorted(slot for slot, _ in positions) != [1, 2, 3, 4, 5, 6]:
+                continue
+            positions.sort()
+            totals = [0.0] * 5
+            counts = [0] * 4
+            for slot, k in positions:
+                totals = [a + b for a, b in zip(totals, index.vectors[slot][k])]
+                counts = [a + b for a, b in zip(counts, index.set_counts[slot][k])]
+            picks = [index.runes[slot][k] for slot, k in positions]
+            scored = {}
+            valid = False
+            for collector, key in zip(collectors, keys):
+                if key not in scored:
+                    scored[key] = score_from_totals(tuple(totals), tuple(counts), *key)
+                assignment, score, stats = scored[key]
+                if score <= 0:
+                    continue
+                valid = True
+                if not collector.done:
+                    collector.seed(score, stats, assignment, picks)
+            used += valid
+        return used
+
+    def _move_order(self, collectors: List) -> MoveOrder:
+        """수집기 objective / 조건이 같으면 같은 MoveOrder (순서 캐시 재사용)"""
+        key = tuple(
+            (getattr(c, "objective_index", None), tuple(c.plan.lower), tuple(c.plan.upper))
+            for c in collectors
+        )
+        order = self._orders.get(key)
+        if order is None:
+            order = MoveOrder(self.index, collectors, self.target, self.base_atk, self.base_spd,
+                              enabled=self.move_order)
+            self._orders[key] = order
+        return order
+
+    def spd_needed(self, collectors: List,
+                   bases: Optional[Sequence[Tuple[int, int]]] = None) -> Optional[float]:
+        """
+        모든 수집기가 요구하는 룬 SPD 합의 최소값 (SPD 조건이 없는 수집기가 있으면 None)
+        bases: 수집기별 (base_atk, base_spd) (None이면 엔진의 base_spd)
+        """
+        needs = []
+        for i, collector in enumerate(collectors):
+            minimums = [value for j, value in collector.plan.lower if j == BOUND_INDEX["SPD"]]
+            if not minimums:
+                return None
+            needs.append(max(minimums) - (self.base_spd if bases is None else bases[i][1]))
+        if not needs or min(needs) <= 0:
+            return None
+        return min(needs)
+
+    def speed_index(self) -> SpeedIndex:
+        """SPD 구간별 결합 상한 인덱스 (엔진마다 한 번 생성)"""
+        if self._speed is None:
+            self._speed = SpeedIndex(self.index, self.base_atk)
+        return self._speed
+
+    def run(self, collectors: List, prefix: Sequence[int] = (),
+            resume: Optional[Sequence[int]] = None, node_limit: Optional[int] = None,
+            bases: Optional[Sequence[Tuple[int, int]]] = None,
+            targets: Optional[Sequence[str]] = None) -> None:
+        """
+        모든 수집기에 대해 한 번의 DFS 수행
+        prefix: 슬롯 1~len(prefix)에 고정할 인덱스 위치 (index.runes[slot][k]의 k).
+            주어지면 그 부분 빌드 아래 서브트리만 탐색한다 (분산 탐색의 작업 단위).
+        node_limit: 방문 노드 수가 이 값에 이르면 중단하고, 다음에 들어갈 노드의 경로
+            (슬롯 1부터의 인덱스 위치)를 self.position에 남긴다 (끝까지 탐색하면 None).
+        resume: 이전 run의 self.position. 그 노드부터 이어서 탐색하며, 경로보다 앞선
+            서브트리는 다시 방문하지 않는다 (수집기 상태는 호출한 쪽이 복원).
+        bases: 수집기별 (base_atk, base_spd). 주어지면 각 수집기를 자기 기본 스탯으로
+            평가한다 (None이면 모든 수집기가 엔진의 기본 스탯).
+        targets: 수집기별 target ("A" / "B"). 주어지면 각 수집기를 자기 세트 조건으로
+            평가한다 (None이면 모든 수집기가 엔진의 target).
+        """
+        # 지역 변수로 끌어올리기
+        index = self.index
+        target = self.target
+        base_atk = self.base_atk
+        base_spd = self.base_spd
+        runes = [None] + [index.runes[slot] for slot in range(1, 7)]
+        vectors = [None] + [index.vectors[slot] for slot in range(1, 7)]
+        set_counts = [None] + [index.set_counts[slot] for slot in range(1, 7)]
+        suffix_max = [index.suffix_max[slot] for slot in range(1, 8)]
+        suffix_min = [index.suffix_min[slot] for slot in range(1, 8)]
+        need_floor = any(c.plan.needs_floor for c in collectors)
+        cr_feasible_count = index.cr_feasible_count
+        children = self._move_order(collectors).children
+        spd_needed = self.spd_needed(collectors, bases)
+        # 기본 스탯 조합 (엔진의 기본 스탯 하나뿐이면 None) / 수집기별 조합 번호
+        variants = None
+        variant_of = [0] * len(collectors)
+        if bases is not None:
+            bases = [tuple(base) for base in bases]
+            distinct = sorted(set(bases))
+            if distinct != [(base_atk, base_spd)]:
+                variants = distinct
+                variant_of = [distinct.index(base) for base in bases]
+        # target이 섞여 있으면 느슨한 쪽(A)으로 탐색하고 B 수집기(strict)는 노드마다 세트 조건 확인
+        strict_bits = 0
+        if targets is not None and set(targets) != {target}:
+            target = "A" if "A" in targets else "B"
+            strict_bits = sum(1 << i for i, t in enumerate(targets) if t != target)
+        # 리프 채점 키: 수집기별 (target, base_atk) (모든 수집기가 같으면 None)
+        leaf_key = None
+        if variants is not None or strict_bits:
+            atks = [base_atk] * len(collectors) if bases is None else [base[0] for base in bases]
+            leaf_targets = [target] * len(collectors) if targets is None else targets
+            leaf_key = list(zip(leaf_targets, atks))
+        joint_rows = None
+        if spd_needed is not None:
+            speed = self.speed_index()
+            joint_rows = [speed.joint[slot] for slot in range(1, 8)]
+        need_fatal = target == "B"
+
+        # 활성 수집기 집합은 수집기 번호 비트마스크 (i번째 수집기 = 1 << i)
+        # members: (비트, 수집기, 기본 스탯 조합 번호, 리프 채점 키)
+        members = [(1 << i, c, variant_of[i], None if leaf_key is None else leaf_key[i])
+                   for i, c in enumerate(collectors)]
+        # 수집기가 하나이고 엔진의 기본 스탯 / target을 쓰면 반복 없이 바로 평가
+        single = collectors[0] if len(collectors) == 1 and leaf_key is None else None
+        live = sum(bit for bit, c, _, _ in members if not c.done)  # 아직 결과를 받는 수집기
+
+        # 내부 루프에서 다시 쓰는 상한/하한 벡터와 리프 누적값 (노드마다 튜플/리스트를 만들지 않음)
+        bound = [0.0] * len(BOUND_KEYS)
+        floor = [0.0] * len(BOUND_KEYS) if need_floor else None
+        variant_rows = None
+        if variants is not None:
+            # 기본 스탯 조합별 (상한 벡터, 하한 벡터, base_atk, base_spd)
+            variant_rows = [([0.0] * len(BOUND_KEYS), [0.0] * len(BOUND_KEYS) if need_floor else None, atk, spd)
+                            for atk, spd in variants]
+        leaf_totals = [0.0] * 5
+        leaf_counts = [0] * 4
+        scored = {}
+
+        state = DepthAccumulator()
+        cr_at = state.cr_at
+        cd_at = state.cd_at
+        atk_pct_at = state.atk_pct_at
+        atk_flat_at = state.atk_flat_at
+        spd_at = state.spd_at
+        rage_at = state.rage_at
+        fatal_at = state.fatal_at
+        blade_at = state.blade_at
+        intangible_at = state.intangible_at
+        picks = state.picks
+
+        # 깊이별 스택: 시도 순서, 다음 순번, 순서 길이, 치확 도달 가능 후보 수, 활성 수집기 비트마스크
+        order_at = [None] * 7
+        cursor = [0] * 7
+        limit = [0] * 7
+        cr_limit = [0] * 7
+        active_at = [0] * 7
+        nodes = 0
+        if node_limit is None:
+            node_limit = sys.maxsize
+        self.position = None
+
+        # 고정 접두사 (+ 재개 경로) 누적 (세트 조건을 만족할 수 없는 접두사는 탐색하지 않음)
+        root = len(prefix)
+        path = list(prefix) if resume is None else list(prefix) + list(resume[root:])
+        for depth, k in enumerate(path):
+            n = depth + 1
+            if depth >= root:
+                # 재개 경로의 부모 노드: 순서에서 경로 자식 다음 후보부터 이어서 탐색
+                cr_limit[depth] = cr_feasible_count(n, cr_at[depth])
+                order_at[depth] = children(n, cr_limit[depth],
+                                           need_mask(rage_at[depth], fatal_at[depth], blade_at[depth], target))
+                cursor[depth] = order_at[depth].index(k) + 1
+                limit[depth] = len(order_at[depth])
+                active_at[depth] = live
+            vector = vectors[n][k]
+            counts = set_counts[n][k]
+            cr_at[n] = cr_at[depth] + vector[0]
+            cd_at[n] = cd_at[depth] + vector[1]
+            atk_pct_at[n] = atk_pct_at[depth] + vector[2]
+            atk_flat_at[n] = atk_flat_at[depth] + vector[3]
+            spd_at[n] = spd_at[depth] + vector[4]
+            rage_at[n] = rage_at[depth] + counts[0]
+            fatal_at[n] = fatal_at[depth] + counts[1]
+            blade_at[n] = blade_at[depth] + counts[2]
+            intangible_at[n] = intangible_at[depth] + counts[3]
+            picks[depth] = runes[n][k]
+        if root and not set_signature_feasible(
+                (rage_at[root], fatal_at[root], blade_at[root], intangible_at[root]), 6 - root, target):
+            self.nodes = 0
+            return
+
+        # 노드 진입 (depth = 선택한 룬 수)
+        depth = len(path)
+        parent_active = active_at[depth - 1] if depth > root else live
+        while True:
+            nodes += 1
+            active = parent_active & live
+
+            if depth == 6:
+                # 리프: 누적 스탯으로 정확한 스코어 (무형 배치 포함) 한 번 계산
+                if active:
+                    leaf_totals[0] = cr_at[6]
+                    leaf_totals[1] = cd_at[6]
+                    leaf_totals[2] = atk_pct_at[6]
+                    leaf_totals[3] = atk_flat_at[6]
+                    leaf_totals[4] = spd_at[6]
+                    leaf_counts[0] = rage_at[6]
+                    leaf_counts[1] = fatal_at[6]
+                    leaf_counts[2] = blade_at[6]
+                    leaf_counts[3] = intangible_at[6]
+                    if single is not None:
+                        assignment, score, stats = score_from_totals(leaf_totals, leaf_counts, target, base_atk)
+                        if score > 0:
+                            single.offer(score, stats, assignment, picks)
+                            if single.done:
+                                live = 0
+                    elif leaf_key is None:
+                        assignment, score, stats = score_from_totals(leaf_totals, leaf_counts, target, base_atk)
+                        if score > 0:
+                            for bit, collector, _, _ in members:
+                                if active & bit:
+                                    collector.offer(score, stats, assignment, picks)
+                                    if collector.done:
+                                        live ^= bit
+                    else:
+                        # (target, 기본 공격력)마다 한 번씩 채점 (같은 누적 스탯)
+                        scored.clear()
+                        for bit, collector, _, key in members:
+                            if active & bit:
+                                result = scored.get(key)
+                                if result is None:
+                                    result = scored[key] = score_from_totals(leaf_totals, leaf_counts, key[0], key[1])
+                                if result[1] > 0:
+                                    collector.offer(result[1], result[2], result[0], picks)
+                                    if collector.done:
+                                        live ^= bit
+                active = 0
+            elif active:
+                if (active & strict_bits and fatal_at[depth] == 0 and 1 + (2 - blade_at[depth] if blade_at[depth] < 2 else 0)
+                        + (3 - rage_at[depth] if rage_at[depth] < 3 else 0) > 6 - depth + intangible_at[depth]):
+                    # B 세트 조건(Fatal 포함)을 더 이상 만족할 수 없는 부분 빌드: B 수집기 제외
+                    # (scoring.set_signature_feasible(..., "B") 인라인: Fatal 없이는 Rage/Fatal이 최소 1개 더 필요)
+                    active &= ~strict_bits
+                # 상한 벡터 (남은 슬롯 depth+1~6을 각 스탯 최대값으로 채우고 세트 보너스는 가능하면 적용)
+                remaining_max = suffix_max[depth]
+                max_cr = remaining_max[0]
+                max_cd = remaining_max[1]
+                max_atk_pct = remaining_max[2]
+                max_atk_flat = remaining_max[3]
+                key_max = None
+                if joint_rows is not None:
+                    # 속도 조건을 만족하는 남은 슬롯 조합 안에서의 스탯별 최대 (SpeedIndex)
+                    need = spd_needed - spd_at[depth]
+                    row = joint_rows[depth]
+                    s = math.ceil(need) if need > 0 else 0
+                    if s < len(row):
+                        joint = row[s]
+                        max_cr = joint[0]
+                        max_cd = joint[1]
+                        max_atk_pct = joint[2]
+                        max_atk_flat = joint[3]
+                        if variants is None:
+                            key_max = joint[4]  # 엔진의 base_atk 기준 선형 키
+                    else:
+                        active = 0
+                remaining = 6 - depth
+                joker = 1 if intangible_at[depth] else 0
+                rage_fatal_ok = rage_at[depth] + fatal_at[depth] + remaining + joker >= 4
+                bound_cr = BASE_CR + cr_at[depth] + max_cr
+                if blade_at[depth] + remaining + joker >= 2:
+                    bound_cr += BLADE_2SET_CR
+                bound_cd = BASE_CD + cd_at[depth] + max_cd
+                bound_atk_pct = atk_pct_at[depth] + max_atk_pct
+                if rage_fatal_ok:
+                    bound_cd += RAGE_4SET_CD
+                    bound_atk_pct += FATAL_4SET_ATK_PCT
+                bound_atk_flat = atk_flat_at[depth] + max_atk_flat
+                spd_sum = spd_at[depth] + remaining_max[4]
+                if not active:
+                    pass
+                elif variant_rows is not None:
+                    # 기본 스탯 조합별 상한(/하한) 벡터 (치확 / 치피 / 공% / 공+ 상한은 공유)
+                    for row_bound, row_floor, atk, spd in variant_rows:
+                        bonus = round(atk * (bound_atk_pct / 100.0) + bound_atk_flat)
+                        row_bound[0] = bound_cr
+                        row_bound[1] = bound_cd
+                        row_bound[2] = spd + spd_sum
+                        row_bound[3] = bound_atk_pct
+                        row_bound[4] = bound_atk_flat
+                        row_bound[5] = bonus
+                        row_bound[6] = atk + bonus
+                        row_bound[7] = (bound_cd * 10) + bonus + 200
+                        if row_floor is not None:
+                            fill_floor(row_floor, cr_at[depth], cd_at[depth], atk_pct_at[depth], atk_flat_at[depth],
+                                       spd_at[depth], suffix_min[depth], atk, spd)
+                    for bit, collector, v, _ in members:
+                        if active & bit:
+                            row_bound, row_floor, _, _ = variant_rows[v]
+                            if not (collector.admits_picks(row_bound, row_floor, picks, depth) if collector.uses_picks
+                                    else collector.admits(row_bound, row_floor)):
+                                active ^= bit
+                else:
+                    bound_atk_bonus = round(base_atk * (bound_atk_pct / 100.0) + bound_atk_flat)
+                    bound_score = (bound_cd * 10) + bound_atk_bonus + 200
+                    if key_max is not None:
+                        # 선형 스코어 키의 결합 최대로 치피/공격력을 함께 조인 상한 (반올림 여유 0.5)
+                        linear = ((bound_cd - max_cd) * 10
+                                  + base_atk * (bound_atk_pct - max_atk_pct) / 100.0
+                                  + bound_atk_flat - max_atk_flat + key_max + 200.5)
+                        if linear < bound_score:
+                            bound_score = linear
+                    bound[0] = bound_cr
+                    bound[1] = bound_cd
+                    bound[2] = base_spd + spd_sum
+                    bound[3] = bound_atk_pct
+                    bound[4] = bound_atk_flat
+                    bound[5] = bound_atk_bonus
+                    bound[6] = base_atk + bound_atk_bonus
+                    bound[7] = bound_score
+                    if need_floor:
+                        fill_floor(floor, cr_at[depth], cd_at[depth], atk_pct_at[depth], atk_flat_at[depth],
+                                   spd_at[depth], suffix_min[depth], base_atk, base_spd)
+                    if single is not None:
+                        if not (single.admits_picks(bound, floor, picks, depth) if single.uses_picks
+                                else single.admits(bound, floor)):
+                            active = 0
+                    else:
+                        for bit, collector, _, _ in members:
+                            if active & bit and not (
+                                    collector.admits_picks(bound, floor, picks, depth) if collector.uses_picks
+                                    else collector.admits(bound, floor)):
+                                active ^= bit
+
+            if active:
+                # 자식 노드 준비 (치확 100에 도달 가능한 앞쪽 후보만, MoveOrder 순서)
+                active_at[depth] = active
+                count = cr_feasible_count(depth + 1, cr_at[depth])
+                order = children(depth + 1, count, need_mask(rage_at[depth], fatal_at[depth], blade_at[depth], target))
+                order_at[depth] = order
+                cursor[depth] = 0
+                limit[depth] = len(order)
+                cr_limit[depth] = count
+            elif depth == root:
+                break
+            else:
+                # 백트래킹
+                depth -= 1
+
+            # 다음 자식 찾기 (없으면 위로 올라감)
+            while True:
+                while cursor[depth] >= limit[depth]:
+                    if depth == root:
+                        self.nodes = nodes
+                        return
+                    depth -= 1
+                c = cursor[depth]
+                cursor[depth] = c + 1
+                k = order_at[depth][c]
+                if k >= cr_limit[depth]:
+                    continue
+                n = depth + 1
+                if spd_needed is not None and spd_at[depth] + vectors[n][k][4] + suffix_max[n][4] < spd_needed:
+                    continue
+                counts = set_counts[n][k]
+                # 세트 시그니처로 세트 조건을 만족할 수 없는 자식은 진입 전에 제외
+                # (scoring.set_signature_feasible 인라인: 남은 슬롯 + 이미 고른 무형으로 부족분 충당)
+                rage = rage_at[depth] + counts[0]
+                fatal = fatal_at[depth] + counts[1]
+                blade = blade_at[depth] + counts[2]
+                intangible = intangible_at[depth] + counts[3]
+                if intangible > 1:
+                    continue
+                need_rage_fatal = 4 - rage - fatal
+                if need_fatal and fatal == 0 and need_rage_fatal < 1:
+                    need_rage_fatal = 1
+                need_blade = 2 - blade
+                if ((need_rage_fatal if need_rage_fatal > 0 else 0) + (need_blade if need_blade > 0 else 0)
+                        <= 6 - n + intangible):
+                    break
+            slot = n
+            vector = vectors[slot][k]
+            cr_at[n] = cr_at[depth] + vector[0]
+            cd_at[n] = cd_at[depth] + vector[1]
+            atk_pct_at[n] = atk_pct_at[depth] + vector[2]
+            atk_flat_at[n] = atk_flat_at[depth] + vector[3]
+            spd_at[n] = spd_at[depth] + vector[4]
+            rage_at[n] = rage
+            fatal_at[n] = fatal
+            blade_at[n] = blade
+            intangible_at[n] = intangible
+            picks[depth] = runes[slot][k]
+            parent_active = active_at[depth]
+            depth = n
+            if nodes >= node_limit:
+                # 다음에 들어갈 노드의 경로를 남기고 중단
+                self.position = list(prefix) + [order_at[d][cursor[d] - 1] for d in range(root, depth)]
+                break
+
+        self.nodes = nodes
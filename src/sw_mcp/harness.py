@@ -0,0 +1,337 @@
+"""탐색 엔진 차등 테스트 + 벤치마크 하네스
+
+시드 고정 랜덤 인벤토리와 조건 세트에서 모든 엔진을 기준 구현(전수 탐색 + 모든 무형 배치를
+score_build로 채점)과 비교하고, 엔진별 처리 시간을 함께 기록한다.
+
+    python -m src.sw_mcp.harness --seeds 5 --per-slot 6
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from typing import List, Dict, Tuple, Callable, Optional, NamedTuple
+from .types import Rune, SubStat
+from concurrent.futures import ProcessPoolExecutor
+from .scoring import score_build, rune_stat_vector, rune_set_counts
+from .compact import CompactRunes
+from .optimizer import (filter_rune_by_slot, search_builds, search_builds_many, search_builds_parametric,
+                        search_builds_shared)
+from .distributed import search_builds_distributed
+from .pagination import SearchCursor
+
+# 슬롯별 메인 스탯 후보 (filter_rune_by_slot을 통과하는 조합 위주)
+MAIN_STATS = {1: [3], 2: [4, 8, 3], 3: [5], 4: [10, 9, 4], 5: [1], 6: [4, 2]}
+MAIN_VALUES = {1: 2448, 2: 63, 3: 160, 4: 63, 5: 160, 8: 42, 9: 58, 10: 80}
+# Rage/Fatal/Blade/무형 위주, 가끔 세트 조건에 기여하지 않는 세트(3)
+SET_CHOICES = [5, 8, 4, 4, 25, 3, 5, 8]
+
+# objective -> 포맷팅된 결과 키 (여기에 없는 objective는 search_builds가 SCORE로 정렬)
+RESULT_KEYS = {"SCORE": "score", "ATK_TOTAL": "atk_total", "ATK_BONUS": "atk_bonus", "CD": "cd_total"}
+
+# 기준 구현이 target별로 시도하는 무형 배치 (score_build 인자, 앞쪽 우선)
+INTANGIBLE_ASSIGNMENTS = {
+    "A": ("to_Rage", "to_Blade", "none"),
+    "B": ("to_Fatal", "to_Blade", "none"),
+}
+
+# 조건 세트 (constraints, objective, return_policy)
+QUERIES = [
+    (None, "SCORE", "top_n"),
+    ({"SPD": 120}, "SCORE", "top_n"),
+    ({"CR": 100, "ATK_TOTAL": 2400}, "ATK_TOTAL", "top_n"),
+    ({"MAX_SPD": 135, "MAX_CR": 125}, "CD", "top_n"),
+    ({"SPD": 115}, "SCORE", "all_at_best"),
+    ({"SPD": 110}, "SPD", "top_n"),
+]
+
+
+def random_inventory(seed: int, per_slot: int = 6) -> List[Rune]:
+    """시드 고정 랜덤 인벤토리 (슬롯마다 per_slot개)"""
+    rng = random.Random(seed)
+    runes = []
+    rune_id = 1
+    for slot in range(1, 7):
+        for _ in range(per_slot):
+            main = rng.choice(MAIN_STATS[slot])
+            # 슬롯3은 ATK/ATK% 서브가 없는 룬만 후보가 되므로 방어 계열 서브 위주
+            pool = [9, 10, 8, 2, 6, 11] if slot == 3 else [9, 10, 4, 3, 8, 2]
+            sub_ids = [stat_id for stat_id in rng.sample(pool, 4) if stat_id != main]
+            subs = [SubStat(stat_id, rng.randint(4, 30) if stat_id == 9 else rng.randint(4, 25), False, 0)
+                    for stat_id in sub_ids]
+            prefix = rng.choice([0, 0, 9, 10, 8, 4])
+            if prefix in sub_ids or prefix == main:
+                prefix = 0
+            runes.append(Rune(
+                rune_id=rune_id, slot=slot, set_id=rng.choice(SET_CHOICES),
+                main_stat_id=main, main_stat_value=MAIN_VALUES[main], subs=subs,
+                level=15, quality=5,
+                prefix_stat_id=prefix, prefix_stat_value=rng.randint(3, 8) if prefix else 0.0,
+            ))
+            rune_id += 1
+    return runes
+
+
+def reference_score(runes: List[Rune], target: str = "B", base_atk: int = 900) -> Tuple[float, Dict]:
+    """
+    target의 무형 배치(Rage/Fatal 쪽, Blade 쪽, 없음 - 무형이 없으면 없음만)를 모두 score_build로 채점한
+    최고 (스코어, 스탯)
+    유효한 배치가 없으면 (0, {}). 엔진이 쓰는 canonical_assignment / set_bonus를 거치지 않는 독립 구현이다.
+    """
+    best_score, best_stats = 0.0, {}
+    assignments = INTANGIBLE_ASSIGNMENTS[target] if any(rune.intangible for rune in runes) else ("none",)
+    for assignment in assignments:
+        score, stats = score_build(runes, target, assignment, base_atk)
+        if score > best_score:
+            best_score, best_stats = score, stats
+    return best_score, best_stats
+
+
+def reference_search(runes: List[Rune], constraints: Optional[Dict[str, float]], objective: str,
+                     return_policy: str, top_n: int, target: str = "B",
+                     base_atk: int = 900, base_spd: int = 104) -> List[Tuple[float, Tuple[int, ...]]]:
+    """
+    전수 탐색 기준 구현 (reference_score로 모든 조합 채점)
+    스탯과 세트 역할이 같은 룬은 엔진과 같이 처음 나온 룬 하나만 사용한다.
+    RESULT_KEYS에 없는 objective(SPD, CR 등)는 SCORE로 정렬한다.
+    Returns: [(objective 값, 슬롯 순서 rune_id)] objective 내림차순
+    """
+    slots = []
+    for slot in range(1, 7):
+        seen = set()
+        candidates = []
+        for rune in filter_rune_by_slot(runes, slot, target):
+            signature = (rune_stat_vector(rune), rune_set_counts(rune))
+            if signature not in seen:
+                seen.add(signature)
+                candidates.append(rune)
+        slots.append(candidates)
+
+    found = []
+    for combo in itertools.product(*slots):
+        score, stats = reference_score(list(combo), target, base_atk)
+        if score <= 0:
+            continue
+        metrics = {
+            "CR": stats["cr_total"], "CD": stats["cd_total"], "SPD": base_spd + stats["spd_total"],
+            "ATK_PCT": stats["atk_pct_total"], "ATK_FLAT": stats["atk_flat_total"],
+            "ATK_BONUS": stats["atk_bonus"], "ATK_TOTAL": stats["atk_total"], "SCORE": score,
+        }
+        ok = True
+        for key, limit in (constraints or {}).items():
+            if key.startswith("MAX_"):
+                ok = metrics[key[4:]] <= limit
+            else:
+                ok = metrics["SCORE" if key == "MIN_SCORE" else key] >= limit
+            if not ok:
+                break
+        if ok:
+            found.append((metrics[objective if objective in RESULT_KEYS else "SCORE"],
+                          tuple(rune.rune_id for rune in combo)))
+
+    found.sort(key=lambda x: x[0], reverse=True)
+    if return_policy == "all_at_best" and found:
+        found = [entry for entry in found if entry[0] == found[0][0]]
+    return found[:top_n]
+
+
+class Engine(NamedTuple):
+    """하네스 엔진: run(runes, constraints, objective, return_policy, top_n, target) -> 결과"""
+    name: str
+    run: Callable
+    supports: Callable
+    exact: bool = True
+
+
+def _search_engine(**options) -> Callable:
+    def run(runes, constraints, objective, return_policy, top_n, target):
+        return search_builds(runes, target=target, constraints=constraints, objective=objective,
+                             return_policy=return_policy, top_n=top_n, max_results=None, **options)
+    return run
+
+
+def _milp_supported(constraints, objective, return_policy) -> bool:
+    from .milp import milp_available
+    return milp_available()
+
+
+def _shared_run(runes, constraints, objective, return_policy, top_n, target):
+    """공유 메모리로 내보낸 인벤토리에 작업자 프로세스가 붙어 탐색 (search_builds_shared)"""
+    block = CompactRunes.from_runes(runes).export_shared()
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            return pool.submit(search_builds_shared, block.name, target=target, constraints=constraints,
+                               objective=objective, return_policy=return_policy, top_n=top_n,
+                               max_results=None).result()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _distributed_run(runes, constraints, objective, return_policy, top_n, target):
+    """로컬 작업자 프로세스 2개로 분산 탐색 (split_depth 2라 작업 훔치기가 일어날 수 있음)"""
+    return search_builds_distributed(runes, workers=2, target=target, constraints=constraints,
+                                     objective=objective, return_policy=return_policy, top_n=top_n)
+
+
+def _targets_run(runes, constraints, objective, return_policy, top_n, target):
+    """target A / B 쿼리를 한 번의 탐색으로 평가하고 target 쪽 결과 반환 (search_builds_many)"""
+    query = {"constraints": constraints, "objective": objective, "return_policy": return_policy,
+             "top_n": top_n, "max_results": None}
+    both = search_builds_many(runes, [dict(query, target="A"), dict(query, target="B")])
+    return both["AB".index(target)]
+
+
+def _parametric_run(runes, constraints, objective, return_policy, top_n, target):
+    """기본 스탯 여러 개를 한 번에 평가하고 기본값(900 / 104) 쪽 결과 반환 (search_builds_parametric)"""
+    return search_builds_parametric(runes, [900, 1100, 750], [104, 110, 98], target=target,
+                                    constraints=constraints, objective=objective,
+                                    return_policy=return_policy, top_n=top_n, max_results=None)[0]
+
+
+def _cursor_run(runes, constraints, objective, return_policy, top_n, target):
+    """커서 페이지를 top_n개가 찰 때까지 이어 붙임 (SearchCursor, 페이지 크기 3)"""
+    cursor = SearchCursor(runes, target=target, constraints=constraints, objective=objective, page_size=3)
+    results = []
+    while len(results) < top_n:
+        page = cursor.next_page()
+        if not page:
+            break
+        results.extend(page)
+    return results[:top_n]
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine) -> None:
+    """run_harness 비교 대상에 엔진 등록 (새 탐색 경로는 여기에 등록해 기본 비교에 포함시킨다)"""
+    ENGINES[engine.name] = engine
+
+
+register_engine(Engine("dfs", _search_engine(), lambda c, o, p: True))
+register_engine(Engine("mitm", _search_engine(engine="mitm"),
+                       lambda c, o, p: not c and o == "SCORE" and p == "top_n"))
+register_engine(Engine("milp", _search_engine(engine="milp"), _milp_supported))
+register_engine(Engine("fast", _search_engine(mode="fast"), lambda c, o, p: True, exact=False))
+register_engine(Engine("shared", _shared_run, lambda c, o, p: True))
+register_engine(Engine("distributed", _distributed_run, lambda c, o, p: True))
+register_engine(Engine("targets", _targets_run, lambda c, o, p: True))
+register_engine(Engine("parametric", _parametric_run, lambda c, o, p: True))
+register_engine(Engine("cursor", _cursor_run, lambda c, o, p: p == "top_n"))
+
+
+def compare_results(reference: List[Tuple[float, Tuple[int, ...]]], results: List[Dict],
+                    objective: str, top_n: int) -> Optional[str]:
+    """
+    기준 결과와 엔진 결과 비교 (다르면 설명 문자열, 같으면 None)
+    objective 값 목록이 같아야 하고, 마지막(경계) 값보다 큰 빌드의 rune_id 조합도 같아야 한다
+    (경계 값과 동점인 빌드는 엔진마다 고르는 순서가 다를 수 있음).
+    """
+    key = RESULT_KEYS.get(objective, "score")
+    values = [result[key] for result in results]
+    expected = [value for value, _ in reference]
+    if values != expected:
+        return f"objective 값 불일치: {expected[:5]} != {values[:5]}"
+
+    boundary = expected[-1] if len(expected) >= top_n else float("-inf")
+    expected_builds = {build for value, build in reference if value > boundary}
+    builds = {
+        tuple(result["slots"][slot]["rune_id"] for slot in range(1, 7))
+        for result in results if result[key] > boundary
+    }
+    if builds != expected_builds:
+        return f"빌드 불일치: {sorted(expected_builds - builds)[:3]} / {sorted(builds - expected_builds)[:3]}"
+    return None
+
+
+class HarnessReport:
+    """엔진별 케이스 수, 불일치 목록, 소요 시간"""
+
+    def __init__(self, engines: List[str]):
+        self.engines = ["reference"] + engines
+        self.cases = {name: 0 for name in self.engines}
+        self.seconds = {name: 0.0 for name in self.engines}
+        self.mismatches: Dict[str, List[str]] = {name: [] for name in self.engines}
+        self.gaps: Dict[str, float] = {}  # 근사 엔진의 objective 최대 차이
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.mismatches.values())
+
+    def format(self) -> str:
+        """엔진별 정확성/처리량 표"""
+        lines = [f"{'engine':<12} {'cases':>6} {'seconds':>9} {'cases/s':>9} {'speedup':>8}  result"]
+        for name in self.engines:
+            cases = self.cases[name]
+            seconds = self.seconds[name]
+            rate = cases / seconds if seconds > 0 else float("inf")
+            # 같은 케이스 집합에서의 기준 대비 속도 (케이스당 시간 비교)
+            reference_rate = self.cases["reference"] / max(self.seconds["reference"], 1e-9)
+            speedup = rate / reference_rate if cases else 0.0
+            if name in self.gaps:
+                result = f"max gap {self.gaps[name]:g}"
+            else:
+                result = "OK" if not self.mismatches[name] else f"{len(self.mismatches[name])} mismatches"
+            lines.append(f"{name:<12} {cases:>6} {seconds:>9.3f} {rate:>9.1f} {speedup:>7.1f}x  {result}")
+        for name in self.engines:
+            for mismatch in self.mismatches[name][:5]:
+                lines.append(f"  [{name}] {mismatch}")
+        return "\n".join(lines)
+
+
+def run_harness(seeds=range(3), per_slot: int = 6, targets=("A", "B"), top_n: int = 10,
+                engines: Optional[List[str]] = None) -> HarnessReport:
+    """시드 × target × 조건 세트마다 모든 엔진을 기준 구현과 비교"""
+    engines = list(engines or ENGINES)
+    for name in engines:
+        if name not in ENGINES:
+            raise ValueError(f"알 수 없는 엔진: {name}")
+    report = HarnessReport(engines)
+
+    for seed in seeds:
+        runes = random_inventory(seed, per_slot)
+        for target in targets:
+            for constraints, objective, return_policy in QUERIES:
+                case = f"seed={seed} target={target} {constraints} {objective} {return_policy}"
+                start = time.perf_counter()
+                reference = reference_search(runes, constraints, objective, return_policy, top_n, target)
+                report.seconds["reference"] += time.perf_counter() - start
+                report.cases["reference"] += 1
+
+                for name in engines:
+                    engine = ENGINES[name]
+                    if not engine.supports(constraints, objective, return_policy):
+                        continue
+                    start = time.perf_counter()
+                    results = engine.run(runes, constraints, objective, return_policy, top_n, target)
+                    report.seconds[name] += time.perf_counter() - start
+                    report.cases[name] += 1
+
+                    if engine.exact:
+                        mismatch = compare_results(reference, results, objective, top_n)
+                        if mismatch:
+                            report.mismatches[name].append(f"{case}: {mismatch}")
+                    elif reference:
+                        # 근사 엔진은 최고값 차이만 기록
+                        best = results[0][RESULT_KEYS.get(objective, "score")] if results else float("-inf")
+                        report.gaps[name] = max(report.gaps.get(name, 0.0), reference[0][0] - best)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="탐색 엔진 차등 테스트 + 벤치마크")
+    parser.add_argument("--seeds", type=int, default=3, help="랜덤 인벤토리 수")
+    parser.add_argument("--per-slot", type=int, default=6, help="슬롯별 룬 수")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--engines", nargs="*", default=None, help=f"비교할 엔진 ({', '.join(ENGINES)})")
+    args = parser.parse_args(argv)
+
+    report = run_harness(range(args.seeds), args.per_slot, top_n=args.top_n, engines=args.engines)
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""슬롯별 후보 인덱스 (정렬된 후보 + suffix 상한 테이블, SPD 구간별 결합 상한)"""
+
+import math
+from bisect import bisect_right
+from typing import List, Dict, Tuple, Optional
+from .types import Rune, BASE_CR, BLADE_2SET_CR
+from .scoring import rune_stat_vector, rune_set_counts, linear_score_key
+
+# rune_stat_vector 순서의 스탯 키
+STAT_KEYS = ("CR", "CD", "ATK_PCT", "ATK_FLAT", "SPD")
+
+# 치확 100 = 기본 15 + Blade 12 + 룬 치확 (세트 조건을 만족하는 빌드는 항상 Blade 2세트)
+REQUIRED_RUNE_CR = 100.0 - BASE_CR - BLADE_2SET_CR
+
+
+class SlotIndex:
+    """
+    슬롯별 후보 룬 인덱스
+
+    - runes[slot]: CR 내림차순으로 정렬된 후보 룬
+      (collapse=True이면 스탯 벡터와 세트 역할이 같은 룬 중 대표 하나)
+    - alternatives[slot]: 같은 순서로, 대표 룬과 동등한 나머지 룬
+    - vectors[slot]: 같은 순서의 rune_stat_vector
+    - set_counts[slot]: 같은 순서의 rune_set_counts
+    - suffix_max[slot]: 슬롯 slot~6에서 얻을 수 있는 스탯별 최대 합 (slot 7은 0)
+    - suffix_min[slot]: 슬롯 slot~6에서 반드시 더해지는 스탯별 최소 합 (최대 조건 pruning용)
+    """
+
+    def __init__(self, slot_runes: Dict[int, List[Rune]], collapse: bool = True):
+        self.runes: Dict[int, List[Rune]] = {}
+        self.alternatives: Dict[int, List[List[Rune]]] = {}
+        self.vectors: Dict[int, List[Tuple[float, ...]]] = {}
+        self.set_counts: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        self._neg_cr: Dict[int, List[float]] = {}
+        self._position: Dict[int, Tuple[int, int]] = {}
+        self.suffix_max: Dict[int, Tuple[float, ...]] = {7: (0.0,) * len(STAT_KEYS)}
+        self.suffix_min: Dict[int, Tuple[float, ...]] = {7: (0.0,) * len(STAT_KEYS)}
+
+        for slot in range(1, 7):
+            # 스탯 벡터와 세트 역할이 같은 룬은 하나의 후보로 합친다 (처음 나온 룬이 대표)
+            entries = []  # [대표 룬, 스탯 벡터, 세트 개수, 동등한 룬]
+            seen: Dict[Tuple, list] = {}
+            for rune in slot_runes.get(slot, []):
+                vector = rune_stat_vector(rune)
+                counts = rune_set_counts(rune)
+                entry = seen.get((vector, counts)) if collapse else None
+                if entry is None:
+                    entry = [rune, vector, counts, []]
+                    seen[(vector, counts)] = entry
+                    entries.append(entry)
+                else:
+                    entry[3].append(rune)
+            # CR 내림차순 (같은 CR이면 원래 순서 유지)
+            entries.sort(key=lambda entry: entry[1][0], reverse=True)
+            self.runes[slot] = [entry[0] for entry in entries]
+            self.vectors[slot] = [entry[1] for entry in entries]
+            self.set_counts[slot] = [entry[2] for entry in entries]
+            self.alternatives[slot] = [entry[3] for entry in entries]
+            self._neg_cr[slot] = [-vector[0] for vector in self.vectors[slot]]
+            for k, entry in enumerate(entries):
+                for rune in [entry[0]] + entry[3]:
+                    self._position[rune.rune_id] = (slot, k)
+
+        for slot in range(6, 0, -1):
+            slot_max = [0.0] * len(STAT_KEYS)
+            for vector in self.vectors[slot]:
+                for k, value in enumerate(vector):
+                    if value > slot_max[k]:
+                        slot_max[k] = value
+            self.suffix_max[slot] = tuple(a + b for a, b in zip(self.suffix_max[slot + 1], slot_max))
+            # 후보가 없는 슬롯은 탐색하지 않으므로 0으로 둔다
+            slot_min = [min(values) for values in zip(*self.vectors[slot])] or [0.0] * len(STAT_KEYS)
+            self.suffix_min[slot] = tuple(a + b for a, b in zip(self.suffix_min[slot + 1], slot_min))
+
+    def equivalent_ids(self) -> Dict[int, List[int]]:
+        """대표 룬 rune_id -> 동등한 나머지 룬의 rune_id (결과 포맷팅용)"""
+        return {
+            rune.rune_id: [alt.rune_id for alt in alts]
+            for slot in range(1, 7)
+            for rune, alts in zip(self.runes[slot], self.alternatives[slot])
+            if alts
+        }
+
+    def locate(self, rune_id: int) -> Optional[Tuple[int, int]]:
+        """rune_id의 (슬롯, 후보 인덱스) - 동등한 룬은 대표 후보 위치 (후보가 아니면 None)"""
+        return self._position.get(rune_id)
+
+    def max_remaining(self, slot: int) -> Dict[str, float]:
+        """슬롯 slot~6에서 얻을 수 있는 최대 스탯 (check_constraints 형식)"""
+        return dict(zip(STAT_KEYS, self.suffix_max[slot]))
+
+    def min_remaining(self, slot: int) -> Dict[str, float]:
+        """슬롯 slot~6에서 반드시 더해지는 최소 스탯"""
+        return dict(zip(STAT_KEYS, self.suffix_min[slot]))
+
+    def cr_feasible_count(self, slot: int, partial_cr: float,
+                          required_cr: float = REQUIRED_RUNE_CR) -> int:
+        """
+        slot에서 치확 조건에 도달 가능한 후보 수
+        CR 내림차순이므로 runes[slot]의 앞쪽 count개만 시도하면 된다
+        (partial_cr + 룬 CR + 이후 슬롯 최대 CR >= required_cr).
+        """
+        threshold = required_cr - partial_cr - self.suffix_max[slot + 1][0]
+        return bisect_right(self._neg_cr[slot], -threshold)
+
+
+class SpeedIndex:
+    """
+    SPD 값별로 나눈 슬롯 후보 인덱스 (속도 조건 쿼리의 결합 상한)
+
+    - buckets[slot]: [(SPD, 스탯별 최대)] SPD 내림차순. 같은 SPD(올림 정수) 후보를 한 구간으로
+      묶고 구간마다 (CR, CD, ATK%, ATK+, 선형 스코어 키) 최대값을 둔다.
+    - joint[slot][s]: 슬롯 slot~6에서 SPD 합이 s 이상인 조합으로 얻을 수 있는 스탯별 최대 합
+      (s는 0 ~ 슬롯 slot~6 최대 SPD 합, 범위를 넘는 s는 조합이 없음). 구간 DP로 한 번 계산한다.
+    suffix_max는 스탯마다 독립인 최대값이라 SPD가 높은 룬과 치피가 높은 룬을 동시에 가정하지만,
+    joint는 SPD 조건을 만족하는 조합 안에서의 최대값이므로 속도 조건이 빡빡할수록 상한이 좁다.
+    선형 스코어 키는 scoring.linear_score_key (치피*10 + 공격력 기여)로 base_atk에 따라 다르다.
+    """
+
+    def __init__(self, index: SlotIndex, base_atk: int = 900):
+        self.buckets: Dict[int, List[Tuple[int, Tuple[float, ...]]]] = {}
+        self.joint: Dict[int, List[Tuple[float, ...]]] = {7: [(0.0,) * 5]}
+        for slot in range(6, 0, -1):
+            best: Dict[int, List[float]] = {}
+            for vector in index.vectors[slot]:
+                spd = math.ceil(vector[4])
+                stats = (vector[0], vector[1], vector[2], vector[3], linear_score_key(vector, base_atk))
+                current = best.get(spd)
+                best[spd] = list(stats) if current is None else [max(a, b) for a, b in zip(current, stats)]
+            self.buckets[slot] = [(spd, tuple(best[spd])) for spd in sorted(best, reverse=True)]
+
+            # joint[slot][s] = 구간별 max(구간 최대 + joint[slot + 1][max(0, s - 구간 SPD)])
+            following = self.joint[slot + 1]
+            top = max(best) + len(following) - 1 if best else -1
+            row = []
+            for s in range(max(top, 0) + 1):
+                combined = None
+                for spd, stats in self.buckets[slot]:
+                    rest = s - spd
+                    if rest >= len(following):
+                        continue
+                    tail = following[rest if rest > 0 else 0]
+                    total = [a + b for a, b in zip(stats, tail)]
+                    combined = total if combined is None else [max(a, b) for a, b in zip(combined, total)]
+                if combined is None:
+                    break
+                row.append(tuple(combined))
+            self.joint[slot] = row
+
+    def joint_max(self, slot: int, spd_needed: float) -> Optional[Tuple[float, ...]]:
+        """
+        슬롯 slot~6에서 SPD 합 spd_needed 이상인 조합의 (CR, CD, ATK%, ATK+, 선형 스코어 키) 최대 합
+        그런 조합이 없으면 None
+        """
+        row = self.joint[slot]
+        s = math.ceil(spd_needed) if spd_needed > 0 else 0
+        return row[s] if s < len(row) else None
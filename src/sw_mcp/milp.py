@@ -0,0 +1,181 @@
+"""정수 계획법(MILP) 탐색 엔진 (선택 의존성: PuLP + CBC)"""
+
+import warnings
+from typing import List, Tuple
+from .types import BASE_CR, BASE_CD, RAGE_4SET_CD, FATAL_4SET_ATK_PCT, BLADE_2SET_CR
+from .index import SlotIndex
+from .scoring import score_from_totals
+from .constraints import BOUND_KEYS
+from .collectors import TopCollector
+
+try:
+    import pulp
+except ImportError:  # 선택 의존성
+    pulp = None
+
+# 반올림(atk_bonus)이 들어가는 값은 선형식과 최대 0.5 차이
+ROUNDED_KEYS = ("ATK_BONUS", "ATK_TOTAL", "SCORE")
+EPSILON = 1e-6
+
+
+def milp_available() -> bool:
+    """PuLP를 사용할 수 있는지"""
+    return pulp is not None
+
+
+def _solver():
+    """
+    CBC 솔버
+    CBC 실행 파일이 설치되어 있으면 (pip install pulp[cbc]) COIN_CMD, 없으면 PuLP 4.0 전까지
+    PuLP에 포함된 CBC(PULP_CBC_CMD)를 쓴다 (setup.py의 milp extra는 pulp<4로 고정).
+    """
+    solver = pulp.COIN_CMD(msg=False)
+    if solver.available():
+        return solver
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="PULP_CBC_CMD is deprecated", category=DeprecationWarning)
+        return pulp.PULP_CBC_CMD(msg=False)
+
+
+def _binary(problem, name: str):
+    """problem의 0/1 변수 (PuLP 4.0 API가 있으면 problem.add_variable)"""
+    if hasattr(problem, "add_variable"):
+        return problem.add_variable(name, cat="Binary")
+    return pulp.LpVariable(name, cat="Binary")
+
+
+class MilpSolver:
+    """
+    룬 선택을 0/1 정수 계획 문제로 풀어 objective 상위 빌드를 찾는 엔진
+
+    - 변수: 슬롯별 후보 선택 x[slot][k], 무형 배치 (Rage/Fatal 쪽, Blade 쪽),
+      적용되는 4세트 보너스 (Rage 치피 / Fatal 공퍼, Rage 우선)
+    - 제약: 슬롯마다 후보 하나, 무형 최대 1개, Rage/Fatal 4세트 + Blade 2세트,
+      치확 100, 쿼리의 최소/최대 조건 (반올림 값은 0.5 여유를 둔 선형식)
+    - objective는 반올림 전 선형식으로 최대화하고, 해마다 정확한 스코어로 보정해
+      수집기에 넣은 뒤 같은 빌드를 막는 no-good cut을 추가해 다시 푼다.
+      선형 최적값 + 반올림 여유가 수집기 임계값에 못 미치면 종료한다.
+
+    TopCollector(top_n / all_at_best)만 지원한다.
+    """
+
+    def __init__(self, index: SlotIndex, target: str = "B", base_atk: int = 900, base_spd: int = 104):
+        if pulp is None:
+            raise ImportError("milp 엔진에는 PuLP가 필요합니다 (pip install .[milp])")
+        self.index = index
+        self.target = target
+        self.base_atk = base_atk
+        self.base_spd = base_spd
+        self.solves = 0  # 마지막 run의 MILP 풀이 횟수
+
+    def _build(self, collector: TopCollector):
+        """MILP 모델 구성: (문제, 선택 변수, objective 선형식)"""
+        index = self.index
+        problem = pulp.LpProblem("lushen", pulp.LpMaximize)
+        x = {
+            slot: [_binary(problem, f"x_{slot}_{k}") for k in range(len(index.runes[slot]))]
+            for slot in range(1, 7)
+        }
+
+        def total(column: int, source: str = "vectors"):
+            table = getattr(index, source)
+            return pulp.lpSum(table[slot][k][column] * var
+                              for slot in range(1, 7) for k, var in enumerate(x[slot]))
+
+        for slot in range(1, 7):
+            problem += pulp.lpSum(x[slot]) == 1
+
+        # 세트 조건 (무형은 최대 1개, Rage/Fatal 쪽 또는 Blade 쪽 하나에만 붙음)
+        rage = total(0, "set_counts")
+        fatal = total(1, "set_counts")
+        blade = total(2, "set_counts")
+        intangible = total(3, "set_counts")
+        to_rage_fatal = _binary(problem, "to_rage_fatal")
+        to_blade = _binary(problem, "to_blade")
+        problem += intangible <= 1
+        problem += to_rage_fatal + to_blade <= intangible
+        problem += rage + fatal + to_rage_fatal >= 4
+        problem += blade + to_blade >= 2
+
+        # 4세트 보너스: Rage와 Fatal이 모두 있으면 Rage 우선 (scoring.set_bonus와 동일)
+        # target A의 무형은 to_Rage, target B의 무형은 to_Fatal
+        rage_bonus = _binary(problem, "rage_bonus")
+        fatal_bonus = _binary(problem, "fatal_bonus")
+        has_rage = rage + to_rage_fatal if self.target == "A" else rage
+        has_fatal = fatal if self.target == "A" else fatal + to_rage_fatal
+        problem += rage_bonus + fatal_bonus == 1
+        problem += rage_bonus <= has_rage
+        problem += fatal_bonus <= has_fatal
+        problem += has_rage <= 6 * (1 - fatal_bonus)
+        if self.target == "B":
+            problem += has_fatal >= 1
+
+        # BOUND_KEYS 순서의 선형식 (세트 조건을 만족하는 빌드는 항상 Blade 2세트)
+        cr = BASE_CR + BLADE_2SET_CR + total(0)
+        cd = BASE_CD + total(1) + RAGE_4SET_CD * rage_bonus
+        atk_pct = total(2) + FATAL_4SET_ATK_PCT * fatal_bonus
+        atk_flat = total(3)
+        atk_bonus = (self.base_atk / 100.0) * atk_pct + atk_flat
+        exprs = (
+            cr,
+            cd,
+            self.base_spd + total(4),
+            atk_pct,
+            atk_flat,
+            atk_bonus,
+            self.base_atk + atk_bonus,
+            cd * 10 + atk_bonus + 200,
+        )
+        problem += cr >= 100.0
+
+        # 쿼리 조건 (반올림 값은 여유를 두고, 정확한 판정은 수집기에서)
+        plan = collector.plan
+        for i, minimum in plan.lower:
+            problem += exprs[i] >= minimum - self._slack(i)
+        for i, maximum in plan.upper:
+            problem += exprs[i] <= maximum + self._slack(i)
+
+        objective = exprs[collector.objective_index]
+        problem += objective
+        return problem, x, objective
+
+    @staticmethod
+    def _slack(i: int) -> float:
+        return (0.5 if BOUND_KEYS[i] in ROUNDED_KEYS else 0.0) + EPSILON
+
+    def run(self, collector: TopCollector) -> None:
+        """no-good cut을 추가하며 반복해서 풀어 collector를 채운다"""
+        index = self.index
+        problem, x, objective = self._build(collector)
+        solver = _solver()
+        slack = self._slack(collector.objective_index)
+        self.solves = 0
+
+        while not collector.done:
+            self.solves += 1
+            if problem.solve(solver) != pulp.LpStatusOptimal:
+                break
+            if not collector.admits_value(pulp.value(objective) + slack):
+                break
+
+            positions = [
+                max(range(len(x[slot])), key=lambda k: x[slot][k].varValue)
+                for slot in range(1, 7)
+            ]
+            totals, counts = self._totals(positions)
+            assignment, score, stats = score_from_totals(totals, counts, self.target, self.base_atk)
+            if score > 0:
+                collector.offer(score, stats, assignment,
+                                [index.runes[slot][k] for slot, k in zip(range(1, 7), positions)])
+
+            # no-good cut: 같은 6개 후보 조합 제외
+            problem += pulp.lpSum(x[slot][k] for slot, k in zip(range(1, 7), positions)) <= 5
+
+    def _totals(self, positions: List[int]) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+        index = self.index
+        totals = [0.0] * 5
+        counts = [0] * 4
+        for slot, k in zip(range(1, 7), positions):
+            totals = [a + b for a, b in zip(totals, index.vectors[slot][k])]
+            counts = [a + b for a, b in zip(counts, index.set_counts[slot][k])]
+        return tuple(totals), tuple(counts)
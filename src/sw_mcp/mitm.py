@@ -0,0 +1,137 @@
+"""Meet-in-the-middle 탐색 (슬롯 1~3 × 슬롯 4~6 반쪽 빌드 결합)"""
+
+import heapq
+from itertools import product
+from typing import List, Dict, Tuple
+from collections import defaultdict
+from .types import Rune, BASE_CR, BASE_CD, BLADE_2SET_CR
+from .scoring import (rune_stat_vector, rune_set_counts, linear_score_key,
+                      canonical_assignment, set_bonus, score_from_totals)
+
+# 세트 역할 (무형/Rage/Fatal/Blade 외의 세트는 세트 조건을 채울 수 없음)
+ROLE_SET_IDS = (5, 8, 4, 25)
+
+
+def _half_builds(slot_runes: Dict[int, List[Rune]], slots: Tuple[int, int, int],
+                 base_atk: int, min_cr: float) -> Dict[Tuple[int, int, int, int], List[Tuple]]:
+    """
+    반쪽 빌드를 세트 시그니처별로 묶어 선형 스코어 키 내림차순으로 정렬
+    min_cr: 반대쪽 최대 CR을 더해도 치확 100에 못 미치는 반쪽 빌드 제외 기준
+    Returns: {(rage, fatal, blade, intangible): [(key, totals, runes), ...]}
+    """
+    groups = defaultdict(list)
+    candidates = [
+        [(rune, rune_stat_vector(rune), rune_set_counts(rune))
+         for rune in slot_runes[slot] if rune.set_id in ROLE_SET_IDS]
+        for slot in slots
+    ]
+    
+    for combo in product(*candidates):
+        totals = tuple(sum(values) for values in zip(*(vector for _, vector, _ in combo)))
+        if totals[0] < min_cr:
+            continue
+        signature = tuple(sum(values) for values in zip(*(counts for _, _, counts in combo)))
+        if signature[3] > 1:
+            continue
+        key = linear_score_key(totals, base_atk)
+        groups[signature].append((key, totals, tuple(rune for rune, _, _ in combo)))
+    
+    for group in groups.values():
+        group.sort(key=lambda x: x[0], reverse=True)
+    return groups
+
+
+def _stream_bonuses(signature: Tuple[int, int, int, int], target: str, base_atk: int) -> List[float]:
+    """
+    결합된 세트 시그니처의 유효한 무형 배치별 선형 키 보너스
+    (무형 배치는 세트 구성에 따라 최대 한 가지만 유효)
+    """
+    assignment = canonical_assignment(signature, target)
+    if assignment is None:
+        return []
+    bonus = set_bonus(signature, target, assignment)
+    return [linear_score_key((0.0,) + bonus[1:] + (0.0,), base_atk)]
+
+
+def search_top_builds_mitm(slot_runes: Dict[int, List[Rune]],
+                           target: str = "B", base_atk: int = 900,
+                           top_n: int = 20) -> List[Dict]:
+    """
+    반쪽 빌드 결합으로 스코어 상위 N개 빌드 탐색 (제약 조건 없음)
+    
+    슬롯 1~3과 4~6의 반쪽 빌드를 세트 시그니처별로 묶어 키 내림차순 정렬한 뒤,
+    호환되는 시그니처 쌍을 최선 우선(threshold algorithm)으로 병합한다.
+    남은 쌍의 상한이 N번째 점수보다 낮아지면 즉시 종료한다.
+    
+    Returns: 정렬 전 결과 리스트 ({"runes", "score", "stats", "intangible_assignment"})
+    """
+    # 치확 100 = 기본 15 + Blade 12 + 룬 치확 (유효한 빌드는 항상 Blade 2세트)
+    need_cr = 100.0 - BASE_CR - BLADE_2SET_CR
+
+    def max_cr(slots):
+        total = 0.0
+        for slot in slots:
+            total += max((rune_stat_vector(r)[0] for r in slot_runes[slot]
+                          if r.set_id in ROLE_SET_IDS), default=0.0)
+        return total
+    
+    left = _half_builds(slot_runes, (1, 2, 3), base_atk, need_cr - max_cr((4, 5, 6)))
+    right = _half_builds(slot_runes, (4, 5, 6), base_atk, need_cr - max_cr((1, 2, 3)))
+    
+    # 시그니처 쌍별 스트림: (좌 그룹, 우 그룹, 보너스)
+    streams = []
+    for left_sig, left_group in left.items():
+        for right_sig, right_group in right.items():
+            combined = tuple(a + b for a, b in zip(left_sig, right_sig))
+            for bonus in _stream_bonuses(combined, target, base_atk):
+                streams.append((left_group, right_group, bonus, combined))
+    
+    # 스코어 상한: BASE_CD*10 + 200 + 보너스 + 키 합 + 반올림 여유 0.5
+    constant = BASE_CD * 10 + 200 + 0.5
+    heap = []
+    for stream_id, (left_group, right_group, bonus, _) in enumerate(streams):
+        bound = constant + bonus + left_group[0][0] + right_group[0][0]
+        heap.append((-bound, stream_id, 0, 0))
+    heapq.heapify(heap)
+    
+    best = []  # (score, 순번, result) 최소 힙
+    counter = 0
+    while heap:
+        neg_bound, stream_id, i, j = heapq.heappop(heap)
+        if len(best) >= top_n and -neg_bound < best[0][0]:
+            break
+        
+        left_group, right_group, bonus, signature = streams[stream_id]
+        # 각 (i, j)를 정확히 한 번씩 방문: (i, j+1)은 항상, (i+1, 0)은 j == 0일 때만
+        if j + 1 < len(right_group):
+            bound = constant + bonus + left_group[i][0] + right_group[j + 1][0]
+            heapq.heappush(heap, (-bound, stream_id, i, j + 1))
+        if j == 0 and i + 1 < len(left_group):
+            bound = constant + bonus + left_group[i + 1][0] + right_group[0][0]
+            heapq.heappush(heap, (-bound, stream_id, i + 1, 0))
+        
+        left_key, left_totals, left_runes = left_group[i]
+        right_key, right_totals, right_runes = right_group[j]
+        if left_totals[0] + right_totals[0] < need_cr:
+            continue
+        
+        # 리프 보정: 반올림/세트/치확 조건을 적용한 정확한 스코어
+        totals = tuple(a + b for a, b in zip(left_totals, right_totals))
+        assignment, score, stats = score_from_totals(totals, signature, target, base_atk)
+        if score <= 0:
+            continue
+        
+        rune_combo = list(left_runes + right_runes)
+        result = {
+            "runes": rune_combo,
+            "score": score,
+            "stats": stats,
+            "intangible_assignment": assignment,
+        }
+        counter += 1
+        if len(best) < top_n:
+            heapq.heappush(best, (score, counter, result))
+        elif score > best[0][0]:
+            heapq.heapreplace(best, (score, counter, result))
+    
+    return [result for _, _, result in best]
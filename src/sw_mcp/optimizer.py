@@ -1,9 +1,15 @@
 """루쉔 최적화"""
 
-from typing import List, Dict, Tuple, Optional, Set
-from collections import defaultdict
-from .types import Rune, STAT_ID_NAME, BASE_CR, BASE_CD
-from .scoring import score_build, find_best_intangible_assignment, calculate_stats
+from typing import List, Dict, Tuple, Optional, Set, Union
+from .types import (Rune, STAT_ID_NAME, BASE_CR, BASE_CD,
+                    RAGE_4SET_CD, FATAL_4SET_ATK_PCT, BLADE_2SET_CR)
+from .scoring import rune_stat_vector, linear_score_key, set_signature_feasible
+from .index import SlotIndex, STAT_KEYS
+from .constraints import BOUND_KEYS, ConstraintPlan, floor_vector, bound_vector
+from .collectors import TopCollector, DiverseCollector, MarginalCollector, make_collector
+from .engine import SearchEngine
+from .beam import BeamSearch
+from .compact import CompactRunes
 
 
 def filter_rune_by_slot(runes: List[Rune], slot: int, target: str = "B") -> List[Rune]:
@@ -30,6 +36,9 @@ def filter_rune_by_slot(runes: List[Rune], slot: int, target: str = "B") -> List
 
 class DPState:
     """DP 상태"""
+    __slots__ = ("count_rage_fatal", "count_blade", "has_intangible",
+                 "cr", "cd", "atk_pct", "atk_flat", "spd", "rune_ids")
+    
     def __init__(self, count_rage_fatal: int = 0, count_blade: int = 0, 
                  has_intangible: bool = False, cr: float = 0.0, cd: float = 0.0,
                  atk_pct: float = 0.0, atk_flat: float = 0.0, spd: float = 0.0,
@@ -199,42 +208,54 @@ def calculate_max_remaining_stats(slot_runes: Dict[int, List[Rune]], start_slot:
     return max_stats
 
 
-def check_constraints(state: DPState, constraints: Dict[str, float], 
-                     slot_runes: Dict[int, List[Rune]], current_slot: int,
-                     base_atk: int, base_spd: int, target: str = "B") -> bool:
-    """제약 조건을 만족할 수 있는지 확인 (pruning)"""
-    if not constraints:
-        return True
-    
+def precompute_max_remaining_stats(slot_runes: Dict[int, List[Rune]]) -> Dict[int, Dict[str, float]]:
+    """
+    슬롯별 남은 최대 스탯(suffix bound)을 한 번에 계산
+    Returns: {slot: 슬롯 slot~6에서 얻을 수 있는 최대 스탯} (slot 7은 0)
+    """
+    index = SlotIndex(slot_runes)
+    return {slot: index.max_remaining(slot) for slot in range(1, 8)}
+
+
+def calculate_min_remaining_stats(slot_runes: Dict[int, List[Rune]], start_slot: int) -> Dict[str, float]:
+    """남은 슬롯에서 반드시 더해지는 최소 스탯 계산 (최대 조건 pruning용, 후보가 없는 슬롯은 0)"""
+    min_stats = {key: 0.0 for key in STAT_KEYS}
+    for slot in range(start_slot, 7):
+        vectors = [rune_stat_vector(rune) for rune in slot_runes.get(slot, [])]
+        for key, values in zip(STAT_KEYS, zip(*vectors)):
+            min_stats[key] += min(values)
+    return min_stats
+
+
+def optimistic_stats(state: DPState, max_remaining: Dict[str, float], current_slot: int,
+                     base_atk: int, base_spd: int, target: str = "B") -> Dict[str, float]:
+    """
+    현재 상태에서 남은 슬롯(current_slot~6)을 채웠을 때 도달 가능한 스탯 상한
+    max_remaining: current_slot부터의 남은 최대 스탯
+    """
     # 현재까지의 스탯 (기본값 포함)
     current_cr = BASE_CR + state.cr
     current_cd = BASE_CD + state.cd
     current_spd = base_spd + state.spd
+    atk_pct_bonus = 0.0
     
-    # 남은 슬롯에서 얻을 수 있는 최대 스탯
-    max_remaining = calculate_max_remaining_stats(slot_runes, current_slot + 1)
-    
-    # 남은 슬롯에서 얻을 수 있는 최대 세트 개수 (간단한 추정)
-    remaining_slots = 6 - current_slot
-    # 최선의 경우: 남은 슬롯 모두 같은 세트
-    max_remaining_rage_fatal = min(remaining_slots, 4 - state.count_rage_fatal)
-    max_remaining_blade = min(remaining_slots, 2 - state.count_blade)
+    # 남은 슬롯에서 얻을 수 있는 최대 세트 개수 (무형은 어느 쪽에든 붙을 수 있음)
+    remaining_slots = 7 - current_slot
+    joker = 1 if state.has_intangible else 0
+    potential_rage_fatal_count = state.count_rage_fatal + remaining_slots + joker
+    potential_blade_count = state.count_blade + remaining_slots + joker
     
-    # 세트 보너스 고려 (최선의 경우 가정)
     # Blade 2세트 보너스 CR +12
-    potential_blade_count = state.count_blade + max_remaining_blade
     if potential_blade_count >= 2:
-        current_cr += 12
+        current_cr += BLADE_2SET_CR
     
     # Rage/Fatal 4세트 보너스 (최선의 경우)
-    potential_rage_fatal_count = state.count_rage_fatal + max_remaining_rage_fatal
+    # Rage/Fatal은 함께 카운트되므로 target과 무관하게 두 보너스 모두 가능한 상한으로 본다
     if potential_rage_fatal_count >= 4:
-        if target == "A":
-            # Rage 4세트: CD +40
-            current_cd += 40
-        else:
-            # Fatal 4세트: ATK% +35
-            max_remaining["ATK_PCT"] += 35
+        # Rage 4세트: CD +40
+        current_cd += RAGE_4SET_CD
+        # Fatal 4세트: ATK% +35
+        atk_pct_bonus = FATAL_4SET_ATK_PCT
     
     # 최종 예상 스탯
     final_cr = current_cr + max_remaining["CR"]
@@ -242,117 +263,97 @@ def check_constraints(state: DPState, constraints: Dict[str, float],
     final_spd = current_spd + max_remaining["SPD"]
     
     # ATK_BONUS와 ATK_TOTAL 계산
-    final_atk_pct = state.atk_pct + max_remaining["ATK_PCT"]
+    final_atk_pct = state.atk_pct + max_remaining["ATK_PCT"] + atk_pct_bonus
     final_atk_flat = state.atk_flat + max_remaining["ATK_FLAT"]
     final_atk_bonus = round(base_atk * (final_atk_pct / 100.0) + final_atk_flat)
-    final_atk_total = base_atk + final_atk_bonus
-    
-    # 제약 조건 체크
-    if "CR" in constraints and final_cr < constraints["CR"]:
-        return False
-    if "CD" in constraints and final_cd < constraints["CD"]:
-        return False
-    if "SPD" in constraints and final_spd < constraints["SPD"]:
-        return False
-    if "ATK_BONUS" in constraints and final_atk_bonus < constraints["ATK_BONUS"]:
-        return False
-    if "ATK_TOTAL" in constraints and final_atk_total < constraints["ATK_TOTAL"]:
-        return False
-    if "ATK_PCT" in constraints and final_atk_pct < constraints["ATK_PCT"]:
-        return False
-    if "ATK_FLAT" in constraints and final_atk_flat < constraints["ATK_FLAT"]:
-        return False
-    
-    return True
+    
+    return {
+        "CR": final_cr,
+        "CD": final_cd,
+        "SPD": final_spd,
+        "ATK_PCT": final_atk_pct,
+        "ATK_FLAT": final_atk_flat,
+        "ATK_BONUS": final_atk_bonus,
+        "ATK_TOTAL": base_atk + final_atk_bonus,
+        "SCORE": (final_cd * 10) + final_atk_bonus + 200,
+    }
 
 
-def optimize_lushen(runes: List[Rune], target: str = "B", 
-                    gem_mode: str = "none", grind_mode: str = "none",
-                    top_n: int = 10, base_atk: int = 900) -> List[Dict]:
+def check_constraints(state: DPState, constraints: Dict[str, float], 
+                     slot_runes: Dict[int, List[Rune]], current_slot: int,
+                     base_atk: int, base_spd: int, target: str = "B",
+                     max_remaining: Optional[Dict[str, float]] = None,
+                     plan: Optional[ConstraintPlan] = None,
+                     min_remaining: Optional[Dict[str, float]] = None) -> bool:
     """
-    루쉔 최적화
-    target: "A" (격노+칼날) 또는 "B" (맹공+칼날)
-    gem_mode: "none" (현재 미구현)
-    grind_mode: "none" (현재 미구현)
+    제약 조건을 만족할 수 있는지 확인 (pruning)
+    constraints: 최소 조건과 "MAX_" 접두사의 최대 조건 (constraints.ConstraintPlan 참고)
+    state: 슬롯 1~(current_slot-1)까지 선택된 상태
+    max_remaining: 미리 계산된 current_slot부터의 남은 최대 스탯 (없으면 계산)
+    plan: 미리 컴파일한 constraints의 ConstraintPlan (없으면 컴파일)
+    min_remaining: 미리 계산된 current_slot부터의 남은 최소 스탯 (최대 조건이 있을 때만 쓰며 없으면 계산)
     """
-    # 슬롯별 룬 분리
-    slot_runes = {}
-    for slot in range(1, 7):
-        slot_runes[slot] = filter_rune_by_slot(runes, slot, target)
-        if not slot_runes[slot]:
-            return []  # 필수 슬롯에 룬이 없으면 빈 결과
-    
-    # DP: 슬롯별로 상태 전파
-    # dp[slot][state] = best_state (같은 상태에서 최선의 스탯만 유지)
-    dp = [{} for _ in range(7)]  # dp[0]은 초기 상태, dp[1~6]은 슬롯 1~6
-    
-    # 초기 상태
-    initial_state = DPState()
-    dp[0][initial_state] = initial_state
-    
-    # 슬롯별로 DP 진행
-    for slot in range(1, 7):
-        current_dp = {}
-        
-        for prev_state in dp[slot - 1].values():
-            for rune in slot_runes[slot]:
-                new_state = prev_state.add_rune(rune)
-                
-                # 상태 키 생성 (세트 개수와 무형 여부만으로)
-                state_key = (new_state.count_rage_fatal, new_state.count_blade, 
-                           new_state.has_intangible, new_state.rune_ids)
-                
-                # 동일 상태에서 더 나은 스탯만 유지
-                if state_key not in current_dp:
-                    current_dp[state_key] = new_state
-                else:
-                    existing = current_dp[state_key]
-                    # 잠재적 스코어 비교 (간단한 휴리스틱)
-                    existing_potential = existing.atk_pct * (1.0 + existing.cd / 100.0)
-                    new_potential = new_state.atk_pct * (1.0 + new_state.cd / 100.0)
-                    
-                    if new_potential > existing_potential:
-                        current_dp[state_key] = new_state
-        
-        dp[slot] = current_dp
-    
-    # 최종 상태에서 최적 조합 찾기
-    results = []
-    rune_dict = {r.rune_id: r for r in runes}
-    
-    for final_state in dp[6].values():
-        # 룬 조합 구성
-        rune_combo = [rune_dict[rid] for rid in final_state.rune_ids if rid in rune_dict]
-        
-        if len(rune_combo) != 6:
-            continue
-        
-        # 무형 배치 최적화
-        assignment, score, stats = find_best_intangible_assignment(rune_combo, target, base_atk)
-        
-        if score > 0:
-            results.append({
-                "runes": rune_combo,
-                "score": score,
-                "stats": stats,
-                "intangible_assignment": assignment,
-            })
-    
-    # 스코어 기준 정렬
-    results.sort(key=lambda x: x["score"], reverse=True)
-    
-    # 상위 N개만 반환
-    top_results = results[:top_n]
+    if not constraints:
+        return True
     
-    # 결과 포맷팅
+    # 남은 슬롯에서 얻을 수 있는 최대 스탯
+    if max_remaining is None:
+        max_remaining = calculate_max_remaining_stats(slot_runes, current_slot)
+    if plan is None:
+        plan = ConstraintPlan(constraints, base_spd)
+    
+    bound = optimistic_stats(state, max_remaining, current_slot, base_atk, base_spd, target)
+    floor = None
+    if plan.needs_floor:
+        # 최대 조건: 남은 슬롯을 최소 스탯으로 채운 하한으로 판정
+        if min_remaining is None:
+            min_remaining = calculate_min_remaining_stats(slot_runes, current_slot)
+        floor = floor_vector((state.cr, state.cd, state.atk_pct, state.atk_flat, state.spd),
+                             tuple(min_remaining[key] for key in STAT_KEYS), base_atk, base_spd)
+    return plan.admits(tuple(bound[key] for key in BOUND_KEYS), floor)
+
+
+def _seed_rune_ids(seed) -> List[int]:
+    """시드 빌드의 rune_id 목록 (포맷팅된 결과 딕셔너리 또는 rune_id 시퀀스)"""
+    if isinstance(seed, dict):
+        return [info["rune_id"] for info in seed["slots"].values()]
+    return list(seed)
+
+
+def _validate_mode(mode: str) -> None:
+    """탐색 모드 검증"""
+    if mode not in ("exact", "fast"):
+        raise ValueError(f"알 수 없는 모드: {mode}")
+
+
+def _with_optimality_gap(formatted: List[Dict], collector: TopCollector,
+                         upper_bound: float) -> List[Dict]:
+    """fast 모드 결과에 objective 상한과 그 상한까지의 차이 추가"""
+    for result, raw in zip(formatted, collector.results()):
+        result["upper_bound"] = upper_bound
+        result["optimality_gap"] = upper_bound - collector.value(raw["score"], raw["stats"])
+    return formatted
+
+
+def _format_results(results: List[Dict],
+                    equivalents: Optional[Dict[int, List[int]]] = None) -> List[Dict]:
+    """
+    결과 포맷팅
+    equivalents: 대표 룬 rune_id -> 동등한 룬 rune_id (SlotIndex.equivalent_ids)
+        각 슬롯의 alternatives와 같은 점수의 조합 수(equivalent_builds)로 펼친다
+    """
+    equivalents = equivalents or {}
     formatted_results = []
-    for result in top_results:
+    for result in results:
         rune_combo = result["runes"]
         stats = result["stats"]
         
         # 슬롯별 룬 정보
         slot_info = {}
+        equivalent_builds = 1
         for rune in rune_combo:
+            alternatives = equivalents.get(rune.rune_id, [])
+            equivalent_builds *= 1 + len(alternatives)
             prefix_str = ""
             if rune.has_prefix:
                 prefix_str = f"{rune.prefix_stat_name} {rune.prefix_stat_value}"
@@ -363,7 +364,8 @@ def optimize_lushen(runes: List[Rune], target: str = "B",
                 "main": f"{rune.main_stat_name} {rune.main_stat_value}",
                 "prefix": prefix_str,
                 "subs": [f"{STAT_ID_NAME.get(sub.stat_id, '?')} {sub.value}" 
-                        for sub in rune.subs]
+                        for sub in rune.subs],
+                "alternatives": list(alternatives),
             }
         
         formatted_results.append({
@@ -377,18 +379,69 @@ def optimize_lushen(runes: List[Rune], target: str = "B",
             "spd_total": stats["spd_total"],
             "intangible_assignment": result["intangible_assignment"],
             "slots": slot_info,
+            "equivalent_builds": equivalent_builds,
         })
+        if "pareto_values" in result:
+            formatted_results[-1]["pareto_values"] = result["pareto_values"]
     
     return formatted_results
 
 
+def optimize_lushen(runes: List[Rune], target: str = "B", 
+                    gem_mode: str = "none", grind_mode: str = "none",
+                    top_n: int = 10, base_atk: int = 900,
+                    mode: str = "exact", beam_width: int = 200,
+                    targets: Optional[List[str]] = None) -> Union[List[Dict], Dict[str, List[Dict]]]:
+    """
+    루쉔 최적화
+    target: "A" (격노+칼날) 또는 "B" (맹공+칼날)
+    gem_mode: "none" (현재 미구현)
+    grind_mode: "none" (현재 미구현)
+    mode: "exact" (전체 탐색) 또는 "fast" (빔 서치 + 언덕 오르기 근사, search_builds 참고)
+    beam_width: fast 모드의 슬롯별 빔 폭
+    targets: target 목록 (예: ["A", "B"]). 주어지면 target을 무시하고 한 번의 탐색으로
+        target별 상위 top_n개를 구해 {target: 결과} 딕셔너리로 반환한다
+    """
+    _validate_mode(mode)
+    if targets is not None:
+        queries = [{"target": t, "top_n": top_n, "max_results": None} for t in targets]
+        results = search_builds_many(runes, queries, base_atk=base_atk, mode=mode, beam_width=beam_width)
+        return dict(zip(targets, results))
+    # 슬롯별 룬 분리
+    slot_runes = {}
+    for slot in range(1, 7):
+        slot_runes[slot] = filter_rune_by_slot(runes, slot, target)
+        if not slot_runes[slot]:
+            return []  # 필수 슬롯에 룬이 없으면 빈 결과
+    
+    # 제약 조건 없는 스코어 상위 N개 탐색 (N번째 점수 이하의 서브트리는 잘라냄)
+    # (동등한 룬은 하나의 후보로 합쳐 탐색하고 결과에서 alternatives로 펼침)
+    index = SlotIndex(slot_runes)
+    collector = TopCollector(top_n=top_n, max_results=None)
+    if mode == "fast":
+        upper_bound = BeamSearch(index, target, base_atk, beam_width=beam_width).run(collector)
+        return _with_optimality_gap(_format_results(collector.results(), index.equivalent_ids()),
+                                    collector, upper_bound)
+    SearchEngine(index, target, base_atk).run([collector])
+    
+    # 결과 포맷팅
+    return _format_results(collector.results(), index.equivalent_ids())
+
+
 def search_builds(runes: List[Rune], target: str = "B",
                   base_atk: int = 900, base_spd: int = 104,
                   constraints: Dict[str, float] = None,
                   objective: str = "SCORE",
                   top_n: int = 20,
                   return_policy: str = "top_n",
-                  max_results: int = 2000) -> List[Dict]:
+                  max_results: int = 2000,
+                  pareto_stats: List[str] = None,
+                  engine: str = "dfs",
+                  seeds: List = None,
+                  mode: str = "exact",
+                  beam_width: int = 200,
+                  min_diff: Optional[int] = None,
+                  max_reuse: Optional[int] = None) -> List[Dict]:
     """
     조건 기반 최적 조합 탐색
     
@@ -397,138 +450,331 @@ def search_builds(runes: List[Rune], target: str = "B",
         target: "A" (격노+칼날) 또는 "B" (맹공+칼날)
         base_atk: 기본 공격력
         base_spd: 기본 속도
-        constraints: 최소 조건 딕셔너리 (예: {"SPD": 100, "CR": 100, "ATK_TOTAL": 2000})
+        constraints: 조건 딕셔너리 (예: {"SPD": 100, "CR": 100, "ATK_TOTAL": 2000})
+            "MAX_" 접두사는 최대 조건 (예: {"MAX_SPD": 130, "MAX_CR": 105})
         objective: 정렬 기준 ("SCORE", "ATK_TOTAL", "ATK_BONUS", "CD" 등)
+            "PARETO"이면 pareto_stats에 대한 비지배 집합 전체를 반환 (top_n 미적용)
         top_n: 상위 N개 반환
         return_policy: "top_n" 또는 "all_at_best"
-        max_results: 최대 결과 수 제한
+        max_results: 최대 결과 수 제한 (상위 후보로 채택된 결과 수 기준)
+        pareto_stats: PARETO 모드에서 비교할 스탯 2~3개 (기본값 ["SPD", "SCORE"])
+        engine: 탐색 엔진
+            "dfs": 슬롯 1~6 DFS (기본값, 모든 옵션 지원)
+            "mitm": 슬롯 1~3 × 4~6 반쪽 빌드 결합 (제약 조건 없는 SCORE top_n 전용)
+            "milp": 정수 계획법 + no-good cut 반복 (PuLP 필요, PARETO 미지원)
+        seeds: 워밍 스타트용 시드 빌드 (이전 search_builds 결과 또는 rune_id 6개 시퀀스, dfs 엔진 전용)
+            현재 조건으로 다시 채점해 먼저 채워 넣으므로 비슷한 재탐색의 가지치기가 빨라진다
+            (결과는 시드 없이 탐색한 것과 같은 점수이며, 동점 빌드의 선택만 달라질 수 있음)
+        mode: "exact" (기본값, 전체 탐색) 또는 "fast" (빔 서치 + 룬 교체 언덕 오르기 근사)
+            fast 모드 결과에는 objective 최적값의 상한(upper_bound)과
+            그 상한까지의 차이(optimality_gap)가 포함된다 (PARETO 미지원)
+        beam_width: fast 모드의 슬롯별 빔 폭
+        min_diff: 주어지면 objective 내림차순으로 앞선 모든 결과와 min_diff개(1~6) 이상의
+            슬롯에서 룬이 다른 빌드만 반환 (dfs 엔진 exact 모드의 top_n 전용, collectors.DiverseCollector)
+        max_reuse: 주어지면 한 룬이 최대 max_reuse개의 결과에만 쓰이도록 선택 (min_diff와 같은 조건)
     
     Returns:
-        조건을 만족하는 조합 리스트
+        조건을 만족하는 조합 리스트 (PARETO 모드에서는 각 결과에 pareto_values 포함)
+        스탯과 세트 역할이 같은 룬은 한 조합으로 묶이고, 슬롯별 alternatives에 나머지 rune_id가 담긴다
+    """
+    _validate_mode(mode)
+    if engine != "dfs" and (min_diff is not None or max_reuse is not None):
+        raise ValueError("다양성 조건(min_diff / max_reuse)은 dfs 엔진만 지원합니다")
+    if engine == "mitm":
+        if mode != "exact":
+            raise ValueError("mitm 엔진은 exact 모드만 지원합니다")
+        if constraints or objective != "SCORE" or return_policy != "top_n":
+            raise ValueError("mitm 엔진은 제약 조건 없는 SCORE top_n 탐색만 지원합니다")
+        from .mitm import search_top_builds_mitm
+        
+        slot_runes = {}
+        for slot in range(1, 7):
+            slot_runes[slot] = filter_rune_by_slot(runes, slot, target)
+            if not slot_runes[slot]:
+                return []
+        index = SlotIndex(slot_runes)
+        limit = top_n if max_results is None else min(top_n, max_results)
+        results = search_top_builds_mitm(index.runes, target, base_atk, limit)
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return _format_results(results, index.equivalent_ids())
+    elif engine == "milp":
+        if mode != "exact":
+            raise ValueError("milp 엔진은 exact 모드만 지원합니다")
+        if objective == "PARETO":
+            raise ValueError("milp 엔진은 PARETO objective를 지원하지 않습니다")
+        from .milp import MilpSolver
+        
+        slot_runes = {}
+        for slot in range(1, 7):
+            slot_runes[slot] = filter_rune_by_slot(runes, slot, target)
+            if not slot_runes[slot]:
+                return []
+        index = SlotIndex(slot_runes)
+        collector = TopCollector(constraints=constraints, objective=objective, top_n=top_n,
+                                 return_policy=return_policy, max_results=max_results, base_spd=base_spd)
+        MilpSolver(index, target, base_atk, base_spd).run(collector)
+        return _format_results(collector.results(), index.equivalent_ids())
+    elif engine != "dfs":
+        raise ValueError(f"알 수 없는 엔진: {engine}")
+    
+    query = {
+        "constraints": constraints,
+        "objective": objective,
+        "top_n": top_n,
+        "return_policy": return_policy,
+        "max_results": max_results,
+        "pareto_stats": pareto_stats,
+        "min_diff": min_diff,
+        "max_reuse": max_reuse,
+    }
+    return search_builds_many(runes, [query], target=target, base_atk=base_atk, base_spd=base_spd,
+                              seeds=seeds, mode=mode, beam_width=beam_width)[0]
+
+
+def search_builds_many(runes: List[Rune], queries: List[Dict],
+                       target: str = "B", base_atk: int = 900,
+                       base_spd: int = 104, seeds: List = None,
+                       mode: str = "exact", beam_width: int = 200) -> List[List[Dict]]:
     """
-    if constraints is None:
-        constraints = {}
+    여러 조건 세트를 한 번의 탐색으로 처리
     
-    # 슬롯별 룬 분리
+    슬롯 필터링과 남은 최대 스탯(suffix bound)은 한 번만 계산하고,
+    DFS 한 번으로 각 부분 빌드가 아직 만족 가능한 쿼리만 추적한다.
+    
+    Args:
+        runes: 룬 리스트
+        queries: 쿼리 리스트. 각 쿼리는 search_builds의 인자
+            (constraints, objective, top_n, return_policy, max_results, pareto_stats, min_diff, max_reuse)를
+            담은 딕셔너리. base_atk / base_spd를 넣으면 그 쿼리만 해당 기본 스탯으로 평가한다
+            (누적 스탯은 공유하고 상한 / 스코어만 기본 스탯마다 계산)
+            target을 넣으면 그 쿼리만 해당 세트 조건으로 평가한다
+            (슬롯 필터링과 탐색은 공유하고 세트 조건 / 스코어만 target마다 확인)
+        target: "A" (격노+칼날) 또는 "B" (맹공+칼날)
+        base_atk: 기본 공격력
+        base_spd: 기본 속도
+        seeds: 모든 쿼리에 공유하는 시드 빌드 (search_builds 참고)
+        mode: "exact" 또는 "fast" (fast는 쿼리마다 빔 서치를 따로 수행)
+        beam_width: fast 모드의 슬롯별 빔 폭
+    
+    Returns:
+        쿼리 순서대로 search_builds와 같은 형식의 결과 리스트
+    """
+    # 쿼리별 수집기 (PARETO 스탯 등은 여기서 검증)
+    _validate_mode(mode)
+    bases = [(query.get("base_atk", base_atk), query.get("base_spd", base_spd)) for query in queries]
+    targets = [query.get("target", target) for query in queries]
+    collectors = [make_collector(query, spd) for query, (_, spd) in zip(queries, bases)]
+    if mode == "fast" and not all(isinstance(c, TopCollector) for c in collectors):
+        raise ValueError("fast 모드는 PARETO objective를 지원하지 않습니다")
+    if mode == "fast" and any(isinstance(c, DiverseCollector) for c in collectors):
+        raise ValueError("fast 모드는 다양성 조건(min_diff / max_reuse)을 지원하지 않습니다")
+    
+    # 슬롯별 룬 분리 (모든 쿼리 공유)
     slot_runes = {}
     for slot in range(1, 7):
         slot_runes[slot] = filter_rune_by_slot(runes, slot, target)
         if not slot_runes[slot]:
-            return []
+            return [[] for _ in queries]
+    
+    # CR 내림차순 슬롯 인덱스와 suffix 상한을 공유하는 DFS 한 번으로 모든 쿼리 처리
+    # (동등한 룬은 하나의 후보로 합쳐 탐색하고 결과에서 alternatives로 펼침)
+    index = SlotIndex(slot_runes)
+    search = SearchEngine(index, target, base_atk, base_spd)
+    if seeds:
+        search.seed(collectors, [_seed_rune_ids(seed) for seed in seeds], bases, targets)
+    equivalents = index.equivalent_ids()
+    
+    if mode == "fast":
+        # 쿼리마다 빔 서치 + 언덕 오르기 (objective 상한과의 차이를 함께 반환)
+        upper_bounds = [
+            BeamSearch(index, query_target, atk, spd, beam_width=beam_width).run(collector)
+            for collector, query_target, (atk, spd) in zip(collectors, targets, bases)
+        ]
+        return [
+            _with_optimality_gap(_format_results(collector.results(), equivalents), collector, upper_bound)
+            for collector, upper_bound in zip(collectors, upper_bounds)
+        ]
+    
+    search.run(collectors, bases=bases, targets=targets)
+    # 다양성 조건 쿼리: 가지치기 근거가 최종 선택과 어긋난 서브트리만 다시 탐색
+    for i, collector in enumerate(collectors):
+        if not isinstance(collector, DiverseCollector):
+            continue
+        prefixes = collector.next_pass()
+        while prefixes:
+            for prefix in prefixes:
+                positions = [index.locate(rune_id)[1] for rune_id in prefix]
+                search.run([collector], prefix=positions, bases=[bases[i]], targets=[targets[i]])
+            prefixes = collector.next_pass()
+    
+    # 쿼리별 결과 포맷팅
+    return [_format_results(collector.results(), equivalents) for collector in collectors]
+
+
+def search_builds_parametric(runes: List[Rune], base_atks: List[int],
+                             base_spds: Optional[List[int]] = None,
+                             target: str = "B", seeds: List = None,
+                             mode: str = "exact", beam_width: int = 200,
+                             **query) -> List[List[Dict]]:
+    """
+    같은 쿼리를 여러 기본 스탯(base_atk / base_spd)으로 한 번의 탐색에서 평가
     
-    # DFS로 모든 조합 탐색 (pruning 적용)
-    results = []
-    rune_dict = {r.rune_id: r for r in runes}
+    공격력 보너스 round(base_atk * atk_pct / 100 + atk_flat)는 base_atk에 대해 선형이므로
+    룬 스탯 누적과 탐색 순서는 모든 기본 스탯이 공유하고, 상한 벡터와 리프 스코어만
+    기본 스탯마다 계산한다 (search_builds_many 참고).
     
-    def dfs(current_slot: int, state: DPState):
-        """DFS로 조합 탐색"""
-        if len(results) >= max_results:
-            return
-        
-        # Pruning: 제약 조건을 만족할 수 없으면 가지치기
-        if not check_constraints(state, constraints, slot_runes, current_slot, base_atk, base_spd, target):
-            return
-        
-        if current_slot > 6:
-            # 6개 슬롯 모두 선택 완료
-            rune_combo = [rune_dict[rid] for rid in state.rune_ids if rid in rune_dict]
-            if len(rune_combo) != 6:
-                return
-            
-            # 무형 배치 최적화
-            assignment, score, stats = find_best_intangible_assignment(rune_combo, target, base_atk)
-            
-            if score <= 0:
-                return
-            
-            # 제약 조건 최종 확인
-            if "CR" in constraints and stats["cr_total"] < constraints["CR"]:
-                return
-            if "CD" in constraints and stats["cd_total"] < constraints["CD"]:
-                return
-            if "SPD" in constraints and (base_spd + stats["spd_total"]) < constraints["SPD"]:
-                return
-            if "ATK_BONUS" in constraints and stats["atk_bonus"] < constraints["ATK_BONUS"]:
-                return
-            if "ATK_TOTAL" in constraints and stats["atk_total"] < constraints["ATK_TOTAL"]:
-                return
-            if "ATK_PCT" in constraints and stats["atk_pct_total"] < constraints["ATK_PCT"]:
-                return
-            if "ATK_FLAT" in constraints and stats["atk_flat_total"] < constraints["ATK_FLAT"]:
-                return
-            if "MIN_SCORE" in constraints and score < constraints["MIN_SCORE"]:
-                return
-            
-            results.append({
-                "runes": rune_combo,
-                "score": score,
-                "stats": stats,
-                "intangible_assignment": assignment,
-            })
-            return
-        
-        # 현재 슬롯의 룬들을 시도
-        for rune in slot_runes[current_slot]:
-            new_state = state.add_rune(rune)
-            dfs(current_slot + 1, new_state)
+    Args:
+        runes: 룬 리스트
+        base_atks: 기본 공격력 목록
+        base_spds: base_atks와 같은 길이의 기본 속도 목록 (None이면 모두 104)
+        target / seeds / mode / beam_width: search_builds 참고
+        query: search_builds의 나머지 인자
+            (constraints, objective, top_n, return_policy, max_results, pareto_stats)
     
-    # DFS 시작
-    initial_state = DPState()
-    dfs(1, initial_state)
+    Returns:
+        base_atks 순서대로 search_builds(base_atk=..., base_spd=...)와 같은 형식의 결과 리스트
+    """
+    if base_spds is None:
+        base_spds = [104] * len(base_atks)
+    if len(base_spds) != len(base_atks):
+        raise ValueError(f"base_spds 길이({len(base_spds)})가 base_atks 길이({len(base_atks)})와 다릅니다")
+    queries = [dict(query, base_atk=atk, base_spd=spd) for atk, spd in zip(base_atks, base_spds)]
+    return search_builds_many(runes, queries, target=target, seeds=seeds,
+                              mode=mode, beam_width=beam_width)
+
+
+def _candidate_upper_bounds(index: SlotIndex, plan: ConstraintPlan, target: str,
+                            base_atk: int, base_spd: int) -> Dict[int, Tuple[int, float, float]]:
+    """
+    후보 룬마다 MarginalCollector 후보 정보 (대표 rune_id -> (슬롯, 정적 스코어 상한, 부족분))
+    정적 상한: 다른 슬롯을 스탯별 최대값으로 채운 상한
+        (치확 100, 최소 조건, 세트 조건을 만족할 수 없으면 -inf)
+    부족분: 슬롯 최대값 대신 이 룬을 넣을 때 줄어드는 치피*10 + 공격력 선형 합 - 반올림 여유 1
+    """
+    slot_max = {
+        slot: tuple(max(values) for values in zip(*index.vectors[slot]))
+        for slot in range(1, 7)
+    }
+    candidates = {}
+    for slot in range(1, 7):
+        others = [slot_max[other] for other in range(1, 7) if other != slot]
+        remaining_max = tuple(sum(values) for values in zip(*others))
+        for rune, vector, counts in zip(index.runes[slot], index.vectors[slot], index.set_counts[slot]):
+            bound = bound_vector(vector, counts, 1, remaining_max, base_atk, base_spd)
+            feasible = (bound[0] >= 100.0 and plan.admits(bound)
+                        and set_signature_feasible(counts, 5, target))
+            deficit = (linear_score_key(slot_max[slot], base_atk) - linear_score_key(vector, base_atk)) - 1.0
+            candidates[rune.rune_id] = (slot, bound[-1] if feasible else float("-inf"), deficit)
+    return candidates
+
+
+def rank_rune_values(runes: List[Rune], target: str = "B",
+                     base_atk: int = 900, base_spd: int = 104,
+                     constraints: Dict[str, float] = None,
+                     top_n: int = 20, window: Optional[float] = None) -> List[Dict]:
+    """
+    룬별 가치 순위 (팔아도 되는 룬 찾기)
     
-    # 정렬
-    if objective == "SCORE":
-        results.sort(key=lambda x: x["score"], reverse=True)
-    elif objective == "ATK_TOTAL":
-        results.sort(key=lambda x: x["stats"]["atk_total"], reverse=True)
-    elif objective == "ATK_BONUS":
-        results.sort(key=lambda x: x["stats"]["atk_bonus"], reverse=True)
-    elif objective == "CD":
-        results.sort(key=lambda x: x["stats"]["cd_total"], reverse=True)
-    else:
-        results.sort(key=lambda x: x["score"], reverse=True)
+    룬 하나를 뺄 때마다 다시 탐색하지 않고, 한 번의 탐색에서 후보 룬마다 그 룬을
+    포함한 최고 스코어(best_with)를 기록한다 (collectors.MarginalCollector).
+    빌드는 슬롯마다 룬 하나이므로 룬을 뺀 최고 스코어는 같은 슬롯의 다른 후보(동등한
+    룬 포함) best_with 중 최대값이다. 같은 탐색에서 상위 top_n 빌드도 함께 수집한다.
     
-    # 반환 정책 적용
-    if return_policy == "all_at_best" and results:
-        best_value = results[0]["score"] if objective == "SCORE" else results[0]["stats"].get(objective.lower(), 0)
-        filtered = [r for r in results if (r["score"] if objective == "SCORE" else r["stats"].get(objective.lower(), 0)) == best_value]
-        results = filtered[:top_n]
-    else:
-        results = results[:top_n]
+    Args:
+        runes: 룬 리스트
+        target: "A" (격노+칼날) 또는 "B" (맹공+칼날)
+        base_atk: 기본 공격력
+        base_spd: 기본 속도
+        constraints: search_builds와 같은 조건 딕셔너리
+        top_n: in_top_n 판정에 쓰는 상위 빌드 수
+        window: 최고 스코어 - window 미만의 빌드는 탐색하지 않음 (None이면 전체)
+            그 아래의 best_with / best_without은 None으로 반환된다
     
-    # 결과 포맷팅
-    formatted_results = []
-    for result in results:
-        rune_combo = result["runes"]
-        stats = result["stats"]
+    Returns:
+        입력 룬마다 {"rune_id", "slot", "set_id", "best_with", "best_without", "marginal", "in_top_n"}
+        best_with: 그 룬을 포함한 최고 스코어 (유효한 빌드가 없거나 슬롯 조건에서 빠지면 0)
+        best_without: 그 룬 없이 얻을 수 있는 최고 스코어
+        marginal: 최고 스코어 - best_without (그 룬을 팔면 잃는 스코어, window 밖이면 None)
+        marginal 내림차순 (None은 맨 앞), 같으면 best_with 내림차순
+    """
+    slot_runes = {slot: filter_rune_by_slot(runes, slot, target) for slot in range(1, 7)}
+    missing = 0.0 if window is None else None
+    best = 0.0
+    best_with: Dict[int, float] = {}
+    best_without: Dict[int, float] = {}
+    in_top: Set[int] = set()
+    
+    if all(slot_runes.values()):
+        index = SlotIndex(slot_runes)
+        plan = ConstraintPlan(constraints, base_spd)
+        marginal = MarginalCollector(_candidate_upper_bounds(index, plan, target, base_atk, base_spd),
+                                     constraints=constraints, window=window, base_spd=base_spd)
+        top = TopCollector(constraints=constraints, top_n=top_n, max_results=None, base_spd=base_spd)
+        SearchEngine(index, target, base_atk, base_spd).run([marginal, top])
         
-        # 슬롯별 룬 정보
-        slot_info = {}
-        for rune in rune_combo:
-            prefix_str = ""
-            if rune.has_prefix:
-                prefix_str = f"{rune.prefix_stat_name} {rune.prefix_stat_value}"
-            
-            slot_info[rune.slot] = {
-                "rune_id": rune.rune_id,
-                "set_name": rune.set_name,
-                "main": f"{rune.main_stat_name} {rune.main_stat_value}",
-                "prefix": prefix_str,
-                "subs": [f"{STAT_ID_NAME.get(sub.stat_id, '?')} {sub.value}" 
-                        for sub in rune.subs]
-            }
+        recorded = marginal.results()
+        best = max(marginal.best, 0.0)
+        equivalents = index.equivalent_ids()
+        for result in top.results():
+            for rune in result["runes"]:
+                in_top.add(rune.rune_id)
+                in_top.update(equivalents.get(rune.rune_id, []))
         
-        formatted_results.append({
-            "score": result["score"],
-            "cr_total": stats["cr_total"],
-            "cd_total": stats["cd_total"],
-            "atk_pct_total": stats["atk_pct_total"],
-            "atk_flat_total": stats["atk_flat_total"],
-            "atk_bonus": stats["atk_bonus"],
-            "atk_total": stats["atk_total"],
-            "spd_total": stats["spd_total"],
-            "intangible_assignment": result["intangible_assignment"],
-            "slots": slot_info,
+        for slot in range(1, 7):
+            values = [recorded[rune.rune_id] for rune in index.runes[slot]]
+            for k, (rune, alternatives) in enumerate(zip(index.runes[slot], index.alternatives[slot])):
+                # 동등한 룬이 남아 있으면 자기 자신의 best_with도 그대로 얻을 수 있음
+                others = values[:k] + values[k + 1:] + ([values[k]] * len(alternatives) if alternatives else [])
+                without = max(others, default=float("-inf"))
+                for rune_id in [rune.rune_id] + [alt.rune_id for alt in alternatives]:
+                    best_with[rune_id] = values[k]
+                    best_without[rune_id] = without
+    
+    ranking = []
+    for rune in runes:
+        with_value = best_with.get(rune.rune_id, 0.0)
+        without_value = best_without.get(rune.rune_id, best)
+        with_value = missing if with_value == float("-inf") else with_value
+        without_value = missing if without_value == float("-inf") else without_value
+        ranking.append({
+            "rune_id": rune.rune_id,
+            "slot": rune.slot,
+            "set_id": rune.set_id,
+            "best_with": with_value,
+            "best_without": without_value,
+            "marginal": None if without_value is None else best - without_value,
+            "in_top_n": rune.rune_id in in_top,
         })
-    
-    return formatted_results
+    ranking.sort(key=lambda x: (float("inf") if x["marginal"] is None else x["marginal"],
+                                x["best_with"] or 0.0), reverse=True)
+    return ranking
+
+
+def _slot_candidate_indices(inventory: CompactRunes) -> List[int]:
+    """압축 인벤토리에서 filter_rune_by_slot을 통과하는 룬 인덱스 (Rune 객체를 만들기 전에 거름)"""
+    indices = []
+    for i in range(len(inventory)):
+        slot = inventory.slot[i]
+        main_stat_id = inventory.main_stat_id[i]
+        if slot in (2, 6) and main_stat_id != 4:
+            continue
+        if slot == 4 and main_stat_id != 10:
+            continue
+        if slot == 3 and (inventory.has_sub_stat(i, 4) or inventory.has_sub_stat(i, 3)):
+            continue
+        indices.append(i)
+    return indices
+
+
+def search_builds_shared(name: str, **options) -> List[Dict]:
+    """
+    공유 메모리 인벤토리(CompactRunes.export_shared)에 붙어 search_builds 실행
+    프로세스 풀 작업자에 List[Rune] 대신 블록 이름만 넘기기 위한 진입점이다
+    (룬은 작업자 안에서 버퍼로부터 바로 만들고, options는 search_builds 인자).
+    """
+    inventory = CompactRunes.attach_shared(name)
+    try:
+        runes = inventory.to_runes(_slot_candidate_indices(inventory))
+    finally:
+        inventory.close()
+    return search_builds(runes, **options)
@@ -0,0 +1,126 @@
+"""탐색 순서 (유망한 후보 룬부터 시도하는 move ordering)"""
+
+from typing import List, Dict, Tuple, Sequence
+from .scoring import linear_score_key
+from .index import SlotIndex
+from .constraints import BOUND_INDEX, bound_vector, floor_vector
+
+# 필요 세트 마스크 비트 (부분 빌드가 아직 채워야 하는 세트 역할)
+NEED_RAGE_FATAL = 1  # Rage/Fatal 4개 미만
+NEED_FATAL = 2  # B 타겟인데 Fatal 없음
+NEED_BLADE = 4  # Blade 2개 미만
+
+# 슬롯 후보를 이 수만큼의 구간으로 나눠 구간 끝까지의 순서만 캐시 (구간 밖 후보는 탐색에서 건너뜀)
+ORDER_BUCKETS = 16
+
+
+def contribution(i: int, vector: Tuple[float, ...], base_atk: int) -> float:
+    """룬 스탯 벡터가 BOUND_KEYS[i] 값에 더하는 선형 기여"""
+    if i == BOUND_INDEX["CR"]:
+        return vector[0]
+    if i == BOUND_INDEX["CD"]:
+        return vector[1]
+    if i == BOUND_INDEX["SPD"]:
+        return vector[4]
+    if i == BOUND_INDEX["ATK_PCT"]:
+        return vector[2]
+    if i == BOUND_INDEX["ATK_FLAT"]:
+        return vector[3]
+    if i == BOUND_INDEX["SCORE"]:
+        return linear_score_key(vector, base_atk)
+    return base_atk * vector[2] / 100.0 + vector[3]  # ATK_BONUS / ATK_TOTAL
+
+
+def need_mask(rage: int, fatal: int, blade: int, target: str = "B") -> int:
+    """부분 빌드 세트 시그니처의 필요 세트 마스크"""
+    mask = 0
+    if rage + fatal < 4:
+        mask |= NEED_RAGE_FATAL
+    if target == "B" and fatal == 0:
+        mask |= NEED_FATAL
+    if blade < 2:
+        mask |= NEED_BLADE
+    return mask
+
+
+def fills_need(counts: Tuple[int, int, int, int], mask: int) -> bool:
+    """세트 개수 counts의 룬이 마스크의 필요 세트 역할 중 하나를 채우는지 (무형은 어느 쪽이든)"""
+    rage, fatal, blade, intangible = counts
+    if intangible:
+        return mask != 0
+    return bool((blade and mask & NEED_BLADE)
+                or (fatal and mask & (NEED_RAGE_FATAL | NEED_FATAL))
+                or (rage and mask & NEED_RAGE_FATAL))
+
+
+class MoveOrder:
+    """
+    DFS 자식 후보 순서
+
+    - 정적 키: 후보 스탯 벡터의 objective 기여(수집기 objective, 알 수 없으면 SCORE)를 루트
+      하한~상한 범위로 나눈 값. 최소/최대 조건마다 빡빡한 정도(범위 중 조건이 요구하는 비율,
+      0~1)를 가중치로 조건 스탯 기여를 더하거나 뺀다. 수집기가 여럿이면 키를 합친다.
+    - 동적 순서: 부분 빌드의 세트 시그니처에서 아직 필요한 세트 역할(need_mask)을 채우는
+      후보를 먼저 시도한다 (같은 쪽 안에서는 정적 키 내림차순).
+    SlotIndex는 CR 내림차순이라 치확 100에 도달 가능한 후보는 앞쪽 count개이다. count를
+    ORDER_BUCKETS 구간 끝으로 올림한 (슬롯, 구간, 마스크)별 순서를 처음 쓸 때 한 번 정렬해
+    캐시하고, 탐색은 순서 중 위치가 count 이상인 후보를 건너뛴다. 순서는 후보 위치
+    (index.runes[slot]의 k) 목록이므로 prefix / resume 경로는 순서와 무관하다.
+    enabled=False이면 인덱스 순서(CR 내림차순) 그대로다.
+    """
+
+    def __init__(self, index: SlotIndex, collectors: Sequence = (), target: str = "B",
+                 base_atk: int = 900, base_spd: int = 104, enabled: bool = True):
+        self.index = index
+        self.target = target
+        self.enabled = enabled
+        # 슬롯 -> 마스크 -> 구간 끝 count -> 순서 (DFS 노드마다 키 튜플을 만들지 않도록 중첩)
+        self._cache: List[List[Dict[int, List[int]]]] = [[{} for _ in range(8)] for _ in range(8)]
+        self._bucket = {slot: max(1, -(-len(index.runes[slot]) // ORDER_BUCKETS)) for slot in range(1, 7)}
+        self.keys: Dict[int, List[float]] = {}
+        if not enabled:
+            return
+
+        # 루트의 상한/하한 벡터로 BOUND_KEYS별 범위
+        zero = (0.0,) * 5
+        upper = bound_vector(zero, (0, 0, 0, 0), 0, index.suffix_max[1], base_atk, base_spd)
+        lower = floor_vector(zero, index.suffix_min[1], base_atk, base_spd)
+        span = [max(hi - lo, 1e-9) for hi, lo in zip(upper, lower)]
+
+        weights: Dict[int, float] = {}
+        for collector in collectors or [None]:
+            i = getattr(collector, "objective_index", BOUND_INDEX["SCORE"])
+            weights[i] = weights.get(i, 0.0) + 1.0 / span[i]
+            plan = getattr(collector, "plan", None)
+            lower_checks = [(BOUND_INDEX["CR"], 100.0)] + (plan.lower if plan is not None else [])
+            for i, minimum in lower_checks:
+                tightness = min(max((minimum - lower[i]) / span[i], 0.0), 1.0)
+                weights[i] = weights.get(i, 0.0) + tightness / span[i]
+            for i, maximum in (plan.upper if plan is not None else ()):
+                tightness = min(max((upper[i] - maximum) / span[i], 0.0), 1.0)
+                weights[i] = weights.get(i, 0.0) - tightness / span[i]
+
+        for slot in range(1, 7):
+            self.keys[slot] = [
+                sum(weight * contribution(i, vector, base_atk) for i, weight in weights.items())
+                for vector in index.vectors[slot]
+            ]
+
+    def children(self, slot: int, count: int, mask: int) -> List[int]:
+        """
+        슬롯 slot의 앞쪽 count개 후보를 시도할 순서 (후보 위치 목록)
+        구간 끝까지의 위치가 들어 있으므로 count 이상인 위치는 호출한 쪽이 건너뛴다.
+        """
+        size = self._bucket[slot]
+        count = min(-(-count // size) * size, len(self.index.runes[slot]))
+        cache = self._cache[slot][mask if self.enabled else 0]
+        order = cache.get(count)
+        if order is None:
+            if self.enabled:
+                keys = self.keys[slot]
+                set_counts = self.index.set_counts[slot]
+                order = sorted(range(count), key=lambda k: (not fills_need(set_counts[k], mask), -keys[k], k))
+            else:
+                order = list(range(count))
+            cache[count] = order
+        return order
@@ -0,0 +1,217 @@
+"""커서 기반 페이지 탐색 (직렬화 가능한 탐색 위치로 중단 / 재개)"""
+
+import hashlib
+import json
+from dataclasses import asdict
+from typing import List, Dict, Optional, Tuple
+from .types import Rune
+from .index import SlotIndex
+from .collectors import PageCollector
+from .engine import SearchEngine
+from .optimizer import filter_rune_by_slot, _format_results
+
+CURSOR_VERSION = 2
+MAX_FRONTIER = 4000  # 페이지 사이에 남기는 프런티어 항목 수 상한 (넘으면 상한이 낮은 항목부터 버림)
+
+
+def inventory_fingerprint(runes: List[Rune]) -> str:
+    """룬 목록 지문 (커서를 만든 인벤토리와 같은지 확인)"""
+    data = json.dumps([asdict(rune) for rune in runes], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class SearchCursor:
+    """
+    search_builds 결과를 objective 내림차순 페이지로 나눠 가져오는 커서
+
+    - 페이지: 이전 페이지 마지막 값 이하의 빌드 중 아직 돌려주지 않은 상위 page_size개.
+      페이지를 모두 이으면 search_builds(top_n=전체)와 같은 순서의 결과가 된다
+      (동점이면 DFS에서 먼저 찾은 빌드가 앞).
+    - 프런티어: 페이지 탐색이 임계값으로 잘라낸 서브트리와 돌려주지 않은 완성 빌드를
+      (objective 상한, 부분 빌드 rune_id) 목록으로 DFS 순서대로 남긴다 (PageCollector의 log).
+      다음 페이지는 루트부터 다시 탐색하지 않고 상한이 임계값보다 큰 항목의 서브트리만
+      DFS 순서로 탐색하고, 나머지 항목은 그대로 다음 프런티어에 넘긴다. 항목이 MAX_FRONTIER개를
+      넘으면 상한이 낮은 항목을 버리고 버린 상한의 최대값(spill)을 남긴다. 페이지 마지막 값이
+      spill 이하가 되면 버린 빌드가 그 페이지에 들 수 있으므로 그 페이지만 루트부터 다시 탐색한다
+      (ceiling / returned 조건만으로도 결과는 같다).
+    - 체크포인트: next_page(node_limit=...)가 노드 한도에 걸리면 None을 반환하고,
+      탐색 중인 항목의 DFS 위치(SearchEngine.position)와 남은 프런티어, 지금까지의 페이지
+      후보(임계값)를 커서에 남긴다. to_dict()로 저장한 뒤 from_dict()로 복원해 다시 호출하면
+      끝난 서브트리는 건너뛰고 이어서 탐색한다.
+
+    PARETO objective와 return_policy "all_at_best"는 지원하지 않는다.
+    """
+
+    def __init__(self, runes: List[Rune], target: str = "B",
+                 base_atk: int = 900, base_spd: int = 104,
+                 constraints: Dict[str, float] = None,
+                 objective: str = "SCORE", page_size: int = 20):
+        if objective == "PARETO":
+            raise ValueError("커서 탐색은 PARETO objective를 지원하지 않습니다")
+        if page_size < 1:
+            raise ValueError(f"page_size는 1 이상이어야 합니다: {page_size}")
+        self.query = {
+            "target": target,
+            "base_atk": base_atk,
+            "base_spd": base_spd,
+            "constraints": constraints,
+            "objective": objective,
+            "page_size": page_size,
+        }
+        slot_runes = {slot: filter_rune_by_slot(runes, slot, target) for slot in range(1, 7)}
+        self.fingerprint = inventory_fingerprint([rune for slot in range(1, 7) for rune in slot_runes[slot]])
+        self.index = SlotIndex(slot_runes) if all(slot_runes.values()) else None
+
+        self.ceiling: Optional[float] = None  # 이전 페이지 마지막 값
+        self.returned: List[Tuple[int, ...]] = []  # ceiling과 같은 값으로 이미 돌려준 빌드
+        self.exhausted = self.index is None  # 더 돌려줄 결과가 없음
+        # 아직 탐색하지 않은 (objective 상한 - None이면 제한 없음, 부분 빌드 rune_id) 목록, DFS 순서
+        self.frontier: List[Tuple[Optional[float], Tuple[int, ...]]] = [(None, ())]
+        self.spill: Optional[float] = None  # 프런티어에서 버린 항목의 최대 상한 (버린 적 없으면 None)
+        self.explored: List[Tuple[float, Tuple[int, ...]]] = []  # 진행 중인 페이지가 처리한 항목의 다음 프런티어
+        self.position: Optional[List[int]] = None  # 진행 중인 페이지가 탐색 중인 frontier[0]의 DFS 위치
+        self.partial: List[Tuple[float, Tuple[int, ...]]] = []  # 진행 중인 페이지 후보 (값, rune_id)
+        self.nodes = 0  # 누적 방문 노드 수
+
+    def _collector(self) -> PageCollector:
+        return PageCollector(
+            ceiling=self.ceiling,
+            returned=self.returned,
+            constraints=self.query["constraints"],
+            objective=self.query["objective"],
+            top_n=self.query["page_size"],
+            max_results=None,
+            base_spd=self.query["base_spd"],
+        )
+
+    def next_page(self, node_limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        다음 페이지 (search_builds 형식)
+        더 없으면 [], node_limit개 노드를 방문하고도 페이지를 끝내지 못하면 None (다시 호출해 이어서 탐색)
+        """
+        if self.exhausted:
+            return []
+        query = self.query
+        index = self.index
+        engine = SearchEngine(index, query["target"], query["base_atk"], query["base_spd"])
+        collector = self._collector()
+        if self.partial:
+            engine.seed([collector], [rune_ids for _, rune_ids in self.partial])
+        explored = collector.log = list(self.explored)
+        frontier = self.frontier
+        nodes = 0
+        for i, (bound, prefix) in enumerate(frontier):
+            resume = self.position if i == 0 else None
+            if resume is None:
+                if bound is not None and not collector.admits_value(bound):
+                    # 이번 페이지에 들 수 없는 항목은 탐색하지 않고 다음 프런티어로
+                    explored.append((bound, prefix))
+                    continue
+                if node_limit is not None and 0 < node_limit <= nodes:
+                    return self._checkpoint(collector, frontier[i:], None, explored, nodes)
+            engine.run([collector], self._positions(prefix), resume=resume,
+                       node_limit=None if node_limit is None else node_limit - nodes)
+            nodes += engine.nodes
+            if engine.position is not None:
+                return self._checkpoint(collector, frontier[i:], engine.position, explored, nodes)
+        self.nodes += nodes
+
+        results = collector.results()
+        if self.spill is not None and (len(results) < query["page_size"] or
+                                       collector.value(results[-1]["score"], results[-1]["stats"]) <= self.spill):
+            # 버린 항목의 빌드가 이 페이지에 들 수 있음: 루트부터 이 페이지를 다시 탐색
+            self.frontier = [(None, ())]
+            self.explored = []
+            self.position = None
+            self.partial = []
+            self.spill = None
+            if node_limit is None:
+                return self.next_page()
+            return self.next_page(node_limit - nodes) if nodes < node_limit else None
+        keys = [tuple(rune.rune_id for rune in r["runes"]) for r in results]
+        returned = set(keys)
+        frontier = [item for item in explored if item[1] not in returned]
+        if len(frontier) > MAX_FRONTIER:
+            cut = sorted((bound for bound, _ in frontier), reverse=True)[MAX_FRONTIER]
+            frontier = [item for item in frontier if item[0] > cut]
+            self.spill = cut if self.spill is None else max(self.spill, cut)
+        self.frontier = frontier
+        self.explored = []
+        self.position = None
+        self.partial = []
+        if len(results) < query["page_size"]:
+            self.exhausted = True
+            self.frontier = []
+        if results:
+            last = collector.value(results[-1]["score"], results[-1]["stats"])
+            ties = [key for r, key in zip(results, keys) if collector.value(r["score"], r["stats"]) == last]
+            self.returned = self.returned + ties if last == self.ceiling else ties
+            self.ceiling = last
+        return _format_results(results, index.equivalent_ids())
+
+    def _checkpoint(self, collector: PageCollector, frontier: List, position: Optional[List[int]],
+                    explored: List, nodes: int) -> None:
+        """노드 한도에 걸린 페이지 탐색 상태 저장 (frontier[0]부터 position에서 이어서 탐색)"""
+        self.frontier = frontier
+        self.position = position
+        self.explored = explored
+        self.partial = [(collector.value(r["score"], r["stats"]), tuple(rune.rune_id for rune in r["runes"]))
+                        for r in collector.results()]
+        self.nodes += nodes
+        return None
+
+    def _positions(self, rune_ids: Tuple[int, ...]) -> List[int]:
+        """부분 빌드 rune_id -> 슬롯별 후보 인덱스 위치 (커서 저장 형식, rune_id보다 짧다)"""
+        return [self.index.locate(rune_id)[1] for rune_id in rune_ids]
+
+    def _rune_ids(self, positions: List[int]) -> Tuple[int, ...]:
+        """_positions의 역변환"""
+        return tuple(self.index.runes[slot][k].rune_id for slot, k in enumerate(positions, 1))
+
+    def to_dict(self) -> Dict:
+        """JSON으로 저장할 수 있는 커서 상태"""
+        return {
+            "version": CURSOR_VERSION,
+            "fingerprint": self.fingerprint,
+            "query": dict(self.query),
+            "ceiling": self.ceiling,
+            "returned": [list(key) for key in self.returned],
+            "exhausted": self.exhausted,
+            "frontier": [[bound, self._positions(rune_ids)] for bound, rune_ids in self.frontier],
+            "explored": [[bound, self._positions(rune_ids)] for bound, rune_ids in self.explored],
+            "spill": self.spill,
+            "position": self.position,
+            "partial": [[value, list(rune_ids)] for value, rune_ids in self.partial],
+            "nodes": self.nodes,
+        }
+
+    @classmethod
+    def from_dict(cls, runes: List[Rune], state: Dict) -> "SearchCursor":
+        """to_dict로 저장한 커서 복원 (커서를 만든 인벤토리와 룬 목록이 다르면 ValueError)"""
+        if state.get("version") != CURSOR_VERSION:
+            raise ValueError(f"지원하지 않는 커서 버전입니다: {state.get('version')}")
+        cursor = cls(runes, **state["query"])
+        if cursor.fingerprint != state["fingerprint"]:
+            raise ValueError("커서를 만든 인벤토리와 룬 목록이 다릅니다")
+        cursor.ceiling = state["ceiling"]
+        cursor.returned = [tuple(key) for key in state["returned"]]
+        cursor.exhausted = state["exhausted"]
+        cursor.frontier = [(bound, cursor._rune_ids(positions)) for bound, positions in state["frontier"]]
+        cursor.explored = [(bound, cursor._rune_ids(positions)) for bound, positions in state["explored"]]
+        cursor.spill = state["spill"]
+        cursor.position = state["position"]
+        cursor.partial = [(value, tuple(rune_ids)) for value, rune_ids in state["partial"]]
+        cursor.nodes = state["nodes"]
+        return cursor
+
+
+def search_builds_page(runes: List[Rune], cursor: Optional[Dict] = None,
+                       **options) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    한 페이지씩 탐색 (상태 없는 호출용)
+    cursor: 이전 호출이 돌려준 커서 (None이면 첫 페이지, options는 SearchCursor 인자)
+    Returns: (페이지 결과, 다음 커서 - 더 없으면 None)
+    """
+    search = SearchCursor(runes, **options) if cursor is None else SearchCursor.from_dict(runes, cursor)
+    page = search.next_page()
+    return page, None if search.exhausted else search.to_dict()
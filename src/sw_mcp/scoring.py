@@ -188,37 +188,185 @@ def find_best_intangible_assignment(runes: List[Rune], target: str = "B", base_a
         score, stats = score_build(runes, target, "none", base_atk)
         return "none", score, stats
     
-    # 무형 룬이 있으면 배치 옵션 평가 (최대 1개만 허용)
-    best_assignment = "none"
-    best_score = 0.0
-    best_stats = {}
-    
-    # 옵션 1: Rage/Fatal에 붙이기
-    if target == "A":
-        assignment = "to_Rage"
-    else:  # target == "B"
-        assignment = "to_Fatal"
+    # 무형 룬이 있으면 세트 구성으로 유일한 유효 배치를 결정 (최대 1개만 허용)
+    set_counts = tuple(sum(values) for values in zip(*(rune_set_counts(r) for r in runes)))
+    assignment = canonical_assignment(set_counts, target)
+    if assignment is None:
+        return "none", 0.0, {}
     
     score, stats = score_build(runes, target, assignment, base_atk)
-    if score > best_score:
-        best_score = score
-        best_assignment = assignment
-        best_stats = stats
+    if score <= 0:
+        return "none", 0.0, {}
+    return assignment, score, stats
+
+
+
+# 선형화 스코어링
+# 스코어는 룬별 스탯 합에 대해 거의 선형이다: 반올림(atk_bonus)과 치확/세트 조건만 비선형.
+# 탐색 엔진은 룬별 기여 벡터를 더해 선형 키로 순위를 매기고, 리프에서만 정확 보정한다.
+
+# 스탯 벡터 순서: (CR, CD, ATK%, ATK+, SPD)
+STAT_VECTOR_IDS = (9, 10, 4, 3, 8)
+
+
+def rune_stat_vector(rune: Rune) -> Tuple[float, float, float, float, float]:
+    """룬 하나가 더하는 (CR, CD, ATK%, ATK+, SPD) 합계 (메인 + prefix + 서브)"""
+    cr = cd = atk_pct = atk_flat = spd = 0.0
+    entries = [(rune.main_stat_id, rune.main_stat_value)]
+    if rune.has_prefix:
+        entries.append((rune.prefix_stat_id, rune.prefix_stat_value))
+    entries.extend((sub.stat_id, sub.value) for sub in rune.subs)
     
-    # 옵션 2: Blade에 붙이기
-    assignment = "to_Blade"
-    score, stats = score_build(runes, target, assignment, base_atk)
-    if score > best_score:
-        best_score = score
-        best_assignment = assignment
-        best_stats = stats
+    for stat_id, value in entries:
+        if stat_id == 9:  # CR
+            cr += value
+        elif stat_id == 10:  # CD
+            cd += value
+        elif stat_id == 4:  # ATK%
+            atk_pct += value
+        elif stat_id == 3:  # ATK
+            atk_flat += value
+        elif stat_id == 8:  # SPD
+            spd += value
     
-    # 옵션 3: 무형 없이
-    score, stats = score_build(runes, target, "none", base_atk)
-    if score > best_score:
-        best_score = score
-        best_assignment = "none"
-        best_stats = stats
+    return cr, cd, atk_pct, atk_flat, spd
+
+
+def rune_set_counts(rune: Rune) -> Tuple[int, int, int, int]:
+    """룬 하나의 세트 시그니처 (rage, fatal, blade, intangible) 기여"""
+    return (
+        1 if rune.set_id == 5 else 0,
+        1 if rune.set_id == 8 else 0,
+        1 if rune.set_id == 4 else 0,
+        1 if rune.intangible else 0,
+    )
+
+
+def linear_score_key(vector: Tuple[float, ...], base_atk: int = 900) -> float:
+    """
+    스탯 벡터의 선형 스코어 기여 (반올림 전)
+    score = BASE_CD*10 + 200 + 세트 보너스 + Σ key - 반올림 오차 (|오차| <= 0.5)
+    """
+    return vector[1] * 10 + base_atk * vector[2] / 100.0 + vector[3]
+
+
+def intangible_options(target: str, intangible_count: int) -> List[str]:
+    """find_best_intangible_assignment와 같은 순서의 무형 배치 후보"""
+    if intangible_count == 0:
+        return ["none"]
+    return ["to_Rage" if target == "A" else "to_Fatal", "to_Blade", "none"]
+
+
+def set_bonus(set_counts: Tuple[int, int, int, int], target: str,
+              intangible_assignment: str) -> Optional[Tuple[float, float, float]]:
+    """
+    세트 시그니처와 무형 배치가 target 세트 조건을 만족하면 (CR, CD, ATK%) 보너스 반환
+    만족하지 못하면 None (score_build가 0을 반환하는 경우)
+    """
+    rage, fatal, blade, intangible = set_counts
+    if intangible > 1:
+        return None
+    
+    rage_or_fatal = rage + fatal
+    blade_count = blade
+    if intangible_assignment in ("to_Rage", "to_Fatal"):
+        rage_or_fatal += intangible
+    elif intangible_assignment == "to_Blade":
+        blade_count += intangible
     
-    return best_assignment, best_score, best_stats
+    if rage_or_fatal < 4 or blade_count < 2:
+        return None
+    
+    has_rage = rage > 0 or (intangible > 0 and intangible_assignment == "to_Rage")
+    has_fatal = fatal > 0 or (intangible > 0 and intangible_assignment == "to_Fatal")
+    if target == "B" and not has_fatal:
+        return None
+    
+    # Rage와 Fatal이 모두 있으면 Rage 우선 (calculate_stats와 동일)
+    if has_rage:
+        return float(BLADE_2SET_CR), float(RAGE_4SET_CD), 0.0
+    if has_fatal:
+        return float(BLADE_2SET_CR), 0.0, float(FATAL_4SET_ATK_PCT)
+    return float(BLADE_2SET_CR), 0.0, 0.0
+
 
+def canonical_assignment(set_counts: Tuple[int, int, int, int], target: str = "B") -> Optional[str]:
+    """
+    세트 시그니처로 유효한 무형 배치를 구조적으로 결정 (없으면 None)
+    무형 1개짜리 6룬 빌드에서 세트 조건을 만족하는 배치는 많아야 하나이므로
+    intangible_options를 모두 평가하지 않고 같은 순서로 첫 번째 유효 배치를 고른다.
+    """
+    rage, fatal, blade, intangible = set_counts
+    if intangible > 1:
+        return None
+    rage_or_fatal = rage + fatal
+    # Fatal 룬 없이도 target B를 만족하려면 무형을 Fatal에 붙여야 함
+    fatal_ok = target != "B" or fatal > 0
+    
+    if intangible:
+        if rage_or_fatal + 1 >= 4 and blade >= 2:
+            return "to_Rage" if target == "A" else "to_Fatal"
+        if rage_or_fatal >= 4 and blade + 1 >= 2 and fatal_ok:
+            return "to_Blade"
+    if rage_or_fatal >= 4 and blade >= 2 and fatal_ok:
+        return "none"
+    return None
+
+
+def set_signature_feasible(set_counts: Tuple[int, int, int, int], remaining: int,
+                           target: str = "B") -> bool:
+    """
+    남은 슬롯 remaining개를 채워 세트 조건을 만족할 수 있는지 (부분 빌드 pruning)
+    남은 슬롯은 어떤 세트든 될 수 있고, 이미 고른 무형은 부족한 쪽 하나를 채운다.
+    remaining == 0이면 canonical_assignment(set_counts, target) is not None과 같다.
+    """
+    rage, fatal, blade, intangible = set_counts
+    if intangible > 1:
+        return False
+    need_rage_fatal = 4 - rage - fatal
+    if target == "B" and fatal == 0 and need_rage_fatal < 1:
+        # Fatal 하나가 더 필요 (남은 슬롯 또는 무형 to_Fatal)
+        need_rage_fatal = 1
+    need_blade = 2 - blade
+    return max(need_rage_fatal, 0) + max(need_blade, 0) <= remaining + intangible
+
+
+def score_from_totals(totals: Tuple[float, float, float, float, float],
+                      set_counts: Tuple[int, int, int, int],
+                      target: str = "B", base_atk: int = 900) -> Tuple[str, float, dict]:
+    """
+    룬 6개의 스탯 벡터 합과 세트 시그니처로 정확한 스코어 계산 (리프 보정 단계)
+    find_best_intangible_assignment(runes, target, base_atk)와 같은 결과를 반환한다.
+    totals: rune_stat_vector 합계 (기본 스탯/세트 보너스 제외)
+    
+    Returns: (best_assignment, best_score, best_stats) - 조건 불만족이면 ("none", 0.0, {})
+    """
+    cr, cd, atk_pct, atk_flat, spd = totals
+    
+    # 유효한 무형 배치는 세트 구성에 따라 최대 하나뿐이므로 구조적으로 결정
+    assignment = canonical_assignment(set_counts, target)
+    if assignment is None:
+        return "none", 0.0, {}
+    bonus = set_bonus(set_counts, target, assignment)
+    
+    cr_total = BASE_CR + cr + bonus[0]
+    # 치확 조건 확인 (BASE_CR 15 + Blade 12 + 룬 치확 >= 100)
+    if cr_total < 100.0:
+        return "none", 0.0, {}
+    
+    cd_total = BASE_CD + cd + bonus[1]
+    atk_pct_total = atk_pct + bonus[2]
+    atk_bonus = round(base_atk * (atk_pct_total / 100.0) + atk_flat)
+    score = (cd_total * 10) + atk_bonus + 200
+    
+    return assignment, score, {
+        "cr_total": cr_total,
+        "cd_total": cd_total,
+        "atk_pct_total": atk_pct_total,
+        "atk_flat_total": atk_flat,
+        "atk_bonus": atk_bonus,
+        "atk_total": base_atk + atk_bonus,
+        "spd_total": spd,
+        "score": score,
+        "intangible_assignment": assignment,
+    }
@@ -0,0 +1,114 @@
+"""탐색 상태 (깊이별 누적기, struct-of-arrays 프런티어)"""
+
+from array import array
+from typing import List, Tuple
+from .types import Rune
+
+
+class DepthAccumulator:
+    """
+    DFS용 깊이별 누적 스탯 배열
+
+    깊이 d의 값은 슬롯 1~d까지 선택한 룬의 합이다. 배열은 미리 할당되어 있고
+    SearchEngine이 자식으로 내려갈 때 d+1 칸을 d 칸 + 룬 벡터로 덮어쓰므로,
+    백트래킹은 깊이만 줄이면 되고 내부 루프에서 상태 객체를 만들지 않는다.
+    picks[d]: 슬롯 d+1에 고른 룬
+    """
+
+    __slots__ = ("cr_at", "cd_at", "atk_pct_at", "atk_flat_at", "spd_at",
+                 "rage_at", "fatal_at", "blade_at", "intangible_at", "picks")
+
+    def __init__(self, max_depth: int = 6):
+        self.cr_at = [0.0] * (max_depth + 1)
+        self.cd_at = [0.0] * (max_depth + 1)
+        self.atk_pct_at = [0.0] * (max_depth + 1)
+        self.atk_flat_at = [0.0] * (max_depth + 1)
+        self.spd_at = [0.0] * (max_depth + 1)
+        self.rage_at = [0] * (max_depth + 1)
+        self.fatal_at = [0] * (max_depth + 1)
+        self.blade_at = [0] * (max_depth + 1)
+        self.intangible_at = [0] * (max_depth + 1)
+        self.picks: List[Rune] = [None] * max_depth
+
+
+class Frontier:
+    """
+    슬롯별 DP 프런티어 (struct-of-arrays)
+
+    상태 i는 열별 배열의 i번째 값이며, parent/choice로 이전 프런티어의 상태와
+    이번 슬롯에서 고른 후보 인덱스를 가리킨다.
+    """
+
+    __slots__ = ("cr", "cd", "atk_pct", "atk_flat", "spd",
+                 "rage", "fatal", "blade", "intangible", "parent", "choice")
+
+    def __init__(self):
+        self.cr = array("d")
+        self.cd = array("d")
+        self.atk_pct = array("d")
+        self.atk_flat = array("d")
+        self.spd = array("d")
+        self.rage = array("b")
+        self.fatal = array("b")
+        self.blade = array("b")
+        self.intangible = array("b")
+        self.parent = array("l")
+        self.choice = array("l")
+
+    @classmethod
+    def root(cls) -> "Frontier":
+        """빈 빌드 하나로 시작하는 프런티어"""
+        frontier = cls()
+        frontier.append(-1, -1, (0.0, 0.0, 0.0, 0.0, 0.0), (0, 0, 0, 0))
+        return frontier
+
+    def __len__(self) -> int:
+        return len(self.cr)
+
+    def append(self, parent: int, choice: int,
+               vector: Tuple[float, ...], set_counts: Tuple[int, int, int, int],
+               previous: "Frontier" = None):
+        """
+        상태 추가: previous의 parent 상태에 (vector, set_counts)를 더한 값
+        previous가 없으면 vector/set_counts를 그대로 저장
+        """
+        if previous is None:
+            self.cr.append(vector[0])
+            self.cd.append(vector[1])
+            self.atk_pct.append(vector[2])
+            self.atk_flat.append(vector[3])
+            self.spd.append(vector[4])
+            self.rage.append(set_counts[0])
+            self.fatal.append(set_counts[1])
+            self.blade.append(set_counts[2])
+            self.intangible.append(set_counts[3])
+        else:
+            self.cr.append(previous.cr[parent] + vector[0])
+            self.cd.append(previous.cd[parent] + vector[1])
+            self.atk_pct.append(previous.atk_pct[parent] + vector[2])
+            self.atk_flat.append(previous.atk_flat[parent] + vector[3])
+            self.spd.append(previous.spd[parent] + vector[4])
+            self.rage.append(previous.rage[parent] + set_counts[0])
+            self.fatal.append(previous.fatal[parent] + set_counts[1])
+            self.blade.append(previous.blade[parent] + set_counts[2])
+            self.intangible.append(previous.intangible[parent] + set_counts[3])
+        self.parent.append(parent)
+        self.choice.append(choice)
+
+    def totals(self, i: int) -> Tuple[float, float, float, float, float]:
+        """상태 i의 (CR, CD, ATK%, ATK+, SPD) 합"""
+        return self.cr[i], self.cd[i], self.atk_pct[i], self.atk_flat[i], self.spd[i]
+
+    def set_counts(self, i: int) -> Tuple[int, int, int, int]:
+        """상태 i의 (rage, fatal, blade, intangible) 개수"""
+        return self.rage[i], self.fatal[i], self.blade[i], self.intangible[i]
+
+
+def trace_choices(frontiers: List[Frontier], i: int) -> List[int]:
+    """마지막 프런티어의 상태 i까지 슬롯별로 고른 후보 인덱스 (슬롯 1부터)"""
+    choices = []
+    for frontier in reversed(frontiers[1:]):
+        choices.append(frontier.choice[i])
+        i = frontier.parent[i]
+    choices.reverse()
+    return choices
@@ -1,76 +1,204 @@
 """SWEX JSON 파서"""
 
 import json
-from typing import List, Dict, Any, Optional
+import warnings
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
 from .types import Rune, SubStat, SET_ID_NAME, STAT_ID_NAME
+from .compact import CompactRunes, MAX_SUBS
 
 
-def parse_rune(raw: Dict[str, Any]) -> Optional[Rune]:
-    """SWEX JSON에서 룬 파싱"""
+class ParseErrors:
+    """
+    파싱 오류 집계 (오류 종류별 개수 + 앞쪽 일부 예시)
+    잘못된 룬이 많은 export에서도 출력 없이 호출자에게 요약을 돌려준다.
+    """
+
+    def __init__(self, max_examples: int = 5):
+        self.max_examples = max_examples
+        self.counts: Counter = Counter()
+        self.examples: List[Dict[str, Any]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.counts)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, kind: str, raw: Any, detail: str = "") -> None:
+        """오류 하나 기록 (예시는 max_examples개까지만 보관)"""
+        self.counts[kind] += 1
+        if len(self.examples) < self.max_examples:
+            rune_id = raw.get("rune_id") if isinstance(raw, dict) else None
+            self.examples.append({"kind": kind, "rune_id": rune_id, "detail": detail})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"total": self.total, "counts": dict(self.counts), "examples": list(self.examples)}
+
+
+# 압축 열(int16)에 들어가는 정수 필드 범위
+INT16_MIN, INT16_MAX = -(1 << 15), (1 << 15) - 1
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+class RuneFormatError(ValueError):
+    """raw 룬이 공통 유효성 규칙에 어긋남 (kind는 ParseErrors 오류 종류)"""
+
+    def __init__(self, kind: str, detail: str):
+        super().__init__(detail)
+        self.kind = kind
+
+
+def _error_kind(e: Exception) -> str:
+    """예외 -> 오류 종류 (KeyError는 빠진 필드 이름 포함)"""
+    if isinstance(e, RuneFormatError):
+        return e.kind
+    if isinstance(e, KeyError):
+        return f"missing:{e.args[0]}"
+    return type(e).__name__
+
+
+# _decode_rune이 잘못된 룬에 던지는 예외
+DECODE_ERRORS = (KeyError, TypeError, IndexError, ValueError, OverflowError)
+
+
+def _int16(value: int, name: str) -> int:
+    if not INT16_MIN <= value <= INT16_MAX:
+        raise OverflowError(f"{name}={value}")
+    return value
+
+
+def _number(value: float) -> float:
+    if not isinstance(value, (int, float)):
+        raise TypeError(f"숫자가 아닌 값: {value!r}")
+    return value
+
+
+def _decode_rune(raw: Dict[str, Any]) -> tuple:
+    """
+    raw 룬 하나를 검증하고 필드로 분해 (parse_rune / parse_swex_compact 공통 유효성 규칙)
+    - rune_id(정수) / slot_no(1~6) / set_id / pri_eff([stat_id, value])는 필수
+    - 정수 필드는 압축 열 범위 안, 스탯 값은 숫자, 서브 스탯은 MAX_SUBS개 이하
+    - prefix_eff가 [stat_id, value]가 아니면 접두 스탯 없음, sec_eff 중 값이 2개 미만인 항목은 무시
+    Returns: (rune_id, slot, set_id, level, quality, main_stat_id, main_stat_value,
+              prefix_stat_id, prefix_stat_value, [(stat_id, 최종 값, enchanted, grind)])
+    잘못된 룬이면 DECODE_ERRORS 중 하나를 던진다.
+    """
+    rune_id = raw["rune_id"]
+    if not isinstance(rune_id, int) or not INT64_MIN <= rune_id <= INT64_MAX:
+        raise RuneFormatError("invalid_rune_id", f"rune_id={rune_id!r}")
+    slot = raw["slot_no"]
+    if not isinstance(slot, int) or not 1 <= slot <= 6:
+        raise RuneFormatError("invalid_slot", f"slot_no={slot}")
+    set_id = _int16(raw["set_id"], "set_id")
+    pri_eff = raw["pri_eff"]
+    main_stat_id = _int16(pri_eff[0], "pri_eff")
+    main_stat_value = _number(pri_eff[1])
+    level = _int16(raw.get("class", 0), "class")
+    quality = _int16(raw.get("rank", 0), "rank")
+
+    # prefix_eff: [stat_id, value] 또는 0
+    prefix_eff = raw.get("prefix_eff", 0)
+    if prefix_eff and isinstance(prefix_eff, list) and len(prefix_eff) >= 2:
+        prefix_stat_id, prefix_stat_value = _int16(prefix_eff[0], "prefix_eff"), _number(prefix_eff[1])
+    else:
+        prefix_stat_id, prefix_stat_value = 0, 0.0
+
+    # sec_eff: [stat_id, base, enchanted, grind] (최종 값 = base + grind)
+    subs = []
+    for sec_eff in raw.get("sec_eff", ()):
+        n = len(sec_eff)
+        if n >= 2:
+            grind = _number(sec_eff[3]) if n > 3 else 0.0
+            subs.append((_int16(sec_eff[0], "sec_eff"), _number(sec_eff[1]) + grind,
+                         sec_eff[2] if n > 2 else False, grind))
+    if len(subs) > MAX_SUBS:
+        raise RuneFormatError("too_many_subs", f"{len(subs)} > {MAX_SUBS}")
+    return (rune_id, slot, set_id, level, quality, main_stat_id, main_stat_value,
+            prefix_stat_id, prefix_stat_value, subs)
+
+
+def parse_rune(raw: Dict[str, Any], errors: Optional[ParseErrors] = None) -> Optional[Rune]:
+    """SWEX JSON에서 룬 파싱 (유효성 규칙은 _decode_rune, 실패하면 errors에 기록하고 None)"""
     try:
-        rune_id = raw.get("rune_id")
-        slot = raw.get("slot_no")
-        set_id = raw.get("set_id")
-        main_stat_id = raw.get("pri_eff", [0])[0]
-        main_stat_value = raw.get("pri_eff", [0, 0])[1]
-        level = raw.get("class", 0)
-        quality = raw.get("rank", 0)
-        
-        # prefix_eff 파싱 ([stat_id, value] 또는 0)
-        prefix_eff = raw.get("prefix_eff", 0)
-        prefix_stat_id = 0
-        prefix_stat_value = 0.0
-        if prefix_eff and prefix_eff != 0 and isinstance(prefix_eff, list) and len(prefix_eff) >= 2:
-            prefix_stat_id = prefix_eff[0]
-            prefix_stat_value = prefix_eff[1]
-        
-        # 서브 스탯 파싱
-        subs: List[SubStat] = []
-        sec_eff_list = raw.get("sec_eff", [])
-        
-        for sec_eff in sec_eff_list:
-            if len(sec_eff) >= 2:
-                stat_id = sec_eff[0]
-                base = sec_eff[1]
-                enchanted = sec_eff[2] if len(sec_eff) > 2 else False
-                grind = sec_eff[3] if len(sec_eff) > 3 else 0.0
-                
-                # 최종 값 = base + grind
-                final_value = base + grind
-                
-                subs.append(SubStat(
-                    stat_id=stat_id,
-                    value=final_value,
-                    enchanted=enchanted,
-                    grind=grind
-                ))
-        
-        return Rune(
-            rune_id=rune_id,
-            slot=slot,
-            set_id=set_id,
-            main_stat_id=main_stat_id,
-            main_stat_value=main_stat_value,
-            subs=subs,
-            level=level,
-            quality=quality,
-            prefix_stat_id=prefix_stat_id,
-            prefix_stat_value=prefix_stat_value
-        )
-    except (KeyError, TypeError, IndexError) as e:
-        print(f"룬 파싱 오류: {e}, raw={raw}")
+        (rune_id, slot, set_id, level, quality, main_stat_id, main_stat_value,
+         prefix_stat_id, prefix_stat_value, subs) = _decode_rune(raw)
+    except DECODE_ERRORS as e:
+        if errors is not None:
+            errors.add(_error_kind(e), raw, str(e))
         return None
+    
+    return Rune(
+        rune_id=rune_id,
+        slot=slot,
+        set_id=set_id,
+        main_stat_id=main_stat_id,
+        main_stat_value=main_stat_value,
+        subs=[SubStat(stat_id=stat_id, value=value, enchanted=enchanted, grind=grind)
+              for stat_id, value, enchanted, grind in subs],
+        level=level,
+        quality=quality,
+        prefix_stat_id=prefix_stat_id,
+        prefix_stat_value=prefix_stat_value
+    )
+
+
+def _iter_raw_runes(json_data: Dict[str, Any]):
+    """rune_list, 그 다음 unit_list(없으면 units)에 장착된 룬 순서로 raw 룬 나열"""
+    yield from json_data.get("runes", [])
+    unit_list = json_data.get("unit_list", [])
+    if not unit_list:
+        unit_list = json_data.get("units", [])
+    for unit in unit_list:
+        yield from unit.get("runes", [])
 
 
-def parse_swex_json(json_data: Dict[str, Any]) -> List[Rune]:
-    """SWEX JSON 전체 파싱 (rune_list + unit_list 병합)"""
+def parse_swex_compact(json_data: Dict[str, Any],
+                       max_examples: int = 5) -> Tuple[CompactRunes, ParseErrors]:
+    """
+    SWEX JSON을 CompactRunes로 바로 디코딩하는 대량 파싱 경로
+    pri_eff / prefix_eff / sec_eff 배열 레이아웃을 직접 읽고 SubStat/Rune 객체를 만들지 않는다.
+    병합 규칙과 유효성 규칙(_decode_rune)은 parse_swex_json과 같다
+    (rune_list + unit_list, rune_id 기준 중복 제거).
+    잘못된 룬은 건너뛰고 ParseErrors에 모은다.
+    """
+    compact = CompactRunes()
+    errors = ParseErrors(max_examples)
+    seen_rune_ids = set()
+    append = compact.append
+
+    for raw in _iter_raw_runes(json_data):
+        try:
+            rune_id = raw["rune_id"]
+            if rune_id in seen_rune_ids:
+                continue
+            (rune_id, slot, set_id, level, quality, main_stat_id, main_stat_value,
+             prefix_stat_id, prefix_stat_value, subs) = _decode_rune(raw)
+            append(rune_id, slot, set_id, level, quality, main_stat_id, main_stat_value,
+                   prefix_stat_id, prefix_stat_value,
+                   [(stat_id, value, 1 if enchanted else 0, grind) for stat_id, value, enchanted, grind in subs])
+        except DECODE_ERRORS as e:
+            errors.add(_error_kind(e), raw, str(e))
+            continue
+        seen_rune_ids.add(rune_id)
+
+    return compact, errors
+
+
+def parse_swex_json(json_data: Dict[str, Any], errors: Optional[ParseErrors] = None) -> List[Rune]:
+    """
+    SWEX JSON 전체 파싱 (rune_list + unit_list 병합)
+    실패한 룬은 건너뛰고 errors에 기록한다. errors가 없으면 건너뛴 룬 요약을 경고 하나로 알린다.
+    """
     runes: List[Rune] = []
     seen_rune_ids = set()
+    collected = errors if errors is not None else ParseErrors()
     
     # 1. rune_list에서 룬 파싱
     rune_list = json_data.get("runes", [])
     for raw_rune in rune_list:
-        rune = parse_rune(raw_rune)
+        rune = parse_rune(raw_rune, collected)
         if rune and rune.rune_id not in seen_rune_ids:
             runes.append(rune)
             seen_rune_ids.add(rune.rune_id)
@@ -83,17 +211,26 @@ def parse_swex_json(json_data: Dict[str, Any]) -> List[Rune]:
     for unit in unit_list:
         unit_runes = unit.get("runes", [])
         for raw_rune in unit_runes:
-            rune = parse_rune(raw_rune)
+            rune = parse_rune(raw_rune, collected)
             if rune and rune.rune_id not in seen_rune_ids:
                 runes.append(rune)
                 seen_rune_ids.add(rune.rune_id)
     
+    if errors is None and collected:
+        warnings.warn(f"잘못된 룬 {collected.total}개를 건너뛰었습니다: {dict(collected.counts)}", stacklevel=2)
     return runes
 
 
-def load_swex_json(file_path: str) -> List[Rune]:
-    """SWEX JSON 파일 로드"""
+def load_swex_json(file_path: str, errors: Optional[ParseErrors] = None) -> List[Rune]:
+    """SWEX JSON 파일 로드 (실패한 룬은 errors에 기록, parse_swex_json 참고)"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return parse_swex_json(data, errors)
+
+
+def load_swex_compact(file_path: str, max_examples: int = 5) -> Tuple[CompactRunes, ParseErrors]:
+    """SWEX JSON 파일을 CompactRunes로 로드"""
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
-    return parse_swex_json(data)
+    return parse_swex_compact(data, max_examples)
 
@@ -0,0 +1,203 @@
+"""룬 강화 몬테카를로 시뮬레이션 (선택 의존성: NumPy)"""
+
+from typing import List, Dict, Optional
+from .types import Rune, BASE_CR, BASE_CD
+from .scoring import (rune_stat_vector, rune_set_counts, canonical_assignment, set_bonus,
+                      STAT_VECTOR_IDS)
+from .index import SlotIndex
+from .collectors import TopCollector
+from .engine import SearchEngine
+from .optimizer import filter_rune_by_slot
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성
+    np = None
+
+# 6성 룬 서브 스탯 1회 상승폭 (stat_id -> (최소, 최대))
+SUB_ROLL_RANGES = {
+    1: (135, 375), 2: (5, 8), 3: (10, 20), 4: (5, 8), 5: (10, 20), 6: (5, 8),
+    8: (4, 6), 9: (4, 6), 10: (4, 7), 11: (4, 8), 12: (4, 8),
+}
+# 6성 +15 메인 스탯 값
+MAIN_STAT_MAX = {1: 2448, 2: 63, 3: 160, 4: 63, 5: 160, 6: 63, 8: 42, 9: 58, 10: 80, 11: 64, 12: 64}
+# 서브 스탯이 추가되거나 상승하는 강화 레벨
+UPGRADE_LEVELS = (3, 6, 9, 12)
+MAX_LEVEL = 15
+MAX_SUBS = 4
+
+
+def numpy_available() -> bool:
+    """NumPy를 사용할 수 있는지"""
+    return np is not None
+
+
+class UpgradeSimulator:
+    """
+    미완성 룬(+15 미만)을 강화했을 때 최고 빌드 스코어가 얼마나 오르는지 추정
+
+    - 현재 인벤토리의 상위 빌드 top_builds개를 한 번 탐색해 기준으로 삼는다.
+    - 후보 룬 × trials개 시행을 한 배치로 묶어 남은 강화 단계(+3/+6/+9/+12)의
+      서브 스탯 추가/상승을 NumPy로 한꺼번에 굴리고, 메인 스탯은 +15 값으로 올린다.
+    - 시행마다 기준 빌드의 같은 슬롯을 강화된 룬으로 바꾼 스코어를 벡터 연산으로
+      다시 계산한다 (score_from_totals와 같은 식, 세트 보너스는 빌드마다 한 번 결정).
+      기준 빌드 밖의 새 조합은 보지 않으므로 기대 상승폭의 하한에 가깝다.
+
+    Rune.level을 강화 레벨(+0~+15)로 보고, 현재 서브 스탯 수에서 시작한다.
+    """
+
+    def __init__(self, runes: List[Rune], target: str = "B", base_atk: int = 900,
+                 top_builds: int = 10, seed: Optional[int] = None):
+        if np is None:
+            raise ImportError("강화 시뮬레이션에는 NumPy가 필요합니다 (pip install .[simulation])")
+        self.runes = runes
+        self.target = target
+        self.base_atk = base_atk
+        self.rng = np.random.default_rng(seed)
+
+        # 기준 빌드 (슬롯 순서 룬, 스탯 벡터 합, 세트 시그니처 합)
+        self.builds: List[Dict] = []
+        self.best_score = 0.0
+        slot_runes = {slot: filter_rune_by_slot(runes, slot, target) for slot in range(1, 7)}
+        if all(slot_runes.values()):
+            collector = TopCollector(top_n=top_builds)
+            SearchEngine(SlotIndex(slot_runes), target, base_atk).run([collector])
+            for result in collector.results():
+                vectors = [rune_stat_vector(rune) for rune in result["runes"]]
+                counts = [rune_set_counts(rune) for rune in result["runes"]]
+                self.builds.append({
+                    "vectors": vectors,
+                    "counts": counts,
+                    "totals": np.sum(vectors, axis=0),
+                    "set_counts": tuple(sum(c) for c in zip(*counts)),
+                })
+                self.best_score = max(self.best_score, result["score"])
+
+    def candidates(self) -> List[Rune]:
+        """강화 여지가 있고 강화 후에도 슬롯 조건을 만족할 수 있는 룬"""
+        return [
+            rune for rune in self.runes
+            if rune.level < MAX_LEVEL and filter_rune_by_slot([rune], rune.slot, self.target)
+        ]
+
+    def _roll(self, runes: List[Rune], trials: int):
+        """
+        룬별 trials개 시행을 한 배치로 시뮬레이션
+        Returns: (강화 후 스탯 벡터 (R*T, 5), 슬롯 조건 유지 여부 (R*T,))
+        """
+        pool = np.array(sorted(SUB_ROLL_RANGES))
+        low = np.zeros(pool.max() + 1, dtype=np.int64)
+        high = np.zeros(pool.max() + 1, dtype=np.int64)
+        dim = np.full(pool.max() + 1, -1, dtype=np.int64)
+        for stat_id, (lo, hi) in SUB_ROLL_RANGES.items():
+            low[stat_id], high[stat_id] = lo, hi
+        for k, stat_id in enumerate(STAT_VECTOR_IDS):
+            dim[stat_id] = k
+
+        vectors, sub_ids, blocked_ids, events, slot3 = [], [], [], [], []
+        for rune in runes:
+            vector = list(rune_stat_vector(rune))
+            if rune.main_stat_id in STAT_VECTOR_IDS and rune.main_stat_id in MAIN_STAT_MAX:
+                vector[STAT_VECTOR_IDS.index(rune.main_stat_id)] += (
+                    MAIN_STAT_MAX[rune.main_stat_id] - rune.main_stat_value)
+            vectors.append(vector)
+            ids = [sub.stat_id for sub in rune.subs[:MAX_SUBS]]
+            sub_ids.append(ids + [0] * (MAX_SUBS - len(ids)))
+            blocked_ids.append((rune.main_stat_id, rune.prefix_stat_id))
+            events.append(sum(1 for level in UPGRADE_LEVELS if level > rune.level))
+            slot3.append(rune.slot == 3)
+
+        n = len(runes) * trials
+        rows = np.arange(n)
+        vec = np.repeat(np.array(vectors, dtype=float), trials, axis=0)
+        subs = np.repeat(np.array(sub_ids, dtype=np.int64), trials, axis=0)
+        count = (subs > 0).sum(axis=1)
+        blocked_ids = np.repeat(np.array(blocked_ids, dtype=np.int64), trials, axis=0)
+        events = np.repeat(np.array(events), trials)
+        eligible = np.ones(n, dtype=bool)
+        slot3 = np.repeat(np.array(slot3), trials)
+
+        for step in range(len(UPGRADE_LEVELS)):
+            active = events > step
+            if not active.any():
+                break
+            adding = active & (count < MAX_SUBS)
+            # 새 서브 스탯: 메인/prefix/기존 서브를 제외한 후보 중 균등 선택
+            blocked = ((subs[:, :, None] == pool[None, None, :]).any(axis=1)
+                       | (blocked_ids[:, :1] == pool[None, :])
+                       | (blocked_ids[:, 1:] == pool[None, :]))
+            keys = self.rng.random((n, len(pool)))
+            keys[blocked] = -1.0
+            new_stat = pool[keys.argmax(axis=1)]
+            # 기존 서브 상승: 서브 4개 중 하나를 균등 선택
+            upgraded = subs[rows, self.rng.integers(0, MAX_SUBS, n)]
+            stat = np.where(adding, new_stat, upgraded)
+
+            subs[rows[adding], count[adding]] = new_stat[adding]
+            count = count + adding
+            # 슬롯3은 ATK%/ATK+ 서브가 붙으면 후보에서 빠짐
+            eligible &= ~(slot3 & adding & ((new_stat == 3) | (new_stat == 4)))
+
+            roll = low[stat] + (self.rng.random(n) * (high[stat] - low[stat] + 1)).astype(np.int64)
+            apply = active & (dim[stat] >= 0)
+            vec[rows[apply], dim[stat[apply]]] += roll[apply]
+
+        return vec, eligible
+
+    def _rescore(self, rune: Rune, vec, eligible):
+        """강화된 룬의 시행별 벡터로 기준 빌드를 바꿔 끼운 최고 스코어 (T,)"""
+        slot = rune.slot
+        counts = rune_set_counts(rune)
+        best = np.zeros(len(vec))
+        for build in self.builds:
+            set_counts = tuple(a - b + c for a, b, c in
+                               zip(build["set_counts"], build["counts"][slot - 1], counts))
+            assignment = canonical_assignment(set_counts, self.target)
+            if assignment is None:
+                continue
+            bonus = set_bonus(set_counts, self.target, assignment)
+            totals = (build["totals"] - np.array(build["vectors"][slot - 1]))[None, :] + vec
+            cr_total = BASE_CR + totals[:, 0] + bonus[0]
+            cd_total = BASE_CD + totals[:, 1] + bonus[1]
+            atk_pct_total = totals[:, 2] + bonus[2]
+            atk_bonus = np.round(self.base_atk * (atk_pct_total / 100.0) + totals[:, 3])
+            score = np.where(eligible & (cr_total >= 100.0), cd_total * 10 + atk_bonus + 200, 0.0)
+            np.maximum(best, score, out=best)
+        return best
+
+    def simulate(self, trials: int = 1000, runes: Optional[List[Rune]] = None) -> List[Dict]:
+        """
+        후보 룬마다 강화 후 최고 스코어 상승폭 분포를 추정
+        Returns: 기대 상승폭 내림차순
+            [{"rune_id", "slot", "set_id", "level", "expected_gain", "improve_prob", "p90_gain", "max_gain"}]
+        """
+        if trials <= 0:
+            raise ValueError(f"trials는 1 이상이어야 합니다: {trials}")
+        runes = self.candidates() if runes is None else runes
+        if not runes:
+            return []
+        vec, eligible = self._roll(runes, trials)
+
+        ranking = []
+        for i, rune in enumerate(runes):
+            part = slice(i * trials, (i + 1) * trials)
+            gain = np.maximum(self._rescore(rune, vec[part], eligible[part]) - self.best_score, 0.0)
+            ranking.append({
+                "rune_id": rune.rune_id,
+                "slot": rune.slot,
+                "set_id": rune.set_id,
+                "level": rune.level,
+                "expected_gain": float(gain.mean()),
+                "improve_prob": float((gain > 0).mean()),
+                "p90_gain": float(np.percentile(gain, 90)),
+                "max_gain": float(gain.max()),
+            })
+        ranking.sort(key=lambda x: (x["expected_gain"], x["improve_prob"]), reverse=True)
+        return ranking
+
+
+def rank_upgrade_candidates(runes: List[Rune], target: str = "B", base_atk: int = 900,
+                            trials: int = 1000, top_builds: int = 10,
+                            seed: Optional[int] = None) -> List[Dict]:
+    """미완성 룬을 강화 시 기대 최고 스코어 상승폭 순으로 정렬 (UpgradeSimulator 참고)"""
+    return UpgradeSimulator(runes, target, base_atk, top_builds, seed).simulate(trials)
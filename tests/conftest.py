@@ -0,0 +1,24 @@
+"""테스트 공용 fixture"""
+
+import pytest
+from src.sw_mcp.types import Rune
+
+
+def _make_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None, level=15):
+    """테스트용 룬 생성"""
+    return Rune(
+        rune_id=rune_id,
+        slot=slot,
+        set_id=set_id,
+        main_stat_id=main_stat_id,
+        main_stat_value=main_value,
+        subs=subs if subs is not None else [],
+        level=level,
+        quality=5
+    )
+
+
+@pytest.fixture
+def make_rune():
+    """테스트용 룬 생성 함수 make_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None, level=15)"""
+    return _make_rune
@@ -0,0 +1,60 @@
+"""근사 탐색 (mode="fast") 테스트"""
+
+import pytest
+from src.sw_mcp.optimizer import search_builds, optimize_lushen
+from src.sw_mcp.harness import random_inventory
+
+
+@pytest.mark.parametrize("target", ["A", "B"])
+def test_fast_mode_upper_bound(target):
+    """fast 모드 결과가 유효하고, 상한이 정확한 최적값 이상인지 테스트"""
+    runes = random_inventory(2, 4)
+    exact = optimize_lushen(runes, target=target, top_n=5)
+    fast = optimize_lushen(runes, target=target, top_n=5, mode="fast", beam_width=8)
+    
+    assert exact and fast
+    assert fast[0]["score"] <= exact[0]["score"] <= fast[0]["upper_bound"]
+    assert fast[0]["optimality_gap"] == fast[0]["upper_bound"] - fast[0]["score"]
+    builds = [tuple(r["slots"][slot]["rune_id"] for slot in range(1, 7)) for r in fast]
+    assert len(set(builds)) == len(builds)
+
+
+@pytest.mark.parametrize("objective", ["SPD", "CR", "ATK_PCT", "ATK_FLAT"])
+def test_fast_mode_unlisted_objective_upper_bound(objective):
+    """SCORE로 정렬되는 objective도 fast 모드 상한이 정확한 최적값 이상인지 테스트"""
+    runes = random_inventory(2, 6)
+    exact = search_builds(runes, target="A", top_n=5)
+    expected = search_builds(runes, target="A", top_n=5, mode="fast", beam_width=3)
+    
+    fast = search_builds(runes, target="A", objective=objective, top_n=5, mode="fast", beam_width=3)
+    
+    assert fast
+    assert fast[0]["score"] <= exact[0]["score"] <= fast[0]["upper_bound"]
+    assert [r["score"] for r in fast] == [r["score"] for r in expected]
+    assert fast[0]["upper_bound"] == expected[0]["upper_bound"]
+
+
+def test_fast_mode_with_constraints():
+    """fast 모드도 제약 조건을 지키고, 넓은 빔에서는 정확한 최적값을 찾는지 테스트"""
+    runes = random_inventory(2, 4)
+    constraints = {"SPD": 104 + 20, "MAX_CR": 120}
+    exact = search_builds(runes, constraints=constraints, objective="ATK_TOTAL", top_n=3)
+    fast = search_builds(runes, constraints=constraints, objective="ATK_TOTAL", top_n=3,
+                         mode="fast", beam_width=10 ** 4)
+    
+    assert exact
+    assert [r["atk_total"] for r in fast] == [r["atk_total"] for r in exact]
+    assert all(104 + r["spd_total"] >= 124 and r["cr_total"] <= 120 for r in fast)
+    # 빔이 아무 상태도 버리지 않으면 상한은 찾은 최고값
+    assert fast[0]["optimality_gap"] == 0
+
+
+def test_fast_mode_rejects_unsupported_options():
+    """fast 모드에서 지원하지 않는 옵션 테스트"""
+    runes = random_inventory(2, 4)
+    with pytest.raises(ValueError):
+        search_builds(runes, objective="PARETO", mode="fast")
+    with pytest.raises(ValueError):
+        search_builds(runes, engine="mitm", mode="fast")
+    with pytest.raises(ValueError):
+        search_builds(runes, mode="greedy")
@@ -0,0 +1,81 @@
+"""압축 룬 인벤토리 (공유 메모리 / mmap) 테스트"""
+
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from src.sw_mcp.types import SubStat
+from src.sw_mcp.compact import CompactRunes
+from src.sw_mcp.harness import random_inventory
+from src.sw_mcp.optimizer import search_builds, search_builds_shared
+
+
+def test_shared_memory_roundtrip():
+    """공유 메모리에 내보낸 인벤토리에 복사 없이 붙어 같은 룬을 복원하는지 테스트"""
+    runes = random_inventory(3, 8)
+    compact = CompactRunes.from_runes(runes)
+    block = compact.export_shared()
+    try:
+        with CompactRunes.attach_shared(block.name) as attached:
+            assert len(attached) == len(runes)
+            assert isinstance(attached.rune_id, memoryview)
+            assert attached.to_runes() == runes
+            assert attached.stat_vector(5) == compact.stat_vector(5)
+            # 붙은 인벤토리는 버퍼를 직접 가리킴
+            block.buf[compact.nbytes - 8:compact.nbytes] = bytes(8)
+            assert attached.sub_grind[-1] == 0.0
+        assert len(attached) == 0
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_mmap_file_roundtrip(tmp_path):
+    """mmap 파일로 저장한 인벤토리를 다시 여는지 테스트"""
+    runes = random_inventory(4, 5)
+    path = str(tmp_path / "inventory.bin")
+    CompactRunes.from_runes(runes).export_file(path)
+
+    inventory = CompactRunes.open_file(path)
+    assert inventory.to_runes() == runes
+    assert inventory.to_runes([0, 2]) == [runes[0], runes[2]]
+    inventory.close()
+
+
+def test_attach_rejects_foreign_buffer(tmp_path):
+    """압축 인벤토리가 아닌 파일 테스트"""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not an inventory" * 4)
+    with pytest.raises(ValueError):
+        CompactRunes.open_file(str(path))
+
+
+def test_from_runes_rejects_extra_subs():
+    """서브 스탯이 MAX_SUBS개보다 많은 룬은 잘라내지 않고 ValueError"""
+    runes = random_inventory(0, 2)
+    extra = runes[0]
+    extra.subs = extra.subs + [SubStat(stat_id=8, value=5.0)] * (5 - len(extra.subs))
+    with pytest.raises(ValueError):
+        CompactRunes.from_runes(runes)
+
+    compact = CompactRunes()
+    with pytest.raises(ValueError):
+        compact.append(1, 1, 13, 6, 5, 3, 160.0, 0, 0.0, [(8, 5.0, 0, 0.0)] * 5)
+    assert len(compact) == 0 and len(compact.sub_stat_id) == 0
+
+
+def test_search_builds_shared_in_worker_pool():
+    """작업자 프로세스가 블록 이름만 받아 같은 결과를 내는지 테스트"""
+    runes = random_inventory(3, 8)
+    block = CompactRunes.from_runes(runes).export_shared()
+    try:
+        options = [{"target": "B", "top_n": 5}, {"target": "A", "top_n": 5, "constraints": {"SPD": 115}}]
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(search_builds_shared, block.name, **option) for option in options]
+            shared = [future.result() for future in futures]
+        for results, option in zip(shared, options):
+            expected = search_builds(runes, **option)
+            assert results
+            assert [r["score"] for r in results] == [r["score"] for r in expected]
+            assert [r["slots"][1]["rune_id"] for r in results] == [r["slots"][1]["rune_id"] for r in expected]
+    finally:
+        block.close()
+        block.unlink()
@@ -0,0 +1,74 @@
+"""분산 탐색 (로컬 작업자 프로세스) 테스트"""
+
+import multiprocessing
+import pytest
+from src.sw_mcp.harness import random_inventory
+from src.sw_mcp.optimizer import search_builds
+from src.sw_mcp.distributed import (SearchCoordinator, run_worker, search_builds_distributed,
+                                    rune_to_dict, rune_from_dict)
+
+
+def run_local(coordinator, workers):
+    """작업자 프로세스 workers개를 띄워 조정자 실행"""
+    processes = [multiprocessing.Process(target=run_worker, args=coordinator.address)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        return coordinator.run(workers, timeout=60)
+    finally:
+        for process in processes:
+            process.join(60)
+
+
+@pytest.mark.parametrize("options", [
+    {"target": "B", "top_n": 10},
+    {"target": "A", "top_n": 5, "constraints": {"SPD": 115}},
+    {"target": "B", "top_n": 3, "objective": "ATK_TOTAL"},
+    {"target": "B", "top_n": 5, "return_policy": "all_at_best"},
+])
+def test_distributed_matches_search_builds(options):
+    """분산 탐색 결과가 search_builds와 같은 점수인지 테스트"""
+    runes = random_inventory(3, 8)
+    expected = search_builds(runes, **options)
+    results = search_builds_distributed(runes, workers=3, **options)
+    assert expected
+    assert [r["score"] for r in results] == [r["score"] for r in expected]
+
+
+def test_work_stealing_with_single_task():
+    """작업이 하나뿐이면 쉬는 작업자가 바쁜 작업자의 하위 접두사를 훔치는지 테스트"""
+    runes = random_inventory(3, 10)
+    best = search_builds(runes, top_n=1)[0]
+    keep = best["slots"][1]["rune_id"]
+    runes = [rune for rune in runes if rune.slot != 1 or rune.rune_id == keep]
+    expected = search_builds(runes, top_n=10)
+    
+    coordinator = SearchCoordinator(runes, top_n=10, split_depth=3)
+    results = run_local(coordinator, 2)
+    
+    assert [r["score"] for r in results] == [r["score"] for r in expected]
+    assert coordinator.stats["steals"] >= 1
+    assert coordinator.stats["stolen"] >= 1
+    assert coordinator.stats["tasks"] > 1
+    assert coordinator.stats["broadcasts"] >= 1
+
+
+def test_coordinator_without_candidates():
+    """후보가 없는 슬롯이 있으면 작업자를 종료시키고 빈 결과를 반환하는지 테스트"""
+    runes = [rune for rune in random_inventory(3, 5) if rune.slot != 4]
+    assert run_local(SearchCoordinator(runes), 1) == []
+
+
+def test_coordinator_validation():
+    """지원하지 않는 옵션 검증 테스트"""
+    with pytest.raises(ValueError):
+        SearchCoordinator(random_inventory(3, 5), objective="PARETO")
+    with pytest.raises(ValueError):
+        SearchCoordinator(random_inventory(3, 5), split_depth=0)
+
+
+def test_rune_dict_roundtrip():
+    """룬 직렬화 왕복 테스트"""
+    runes = random_inventory(3, 5)
+    assert [rune_from_dict(rune_to_dict(rune)) for rune in runes] == runes
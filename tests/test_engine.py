@@ -0,0 +1,192 @@
+"""탐색 엔진 / 수집기 테스트"""
+
+import pytest
+from src.sw_mcp.types import Rune, SubStat
+from src.sw_mcp.optimizer import filter_rune_by_slot
+from src.sw_mcp.index import SlotIndex
+from src.sw_mcp.engine import SearchEngine
+from src.sw_mcp.collectors import TopCollector, ParetoCollector
+from src.sw_mcp.ordering import MoveOrder, need_mask, fills_need, NEED_BLADE
+from src.sw_mcp.harness import random_inventory
+
+
+def create_test_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None):
+    """테스트용 룬 생성"""
+    if subs is None:
+        subs = []
+    return Rune(
+        rune_id=rune_id,
+        slot=slot,
+        set_id=set_id,
+        main_stat_id=main_stat_id,
+        main_stat_value=main_value,
+        subs=subs,
+        level=6,
+        quality=5
+    )
+
+
+def create_index(target="B"):
+    """슬롯마다 치피/속도가 다른 Fatal/Blade 룬 3개씩 (치피 높은 룬이 먼저)"""
+    runes = []
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        for i in range(3):
+            runes.append(create_test_rune(
+                slot * 10 + i, slot, 8 if slot <= 4 else 4, main_stat_id, main_value,
+                [SubStat(9, 20, False, 0), SubStat(10, 60 - 30 * i, False, 0), SubStat(8, 2 * i, False, 0)]
+            ))
+    slot_runes = {slot: filter_rune_by_slot(runes, slot, target) for slot in range(1, 7)}
+    return SlotIndex(slot_runes)
+
+
+def test_engine_top_collector_prunes():
+    """top_n 수집기가 정렬된 결과를 내고 N번째 점수로 가지치기하는지 테스트"""
+    index = create_index()
+    
+    exhaustive = TopCollector(top_n=3 ** 6, max_results=None)
+    engine = SearchEngine(index)
+    engine.run([exhaustive])
+    all_nodes = engine.nodes
+    
+    top = TopCollector(top_n=3, max_results=None)
+    engine.run([top])
+    
+    scores = [r["score"] for r in top.results()]
+    assert scores == [r["score"] for r in exhaustive.results()][:3]
+    assert scores == sorted(scores, reverse=True)
+    assert engine.nodes < all_nodes
+
+
+def test_engine_shares_traversal_between_collectors():
+    """여러 수집기가 한 번의 탐색을 공유하는지 테스트"""
+    index = create_index()
+    fast = TopCollector(constraints={"SPD": 104 + 24}, top_n=5, max_results=None)
+    pareto = ParetoCollector(pareto_stats=["SPD", "CD"], max_results=None)
+    
+    SearchEngine(index).run([fast, pareto])
+    
+    # 속도 4짜리만 6개 골라야 SPD 128
+    assert len(fast.results()) == 1
+    assert fast.results()[0]["stats"]["spd_total"] == 24
+    # 치피 30 <-> 속도 2 교환이므로 모든 (SPD, CD) 조합이 비지배
+    assert len({tuple(r["pareto_values"].values()) for r in pareto.results()}) == 13
+
+
+def test_engine_drops_finished_collector_mid_search():
+    """탐색 중 결과를 다 받은 수집기만 빠지고 나머지는 단독 탐색과 같은 결과인지 테스트"""
+    index = create_index()
+    alone = TopCollector(top_n=5, max_results=None)
+    SearchEngine(index).run([alone])
+    
+    limited = TopCollector(top_n=5, max_results=2)
+    shared = TopCollector(top_n=5, max_results=None)
+    SearchEngine(index).run([limited, shared])
+    
+    assert limited.done
+    assert limited.accepted == 2
+    assert [r["score"] for r in shared.results()] == [r["score"] for r in alone.results()]
+
+
+def test_engine_prefix_subtrees_cover_search():
+    """슬롯 1~2 접두사 서브트리 탐색 결과를 합치면 전체 탐색과 같은지 테스트"""
+    index = create_index()
+    engine = SearchEngine(index)
+    full = TopCollector(top_n=3 ** 6, max_results=None)
+    engine.run([full])
+    
+    parts = TopCollector(top_n=3 ** 6, max_results=None)
+    for i in range(3):
+        for j in range(3):
+            engine.run([parts], [i, j])
+    
+    assert sorted(r["score"] for r in parts.results()) == sorted(r["score"] for r in full.results())
+    
+    # 접두사 슬롯의 룬은 고정
+    first = TopCollector(top_n=3 ** 6, max_results=None)
+    engine.run([first], [0])
+    assert {r["runes"][0].rune_id for r in first.results()} == {index.runes[1][0].rune_id}
+
+
+def test_top_collector_raise_floor():
+    """외부 임계값 이하의 빌드는 받지 않고 가지치기하는지 테스트"""
+    index = create_index()
+    engine = SearchEngine(index)
+    best = TopCollector(top_n=1, max_results=None)
+    engine.run([best])
+    nodes = engine.nodes
+    best_score = best.results()[0]["score"]
+    
+    floored = TopCollector(top_n=1, max_results=None)
+    floored.raise_floor(best_score - 1)
+    floored.raise_floor(0)  # 낮아지지 않음
+    engine.run([floored])
+    assert [r["score"] for r in floored.results()] == [best_score]
+    assert engine.nodes <= nodes
+    
+    blocked = TopCollector(top_n=1, max_results=None)
+    blocked.raise_floor(best_score)
+    engine.run([blocked])
+    assert blocked.results() == []
+
+
+@pytest.mark.parametrize("seed", [0, 2, 4])
+def test_move_order_finds_same_results_with_fewer_nodes(seed):
+    """유망한 후보부터 탐색해도 같은 점수를 더 적은 노드로 찾는지 테스트"""
+    runes = random_inventory(seed, 12)
+    index = SlotIndex({slot: filter_rune_by_slot(runes, slot, "B") for slot in range(1, 7)})
+    
+    plain = TopCollector(top_n=5, max_results=None)
+    plain_engine = SearchEngine(index, move_order=False)
+    plain_engine.run([plain])
+    ordered = TopCollector(top_n=5, max_results=None)
+    ordered_engine = SearchEngine(index)
+    ordered_engine.run([ordered])
+    
+    assert [r["score"] for r in ordered.results()] == [r["score"] for r in plain.results()]
+    assert ordered_engine.nodes < plain_engine.nodes
+
+
+def test_move_order_children():
+    """objective 기여 순서와 필요 세트 우선 순서 테스트"""
+    index = create_index()
+    order = MoveOrder(index, [TopCollector()])
+    
+    # 치피가 큰 후보(인덱스 순서와 같음)부터, 치확 도달 가능한 후보 수까지만 사용
+    children = order.children(1, 3, need_mask(0, 0, 0))
+    assert [index.vectors[1][k][1] for k in children] == [60, 30, 0]
+    assert order.children(1, 3, 0) is order.children(1, 3, 0)
+    # Rage/Fatal 4개를 채운 부분 빌드는 Blade(또는 무형) 후보만 필요 세트를 채움
+    assert need_mask(4, 0, 0, "A") == NEED_BLADE
+    assert fills_need((0, 0, 1, 0), NEED_BLADE)
+    assert fills_need((0, 0, 0, 1), NEED_BLADE)
+    assert not fills_need((0, 1, 0, 0), NEED_BLADE)
+    
+    # SPD 최소 조건이 빡빡하면 속도가 높은 후보가 앞
+    fast = MoveOrder(index, [TopCollector(constraints={"SPD": 104 + 24})])
+    assert [index.vectors[1][k][4] for k in fast.children(1, 3, 0)] == [4, 2, 0]
+    # OBJECTIVE_STAT_KEY에 없는 objective는 수집기와 같이 SCORE 기여로 정렬
+    assert MoveOrder(index, [TopCollector(objective="SPD")]).keys == order.keys
+
+
+@pytest.mark.parametrize("spd", [120, 150])
+def test_speed_joint_bound_prunes_spd_queries(spd):
+    """SPD 결합 상한이 결과를 바꾸지 않고 노드를 줄이는지 테스트"""
+    runes = random_inventory(0, 12)
+    index = SlotIndex({slot: filter_rune_by_slot(runes, slot, "B") for slot in range(1, 7)})
+    
+    plain = TopCollector(constraints={"SPD": spd}, top_n=10, max_results=None)
+    plain_engine = SearchEngine(index)
+    plain_engine.spd_needed = lambda collectors, bases=None: None
+    plain_engine.run([plain])
+    joint = TopCollector(constraints={"SPD": spd}, top_n=10, max_results=None)
+    joint_engine = SearchEngine(index)
+    joint_engine.run([joint])
+    
+    assert plain.results()
+    assert joint_engine.spd_needed([joint]) == spd - 104
+    assert [r["score"] for r in joint.results()] == [r["score"] for r in plain.results()]
+    assert joint_engine.nodes < plain_engine.nodes
+    # SPD 조건이 없는 수집기가 섞이면 결합 상한을 쓰지 않음
+    assert joint_engine.spd_needed([joint, TopCollector()]) is None
@@ -0,0 +1,60 @@
+"""차등 테스트 하네스 테스트"""
+
+import pytest
+from src.sw_mcp.harness import run_harness, random_inventory, reference_search, compare_results, main
+
+
+def test_harness_engines_match_reference():
+    """모든 정확한 엔진이 기준 구현과 같은 결과를 내는지 테스트"""
+    report = run_harness(seeds=range(2), per_slot=5, engines=["dfs", "mitm", "fast"])
+    
+    assert report.ok, report.format()
+    assert report.cases["dfs"] == report.cases["reference"]
+    assert 0 < report.cases["mitm"] < report.cases["reference"]
+    assert "fast" in report.gaps
+
+
+def test_harness_covers_shared_paths():
+    """공유 메모리 / 분산 / target 묶음 / 기본 스탯 묶음 / 커서 경로도 기준 구현과 같은지 테스트"""
+    engines = ["shared", "distributed", "targets", "parametric", "cursor"]
+    report = run_harness(seeds=range(1), per_slot=4, engines=engines)
+    
+    assert report.ok, report.format()
+    assert all(report.cases[name] > 0 for name in engines)
+
+
+def test_reference_independent_of_engine_scoring(monkeypatch):
+    """기준 구현이 엔진의 무형 배치 결정(canonical_assignment)을 쓰지 않는지 테스트"""
+    from src.sw_mcp import scoring
+
+    def broken(*args, **kwargs):
+        raise AssertionError("canonical_assignment 호출")
+
+    monkeypatch.setattr(scoring, "canonical_assignment", broken)
+    assert reference_search(random_inventory(1, 5), None, "SCORE", "top_n", 3)
+
+
+def test_compare_results_detects_mismatch():
+    """비교 함수가 objective 값과 빌드 차이를 찾아내는지 테스트"""
+    runes = random_inventory(1, 5)
+    reference = reference_search(runes, None, "SCORE", "top_n", 3)
+    assert reference
+    
+    results = [
+        {"score": value, "slots": {slot: {"rune_id": rune_id} for slot, rune_id in zip(range(1, 7), build)}}
+        for value, build in reference
+    ]
+    assert compare_results(reference, results, "SCORE", 3) is None
+    assert compare_results(reference, results[:-1], "SCORE", 3) is not None
+
+
+def test_harness_rejects_unknown_engine():
+    """알 수 없는 엔진 이름 테스트"""
+    with pytest.raises(ValueError):
+        run_harness(seeds=range(1), engines=["vectorized"])
+
+
+def test_harness_cli(capsys):
+    """명령행 실행 시 표와 종료 코드 테스트"""
+    assert main(["--seeds", "1", "--per-slot", "4", "--engines", "dfs"]) == 0
+    assert "reference" in capsys.readouterr().out
@@ -0,0 +1,114 @@
+"""슬롯 인덱스 테스트"""
+
+import itertools
+from src.sw_mcp.types import Rune, SubStat
+from src.sw_mcp.index import SlotIndex, SpeedIndex, REQUIRED_RUNE_CR
+from src.sw_mcp.scoring import linear_score_key
+
+
+def create_test_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None):
+    """테스트용 룬 생성"""
+    if subs is None:
+        subs = []
+    return Rune(
+        rune_id=rune_id,
+        slot=slot,
+        set_id=set_id,
+        main_stat_id=main_stat_id,
+        main_stat_value=main_value,
+        subs=subs,
+        level=6,
+        quality=5
+    )
+
+
+def test_slot_index_cr_order_and_suffix_max():
+    """CR 내림차순 정렬과 suffix 최대/최소 CR 테이블 테스트"""
+    slot_runes = {
+        slot: [
+            create_test_rune(slot * 10 + i, slot, 8, 4, 63, [SubStat(9, cr, False, 0)])
+            for i, cr in enumerate([5, 20, 12])
+        ]
+        for slot in range(1, 7)
+    }
+    
+    index = SlotIndex(slot_runes)
+    
+    assert [index.vectors[1][k][0] for k in range(3)] == [20, 12, 5]
+    assert index.suffix_max[7][0] == 0.0
+    assert index.suffix_max[4][0] == 60.0
+    assert index.suffix_max[1][0] == 120.0
+    assert index.max_remaining(4)["CR"] == 60.0
+    assert index.suffix_min[4][0] == 15.0
+    assert index.min_remaining(1)["CR"] == 30.0
+
+
+def test_slot_index_cr_feasible_count():
+    """치확 100에 도달할 수 없는 후보가 잘리는지 테스트"""
+    slot_runes = {
+        slot: [
+            create_test_rune(slot * 10 + i, slot, 8, 4, 63, [SubStat(9, cr, False, 0)])
+            for i, cr in enumerate([5, 20, 12])
+        ]
+        for slot in range(1, 7)
+    }
+    index = SlotIndex(slot_runes)
+    
+    # 슬롯 6: 지금까지 CR 60 -> 13 이상 필요 -> CR 20 룬만 가능
+    assert index.cr_feasible_count(6, 60.0) == 1
+    # 슬롯 6: 지금까지 CR 70 -> 3 이상 필요 -> 모두 가능
+    assert index.cr_feasible_count(6, 70.0) == 3
+    # 슬롯 1: 이후 슬롯 최대 100 -> 모두 가능
+    assert index.cr_feasible_count(1, 0.0) == 3
+    # 슬롯 5: 지금까지 CR 20 + 슬롯 6 최대 20 -> 33 이상 필요 -> 불가능
+    assert index.cr_feasible_count(5, 20.0) == 0
+    assert REQUIRED_RUNE_CR == 73.0
+
+
+def test_slot_index_collapses_equivalent_runes():
+    """스탯 벡터와 세트 역할이 같은 룬을 하나의 후보로 합치는지 테스트"""
+    slot_runes = {
+        slot: [
+            create_test_rune(slot * 10, slot, 8, 4, 63, [SubStat(9, 20, False, 0)]),
+            create_test_rune(slot * 10 + 1, slot, 8, 4, 63, [SubStat(9, 20, False, 0)]),
+            create_test_rune(slot * 10 + 2, slot, 5, 4, 63, [SubStat(9, 20, False, 0)]),  # 세트 역할 다름
+        ]
+        for slot in range(1, 7)
+    }
+    
+    index = SlotIndex(slot_runes)
+    assert [r.rune_id for r in index.runes[1]] == [10, 12]
+    assert [[r.rune_id for r in alts] for alts in index.alternatives[1]] == [[11], []]
+    assert index.equivalent_ids()[10] == [11]
+    
+    assert len(SlotIndex(slot_runes, collapse=False).runes[1]) == 3
+
+
+def test_speed_index_joint_max_matches_brute_force():
+    """SPD 구간 DP 결합 최대가 슬롯 조합 전수 계산과 같은지 테스트"""
+    slot_runes = {
+        slot: [
+            create_test_rune(slot * 10 + i, slot, 8, 4, 63,
+                             [SubStat(8, spd, False, 0), SubStat(10, cd, False, 0), SubStat(9, 10, False, 0)])
+            for i, (spd, cd) in enumerate([(0, 30), (6, 20), (12, 5), (6, 25)])
+        ]
+        for slot in range(1, 7)
+    }
+    index = SlotIndex(slot_runes)
+    speed = SpeedIndex(index, base_atk=900)
+    
+    assert [spd for spd, _ in speed.buckets[6]] == [12, 6, 0]
+    for slot in (4, 5, 6):
+        combos = list(itertools.product(*[index.vectors[s] for s in range(slot, 7)]))
+        for spd_needed in (0, 7, 13, 30, 12 * (7 - slot), 12 * (7 - slot) + 1):
+            feasible = [c for c in combos if sum(v[4] for v in c) >= spd_needed]
+            joint = speed.joint_max(slot, spd_needed)
+            if not feasible:
+                assert joint is None
+                continue
+            assert joint[1] == max(sum(v[1] for v in c) for c in feasible)
+            assert joint[4] == max(sum(linear_score_key(v, 900) for v in c) for c in feasible)
+            # 속도 조건이 있으면 독립 최대(suffix_max)보다 좁다
+            assert joint[1] <= index.suffix_max[slot][1]
+    assert speed.joint_max(6, 13) is None
+    assert speed.joint_max(4, 30)[1] < index.suffix_max[4][1]
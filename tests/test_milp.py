@@ -0,0 +1,44 @@
+"""정수 계획법(MILP) 엔진 테스트"""
+
+import pytest
+from src.sw_mcp.optimizer import search_builds
+from src.sw_mcp.harness import random_inventory
+
+pytest.importorskip("pulp")
+
+
+@pytest.mark.parametrize("target", ["A", "B"])
+@pytest.mark.parametrize("constraints,objective", [
+    (None, "SCORE"),
+    ({"SPD": 104 + 20}, "SCORE"),
+    ({"SPD": 104 + 15, "MAX_CR": 120}, "ATK_TOTAL"),
+])
+def test_milp_matches_dfs(target, constraints, objective):
+    """milp 엔진이 dfs 엔진과 같은 상위 objective 값을 반환하는지 테스트"""
+    runes = random_inventory(2, 4)
+    key = "score" if objective == "SCORE" else "atk_total"
+    dfs = search_builds(runes, target=target, constraints=constraints, objective=objective, top_n=5)
+    milp = search_builds(runes, target=target, constraints=constraints, objective=objective, top_n=5,
+                         engine="milp")
+    
+    assert dfs
+    assert [r[key] for r in milp] == [r[key] for r in dfs]
+    builds = [tuple(r["slots"][slot]["rune_id"] for slot in range(1, 7)) for r in milp]
+    assert len(set(builds)) == len(builds)
+
+
+@pytest.mark.parametrize("objective", ["SPD", "CR", "ATK_PCT", "ATK_FLAT"])
+def test_milp_unlisted_objective_ranks_by_score(objective):
+    """OBJECTIVE_STAT_KEY에 없는 objective도 milp 엔진이 SCORE 순서로 반환하는지 테스트"""
+    runes = random_inventory(1, 5)
+    
+    results = search_builds(runes, target="A", objective=objective, top_n=5, max_results=None,
+                            engine="milp")
+    
+    assert [r["score"] for r in results] == [4087, 4038, 3954, 3951, 3945]
+
+
+def test_milp_rejects_pareto():
+    """milp 엔진의 PARETO 미지원 테스트"""
+    with pytest.raises(ValueError):
+        search_builds(random_inventory(2, 4), objective="PARETO", engine="milp")
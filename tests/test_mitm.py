@@ -0,0 +1,56 @@
+"""meet-in-the-middle 엔진 테스트"""
+
+import pytest
+from src.sw_mcp.types import Rune, SubStat
+from src.sw_mcp.optimizer import search_builds
+
+
+def create_test_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None):
+    """테스트용 룬 생성"""
+    if subs is None:
+        subs = []
+    return Rune(
+        rune_id=rune_id,
+        slot=slot,
+        set_id=set_id,
+        main_stat_id=main_stat_id,
+        main_stat_value=main_value,
+        subs=subs,
+        level=6,
+        quality=5
+    )
+
+
+def create_inventory():
+    """슬롯마다 세트/치확/치피가 다른 룬 4개씩"""
+    runes = []
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        for i, set_id in enumerate([8, 5, 4, 25]):
+            runes.append(create_test_rune(
+                slot * 100 + i, slot, set_id, main_stat_id, main_value,
+                [SubStat(9, 14 + i * 2, False, 0), SubStat(10, 4 + (slot * 3 + i) % 7, False, 0),
+                 SubStat(3, 10 + i * 5, False, 0) if slot != 3 else SubStat(8, 5, False, 0)]
+            ))
+    return runes
+
+
+@pytest.mark.parametrize("target", ["A", "B"])
+def test_mitm_matches_dfs(target):
+    """mitm 엔진이 DFS와 같은 상위 스코어를 반환하는지 테스트"""
+    runes = create_inventory()
+    
+    dfs_results = search_builds(runes, target=target, top_n=15)
+    mitm_results = search_builds(runes, target=target, top_n=15, engine="mitm")
+    
+    assert len(dfs_results) > 0
+    assert [r["score"] for r in mitm_results] == [r["score"] for r in dfs_results]
+    for result in mitm_results:
+        assert result["cr_total"] >= 100.0
+
+
+def test_mitm_rejects_constraints():
+    """mitm 엔진은 제약 조건 쿼리를 거부"""
+    with pytest.raises(ValueError):
+        search_builds(create_inventory(), constraints={"SPD": 120}, engine="mitm")
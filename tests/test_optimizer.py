@@ -2,7 +2,8 @@
 
 import pytest
 from src.sw_mcp.types import Rune, SubStat
-from src.sw_mcp.optimizer import optimize_lushen, filter_rune_by_slot
+from src.sw_mcp.optimizer import optimize_lushen, filter_rune_by_slot, search_builds, search_builds_many
+from src.sw_mcp.harness import random_inventory
 
 
 def create_test_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None):
@@ -100,3 +101,49 @@ def test_optimize_lushen_basic():
         assert results[0]["score"] > 0
         assert results[0]["cr_total"] >= 100.0  # 치확 조건 만족
 
+
+
+@pytest.mark.parametrize("seed", [1, 7])
+def test_optimize_lushen_targets_matches_per_target(seed):
+    """targets 탐색 한 번의 결과가 target별 optimize_lushen과 같은지 테스트"""
+    runes = random_inventory(seed, 10)
+    results = optimize_lushen(runes, targets=["A", "B"], top_n=15)
+
+    assert set(results) == {"A", "B"}
+    for target in ("A", "B"):
+        assert results[target]
+        assert results[target] == optimize_lushen(runes, target=target, top_n=15)
+
+
+def test_search_builds_many_mixed_targets_and_constraints():
+    """쿼리마다 target / 조건이 달라도 쿼리별 search_builds와 같은지 테스트"""
+    runes = random_inventory(2, 10)
+    queries = [
+        {"target": "A", "constraints": {"SPD": 120}, "top_n": 5},
+        {"target": "B", "constraints": {"SPD": 120}, "top_n": 5},
+        {"target": "B", "objective": "ATK_TOTAL", "top_n": 5, "base_atk": 1000},
+    ]
+    batch = search_builds_many(runes, queries, target="A")
+    for query, results in zip(queries, batch):
+        single = dict(query)
+        assert results == search_builds(runes, **single)
+
+
+def test_check_constraints_precomputed_matches_lazy():
+    """미리 계산한 plan / 남은 최소·최대 스탯을 넘긴 결과가 매번 계산한 결과와 같은지 테스트"""
+    from src.sw_mcp.optimizer import DPState, check_constraints
+    from src.sw_mcp.constraints import ConstraintPlan
+    from src.sw_mcp.index import SlotIndex
+
+    runes = random_inventory(4, 8)
+    slot_runes = {slot: filter_rune_by_slot(runes, slot) for slot in range(1, 7)}
+    index = SlotIndex(slot_runes)
+    state = DPState(count_rage_fatal=2, count_blade=1, cr=30.0, cd=60.0, spd=20.0)
+    for constraints in ({"SPD": 130}, {"MAX_SPD": 140, "CD": 150}, {"MAX_CR": 90}):
+        plan = ConstraintPlan(constraints, 104)
+        for slot in range(3, 8):
+            lazy = check_constraints(state, constraints, slot_runes, slot, 900, 104)
+            precomputed = check_constraints(state, constraints, slot_runes, slot, 900, 104,
+                                            max_remaining=index.max_remaining(slot), plan=plan,
+                                            min_remaining=index.min_remaining(slot))
+            assert lazy == precomputed
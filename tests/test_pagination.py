@@ -0,0 +1,103 @@
+"""커서 기반 페이지 탐색 / 체크포인트 재개 테스트"""
+
+import json
+import pytest
+from src.sw_mcp.harness import random_inventory
+from src.sw_mcp.optimizer import search_builds
+from src.sw_mcp.engine import SearchEngine
+from src.sw_mcp.collectors import TopCollector
+from src.sw_mcp import pagination
+from src.sw_mcp.pagination import SearchCursor, search_builds_page
+
+
+def build_ids(results):
+    """결과별 슬롯 1~6 rune_id"""
+    return [tuple(r["slots"][slot]["rune_id"] for slot in range(1, 7)) for r in results]
+
+
+def collect_pages(cursor, pages, node_limit=None):
+    """pages개 페이지를 이어 붙임 (노드 한도에 걸리면 JSON으로 저장 후 복원해 재개)"""
+    results = []
+    for _ in range(pages):
+        while True:
+            page = cursor.next_page(node_limit)
+            if page is not None:
+                break
+            cursor = SearchCursor.from_dict(random_inventory(3, 8), json.loads(json.dumps(cursor.to_dict())))
+        results.extend(page)
+    return results, cursor
+
+
+@pytest.mark.parametrize("options", [
+    {"target": "B"},
+    {"target": "A", "constraints": {"SPD": 115}},
+    {"target": "B", "objective": "ATK_TOTAL"},
+])
+def test_pages_match_search_builds(options):
+    """페이지를 이으면 top_n을 키운 search_builds와 같은 빌드 순서인지 테스트"""
+    runes = random_inventory(3, 8)
+    expected = search_builds(runes, top_n=20, max_results=None, **options)
+    
+    results, _ = collect_pages(SearchCursor(runes, page_size=5, **options), 4)
+    
+    assert build_ids(results) == build_ids(expected)
+    assert [r["score"] for r in results] == [r["score"] for r in expected]
+
+
+def test_resume_does_not_revisit_finished_subtrees():
+    """노드 한도로 끊어 저장/복원해도 같은 결과와 같은 총 방문 노드 수인지 테스트"""
+    runes = random_inventory(3, 8)
+    straight, straight_cursor = collect_pages(SearchCursor(runes, page_size=6), 3)
+    resumed, resumed_cursor = collect_pages(SearchCursor(runes, page_size=6), 3, node_limit=100)
+    
+    assert build_ids(resumed) == build_ids(straight)
+    assert resumed_cursor.nodes == straight_cursor.nodes
+
+
+def test_pages_expand_only_frontier():
+    """k개 페이지의 총 방문 노드 수가 top_n=k*page_size 탐색 한 번과 비슷한지 테스트"""
+    runes = random_inventory(2, 12)
+    cursor = SearchCursor(runes, page_size=20)
+    results, cursor = collect_pages(cursor, 6)
+    
+    engine = SearchEngine(cursor.index)
+    top = TopCollector(top_n=120, max_results=None)
+    engine.run([top])
+    
+    assert [r["score"] for r in results] == [r["score"] for r in top.results()]
+    assert cursor.nodes <= 1.2 * engine.nodes
+
+
+@pytest.mark.parametrize("node_limit", [None, 150])
+def test_pages_match_after_frontier_spill(monkeypatch, node_limit):
+    """프런티어 상한을 넘겨 항목을 버려도 페이지 결과가 같은지 테스트"""
+    monkeypatch.setattr(pagination, "MAX_FRONTIER", 30)
+    runes = random_inventory(3, 8)
+    expected = search_builds(runes, top_n=40, max_results=None)
+    
+    results, cursor = collect_pages(SearchCursor(runes, page_size=5), 8, node_limit=node_limit)
+    
+    assert len(cursor.frontier) <= 30
+    assert build_ids(results) == build_ids(expected)
+
+
+def test_search_builds_page_until_exhausted():
+    """상태 없는 페이지 호출이 끝에서 커서 None을 반환하는지 테스트"""
+    runes = random_inventory(3, 5)
+    expected = search_builds(runes, top_n=10 ** 6, max_results=None)
+    
+    results, cursor = search_builds_page(runes, page_size=50)
+    while cursor is not None:
+        page, cursor = search_builds_page(runes, cursor)
+        results.extend(page)
+    
+    assert build_ids(results) == build_ids(expected)
+
+
+def test_cursor_rejects_other_inventory():
+    """다른 인벤토리로 커서를 복원하면 ValueError"""
+    state = SearchCursor(random_inventory(3, 5)).to_dict()
+    with pytest.raises(ValueError):
+        SearchCursor.from_dict(random_inventory(4, 5), state)
+    with pytest.raises(ValueError):
+        SearchCursor(random_inventory(3, 5), objective="PARETO")
@@ -2,7 +2,9 @@
 
 import json
 import pytest
-from src.sw_mcp.swex_parser import parse_rune, parse_swex_json
+from src.sw_mcp.swex_parser import parse_rune, parse_swex_json, parse_swex_compact, load_swex_json, ParseErrors
+from src.sw_mcp.compact import CompactRunes, MAX_SUBS
+from src.sw_mcp.scoring import rune_stat_vector
 from src.sw_mcp.types import Rune
 
 
@@ -162,3 +164,96 @@ def test_parse_rune_prefix_eff():
     assert rune2.has_prefix is False
     assert rune2.prefix_stat_id == 0
 
+
+def test_parse_swex_compact_matches_parse_swex_json():
+    """압축 파싱 결과가 parse_swex_json과 같은 룬을 만드는지 테스트"""
+    json_data = {
+        "runes": [
+            {"rune_id": 1, "slot_no": 1, "set_id": 25, "pri_eff": [3, 160], "prefix_eff": [9, 5],
+             "sec_eff": [[9, 5, 0, 0], [10, 7, 0, 0], [4, 6, 1, 4], [8, 10, 0, 2]], "class": 6, "rank": 5},
+            {"rune_id": 2, "slot_no": 4, "set_id": 4, "pri_eff": [10, 80], "prefix_eff": 0,
+             "sec_eff": [[9, 12]], "class": 6, "rank": 4},
+        ],
+        "unit_list": [
+            {"runes": [
+                {"rune_id": 3, "slot_no": 2, "set_id": 8, "pri_eff": [4, 63], "sec_eff": [], "class": 6, "rank": 5},
+                {"rune_id": 1, "slot_no": 1, "set_id": 25, "pri_eff": [3, 160], "sec_eff": []},
+            ]}
+        ],
+    }
+    
+    compact, errors = parse_swex_compact(json_data)
+    expected = parse_swex_json(json_data)
+    
+    assert not errors
+    assert len(compact) == 3
+    for i, rune in enumerate(expected):
+        restored = compact.rune(i)
+        assert restored.rune_id == rune.rune_id
+        assert (restored.slot, restored.set_id, restored.main_stat_id) == (rune.slot, rune.set_id, rune.main_stat_id)
+        assert restored.prefix_stat_id == rune.prefix_stat_id
+        assert [(s.stat_id, s.value, s.grind) for s in restored.subs] == [(s.stat_id, s.value, s.grind) for s in rune.subs]
+        assert compact.stat_vector(i) == rune_stat_vector(rune)
+    
+    # Rune -> CompactRunes -> Rune 왕복
+    roundtrip = CompactRunes.from_runes(expected).to_runes()
+    assert [rune_stat_vector(r) for r in roundtrip] == [rune_stat_vector(r) for r in expected]
+
+
+def test_parse_errors_collected_without_printing(capsys):
+    """잘못된 룬을 출력 없이 종류별 개수와 예시로 모으는지 테스트"""
+    good = {"rune_id": 1, "slot_no": 1, "set_id": 5, "pri_eff": [3, 160], "sec_eff": []}
+    bad = [{"rune_id": 100 + i, "slot_no": 1, "set_id": 5, "sec_eff": []} for i in range(20)]
+    bad.append({"rune_id": 200, "slot_no": 9, "set_id": 5, "pri_eff": [3, 160], "sec_eff": []})
+    bad.append({"rune_id": 201, "slot_no": 2, "set_id": 70000, "pri_eff": [4, 63], "sec_eff": []})
+    json_data = {"runes": bad + [good]}
+    
+    compact, errors = parse_swex_compact(json_data, max_examples=3)
+    
+    assert list(compact.rune_id) == [1]
+    assert len(compact.sub_stat_id) == MAX_SUBS  # 실패한 룬의 열이 남지 않음
+    assert errors.counts["missing:pri_eff"] == 20
+    assert errors.counts["invalid_slot"] == 1
+    assert errors.counts["OverflowError"] == 1
+    assert errors.total == 22
+    assert len(errors.examples) == 3
+    assert errors.to_dict()["examples"][0]["rune_id"] == 100
+    
+    # 기존 경로도 출력 대신 errors에 기록
+    collected = ParseErrors()
+    broken = [{"rune_id": 300 + i, "slot_no": 1, "set_id": 5, "pri_eff": [3, 160], "sec_eff": [7]} for i in range(2)]
+    runes = parse_swex_json({"runes": broken + [good]}, collected)
+    assert [r.rune_id for r in runes] == [1]
+    assert collected.total == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_parse_paths_share_validity_rule(tmp_path):
+    """parse_swex_json / parse_swex_compact / load_swex_json이 같은 룬을 버리고 오류를 돌려주는지 테스트"""
+    good = [{"rune_id": i, "slot_no": i % 6 + 1, "set_id": 5, "pri_eff": [4, 63],
+             "sec_eff": [[9, 5, 0, 0]], "class": 6, "rank": 5} for i in range(1, 11)]
+    bad = [
+        {"rune_id": 100, "slot_no": 1, "set_id": 5, "sec_eff": []},  # pri_eff 없음
+        {"rune_id": None, "slot_no": 1, "set_id": 5, "pri_eff": [4, 63]},
+        {"rune_id": 101, "slot_no": 2, "set_id": 5, "pri_eff": [4, "63"]},
+        {"rune_id": 102, "slot_no": 3, "set_id": 5, "pri_eff": [4, 63], "sec_eff": [[9, 5]] * (MAX_SUBS + 1)},
+    ]
+    json_data = {"runes": good + bad}
+
+    collected = ParseErrors()
+    runes = parse_swex_json(json_data, collected)
+    compact, errors = parse_swex_compact(json_data)
+    assert [r.rune_id for r in runes] == list(compact.rune_id) == list(range(1, 11))
+    assert collected.counts == errors.counts
+    assert collected.counts["invalid_rune_id"] == 1
+    assert collected.counts["too_many_subs"] == 1
+
+    # errors 없이 호출하면 건너뛴 룬을 경고 하나로 알린다
+    with pytest.warns(UserWarning, match="4"):
+        assert len(parse_swex_json(json_data)) == 10
+
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(json_data), encoding="utf-8")
+    loaded = ParseErrors()
+    assert len(load_swex_json(str(path), loaded)) == 10
+    assert loaded.total == 4
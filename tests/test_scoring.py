@@ -1,8 +1,12 @@
 """스코어링 테스트"""
 
 import pytest
+from itertools import product
 from src.sw_mcp.types import Rune, SubStat, BASE_CR, BLADE_2SET_CR
-from src.sw_mcp.scoring import score_build, calculate_stats, find_best_intangible_assignment
+from src.sw_mcp.scoring import (score_build, calculate_stats, find_best_intangible_assignment,
+                                rune_stat_vector, rune_set_counts, linear_score_key,
+                                score_from_totals, intangible_options, set_bonus,
+                                canonical_assignment, set_signature_feasible)
 
 
 def create_test_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None):
@@ -143,3 +147,79 @@ def test_score_formula():
     expected_score = (stats["cd_total"] * 10) + stats["atk_bonus"] + 200
     assert abs(score - expected_score) < 0.01
 
+
+
+def test_score_from_totals_matches_score_build():
+    """룬별 벡터 합 + 리프 보정이 find_best_intangible_assignment와 같은지 테스트"""
+    cases = {
+        "fatal_blade": [8, 8, 8, 8, 4, 4],
+        "intangible_to_fatal": [25, 8, 8, 5, 4, 4],
+        "intangible_to_blade": [8, 5, 5, 8, 25, 4],
+        "rage_blade": [5, 5, 5, 5, 4, 4],
+        "broken_set": [8, 8, 8, 3, 4, 4],
+    }
+    
+    for name, set_ids in cases.items():
+        runes = [
+            create_test_rune(slot, slot, set_id, 10 if slot == 4 else 4, 80 if slot == 4 else 63,
+                             [SubStat(9, 12 + slot, False, 0), SubStat(3, 5 * slot, False, 0)])
+            for slot, set_id in zip(range(1, 7), set_ids)
+        ]
+        
+        totals = [0.0] * 5
+        set_counts = [0] * 4
+        for rune in runes:
+            totals = [a + b for a, b in zip(totals, rune_stat_vector(rune))]
+            set_counts = [a + b for a, b in zip(set_counts, rune_set_counts(rune))]
+        
+        for target in ("A", "B"):
+            expected = find_best_intangible_assignment(runes, target, 900)
+            result = score_from_totals(tuple(totals), tuple(set_counts), target, 900)
+            if expected[1] > 0:
+                assert result == expected, (name, target)
+            else:
+                assert result[1] == 0.0, (name, target)
+
+
+def test_linear_score_key_bounds_score():
+    """선형 키 합이 반올림 오차 0.5 이내로 스코어를 결정하는지 테스트"""
+    runes = [
+        create_test_rune(slot, slot, 8 if slot <= 4 else 4, 10 if slot == 4 else 4,
+                         80 if slot == 4 else 63, [SubStat(9, 20, False, 0), SubStat(3, 7, False, 0)])
+        for slot in range(1, 7)
+    ]
+    
+    score, stats = score_build(runes, "B", "none", base_atk=917)
+    key = sum(linear_score_key(rune_stat_vector(rune), 917) for rune in runes)
+    # Fatal 4세트 보너스 ATK% 35 포함
+    linear = 50 * 10 + 200 + key + 917 * 35 / 100.0
+    assert abs(score - linear) <= 0.5
+
+
+def test_canonical_assignment_matches_option_scan():
+    """구조적 무형 배치가 배치 후보를 모두 평가한 첫 번째 유효 배치와 같은지 테스트"""
+    for target in ("A", "B"):
+        for rage in range(7):
+            for fatal in range(7 - rage):
+                for blade in range(7 - rage - fatal):
+                    for intangible in range(min(2, 6 - rage - fatal - blade) + 1):
+                        counts = (rage, fatal, blade, intangible)
+                        valid = [a for a in intangible_options(target, intangible)
+                                 if set_bonus(counts, target, a) is not None]
+                        assert canonical_assignment(counts, target) == (valid[0] if valid else None), counts
+
+
+def test_set_signature_feasible_matches_completions():
+    """부분 세트 시그니처의 실현 가능성이 남은 슬롯의 모든 완성과 일치하는지 테스트"""
+    # 남은 슬롯 하나가 더할 수 있는 세트 기여: Rage, Fatal, Blade, 무형, 기타
+    choices = [(1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1), (0, 0, 0, 0)]
+    for target in ("A", "B"):
+        for depth in range(7):
+            signatures = {tuple(sum(values) for values in zip((0, 0, 0, 0), *picked))
+                          for picked in product(choices, repeat=depth)}
+            for counts in signatures:
+                expected = any(
+                    canonical_assignment(tuple(sum(values) for values in zip(counts, *rest)), target)
+                    for rest in product(choices, repeat=6 - depth)
+                )
+                assert set_signature_feasible(counts, 6 - depth, target) == expected, (counts, target)
@@ -2,7 +2,8 @@
 
 import pytest
 from src.sw_mcp.types import Rune, SubStat
-from src.sw_mcp.optimizer import search_builds
+from src.sw_mcp.optimizer import search_builds, search_builds_many, search_builds_parametric, rank_rune_values
+from src.sw_mcp.harness import random_inventory
 
 
 def create_test_rune(rune_id, slot, set_id, main_stat_id, main_value, subs=None, prefix_stat_id=0, prefix_stat_value=0.0):
@@ -104,6 +105,17 @@ def test_search_builds_objective():
             assert results[i]["atk_total"] >= results[i + 1]["atk_total"]
 
 
+@pytest.mark.parametrize("objective", ["SPD", "CR", "ATK_PCT", "ATK_FLAT"])
+def test_search_builds_unlisted_objective_ranks_by_score(objective):
+    """OBJECTIVE_STAT_KEY에 없는 objective는 SCORE와 같은 순서인지 테스트 (가지치기도 SCORE 상한)"""
+    runes = random_inventory(1, 5)
+    expected = search_builds(runes, target="A", top_n=5, max_results=None)
+    
+    results = search_builds(runes, target="A", objective=objective, top_n=5, max_results=None)
+    
+    assert [r["score"] for r in results] == [r["score"] for r in expected] == [4087, 4038, 3954, 3951, 3945]
+
+
 def test_search_builds_min_score():
     """MIN_SCORE 제약 조건 테스트"""
     runes = []
@@ -142,3 +154,295 @@ def test_search_builds_min_score():
     for result in results:
         assert result["score"] >= 4000.0
 
+
+
+def test_search_builds_many_matches_single_queries():
+    """search_builds_many가 쿼리별 search_builds와 같은 결과를 내는지 테스트"""
+    runes = []
+    
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        
+        for i, set_id in enumerate([8, 4, 25]):
+            rune = create_test_rune(
+                slot * 100 + i, slot, set_id, main_stat_id, main_value,
+                [SubStat(9, 15 + i * 3, False, 0), SubStat(8, 5 + slot + i, False, 0)]
+            )
+            runes.append(rune)
+    
+    queries = [
+        {"constraints": {"SPD": spd}, "top_n": 5}
+        for spd in (100, 130, 140, 160)
+    ] + [{"constraints": {"CD": 150.0}, "objective": "ATK_TOTAL", "top_n": 3}]
+    
+    batch_results = search_builds_many(runes, queries, target="B")
+    
+    assert len(batch_results) == len(queries)
+    for query, results in zip(queries, batch_results):
+        single = search_builds(
+            runes=runes,
+            target="B",
+            constraints=query["constraints"],
+            objective=query.get("objective", "SCORE"),
+            top_n=query["top_n"]
+        )
+        assert results == single
+
+
+def test_search_builds_pareto_front():
+    """PARETO 모드가 (SPD, SCORE) 비지배 집합을 반환하는지 테스트"""
+    runes = []
+    
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        set_id = 8 if slot <= 4 else 4
+        
+        # 같은 슬롯에 속도형 룬과 치피형 룬을 하나씩 둔다
+        runes.append(create_test_rune(
+            slot * 100, slot, set_id, main_stat_id, main_value,
+            [SubStat(9, 20, False, 0), SubStat(8, 10, False, 0)]
+        ))
+        runes.append(create_test_rune(
+            slot * 100 + 1, slot, set_id, main_stat_id, main_value,
+            [SubStat(9, 20, False, 0), SubStat(10, 10, False, 0)]
+        ))
+    
+    results = search_builds(
+        runes=runes,
+        target="B",
+        objective="PARETO",
+        pareto_stats=["SPD", "SCORE"]
+    )
+    
+    points = [(r["pareto_values"]["SPD"], r["pareto_values"]["SCORE"]) for r in results]
+    
+    # 속도 하나를 치피 하나로 바꿀 때마다 점수가 오르므로 7개 지점이 모두 비지배
+    assert sorted(set(points)) == sorted((104 + 10 * k, points[-1][1] - 100 * k) for k in range(7))
+    # 서로 지배하지 않아야 함
+    for a in points:
+        for b in points:
+            assert not (a[0] >= b[0] and a[1] >= b[1] and a != b)
+
+
+def test_search_builds_max_constraints():
+    """MAX_ 최대 조건 테스트 (속도 상한 / 치확 초과 방지)"""
+    runes = []
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        set_id = 8 if slot <= 4 else 4
+        # 빠른 룬: SPD 10 / CR 20, 느린 룬: SPD 0 / CR 16
+        runes.append(create_test_rune(slot * 100, slot, set_id, main_stat_id, main_value,
+                                      [SubStat(9, 20, False, 0), SubStat(8, 10, False, 0)]))
+        runes.append(create_test_rune(slot * 100 + 1, slot, set_id, main_stat_id, main_value,
+                                      [SubStat(9, 16, False, 0), SubStat(10, 5, False, 0)]))
+    
+    all_results = search_builds(runes, target="B", top_n=64, max_results=None)
+    results = search_builds(runes, target="B", constraints={"MAX_SPD": 124}, top_n=64, max_results=None)
+    
+    assert results
+    assert all(104 + r["spd_total"] <= 124 for r in results)
+    assert len(results) == len([r for r in all_results if 104 + r["spd_total"] <= 124])
+    
+    # 치확 초과 방지 + 최소 속도
+    results = search_builds(runes, target="B", constraints={"MAX_CR": 131, "SPD": 124},
+                            top_n=64, max_results=None)
+    # 빠른 룬 정확히 2개 (CR 15 + 12 + 20*2 + 16*4 = 131)
+    assert len(results) == 15
+    assert all(r["cr_total"] <= 131 and 104 + r["spd_total"] >= 124 for r in results)
+    
+    # 만족할 수 없는 최대 조건
+    assert search_builds(runes, target="B", constraints={"MAX_SPD": 103}) == []
+
+
+def test_search_builds_collapses_duplicate_runes():
+    """동등한 룬이 중복 결과 대신 alternatives로 펼쳐지는지 테스트"""
+    runes = []
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        set_id = 8 if slot <= 4 else 4
+        for copy in range(2 if slot <= 2 else 1):
+            runes.append(create_test_rune(slot * 100 + copy, slot, set_id, main_stat_id, main_value,
+                                          [SubStat(9, 20, False, 0)]))
+    
+    results = search_builds(runes, target="B", return_policy="all_at_best", top_n=10)
+    
+    assert len(results) == 1
+    assert results[0]["slots"][1]["alternatives"] == [101]
+    assert results[0]["slots"][2]["alternatives"] == [201]
+    assert results[0]["slots"][3]["alternatives"] == []
+    assert results[0]["equivalent_builds"] == 4
+
+
+def test_search_builds_warm_start_seeds():
+    """시드 빌드로 시작해도 같은 결과를 중복 없이 반환하는지 테스트"""
+    runes = []
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        set_id = 8 if slot <= 4 else 4
+        for i in range(3):
+            runes.append(create_test_rune(slot * 100 + i, slot, set_id, main_stat_id, main_value,
+                                          [SubStat(9, 20, False, 0), SubStat(8, 4 * i, False, 0),
+                                           SubStat(10, 7 - 3 * i, False, 0)]))
+    
+    previous = search_builds(runes, target="B", constraints={"SPD": 120}, top_n=10)
+    cold = search_builds(runes, target="B", constraints={"SPD": 124}, top_n=10)
+    warm = search_builds(runes, target="B", constraints={"SPD": 124}, top_n=10, seeds=previous)
+    
+    assert [r["score"] for r in warm] == [r["score"] for r in cold]
+    builds = [tuple(r["slots"][slot]["rune_id"] for slot in range(1, 7)) for r in warm]
+    assert len(set(builds)) == len(builds)
+    assert all(104 + r["spd_total"] >= 124 for r in warm)
+    
+    # rune_id 시퀀스 시드, 후보가 아닌 룬이 섞인 시드는 무시
+    warm = search_builds(runes, target="B", top_n=3, seeds=[builds[0], (999, 100, 200, 300, 400, 500)])
+    assert [r["score"] for r in warm] == [r["score"] for r in search_builds(runes, target="B", top_n=3)]
+
+
+def brute_force_with_without(runes, target="B", constraints=None):
+    """룬마다 (포함한 최고 스코어, 뺀 최고 스코어), 전체 최고 스코어"""
+    import itertools
+    from src.sw_mcp.optimizer import filter_rune_by_slot
+    from src.sw_mcp.scoring import find_best_intangible_assignment
+    
+    builds = []
+    slots = [filter_rune_by_slot(runes, slot, target) for slot in range(1, 7)]
+    for combo in itertools.product(*slots):
+        _, score, stats = find_best_intangible_assignment(list(combo), target)
+        if score > 0 and all(104 + stats["spd_total"] >= v for v in (constraints or {}).values()):
+            builds.append((score, {rune.rune_id for rune in combo}))
+    values = {
+        rune.rune_id: (max([s for s, ids in builds if rune.rune_id in ids], default=0.0),
+                       max([s for s, ids in builds if rune.rune_id not in ids], default=0.0))
+        for rune in runes
+    }
+    return values, max([s for s, _ in builds], default=0.0)
+
+
+@pytest.mark.parametrize("target,constraints", [("A", None), ("B", None), ("B", {"SPD": 112})])
+def test_rank_rune_values_matches_brute_force(target, constraints):
+    """한 번의 탐색으로 구한 룬별 포함/제외 최고 스코어가 전수 탐색과 같은지 테스트"""
+    from src.sw_mcp.harness import random_inventory
+    
+    for seed in range(3):
+        runes = random_inventory(seed, 5)
+        # 동등한 룬: 하나를 팔아도 최고 스코어가 그대로여야 함
+        twin = random_inventory(seed, 5)[-1]
+        twin.rune_id = 999
+        runes.append(twin)
+        
+        ranking = rank_rune_values(runes, target=target, constraints=constraints, top_n=3)
+        expected, best = brute_force_with_without(runes, target, constraints)
+        
+        assert sorted(r["rune_id"] for r in ranking) == sorted(r.rune_id for r in runes)
+        for entry in ranking:
+            best_with, best_without = expected[entry["rune_id"]]
+            assert entry["best_with"] == best_with
+            assert entry["best_without"] == best_without
+            assert entry["marginal"] == best - best_without
+        marginals = [entry["marginal"] for entry in ranking]
+        assert marginals == sorted(marginals, reverse=True)
+        
+        top = search_builds(runes, target=target, constraints=constraints, top_n=3)
+        in_top = {info["rune_id"] for result in top for info in result["slots"].values()}
+        in_top |= {alt for result in top for info in result["slots"].values() for alt in info["alternatives"]}
+        assert {entry["rune_id"] for entry in ranking if entry["in_top_n"]} == in_top
+
+
+def test_rank_rune_values_window():
+    """window 밖 룬은 None, 최고 빌드 룬의 값은 그대로인지 테스트"""
+    from src.sw_mcp.harness import random_inventory
+    
+    runes = random_inventory(3, 6)
+    exact = {entry["rune_id"]: entry for entry in rank_rune_values(runes)}
+    windowed = rank_rune_values(runes, window=100)
+    best = max(entry["best_with"] for entry in exact.values())
+    
+    assert any(entry["best_with"] is None for entry in windowed)
+    for entry in windowed:
+        reference = exact[entry["rune_id"]]
+        if reference["best_with"] >= best - 100:
+            assert entry["best_with"] == reference["best_with"]
+        else:
+            assert entry["best_with"] in (None, 0.0)
+        if entry["marginal"] is not None:
+            assert entry["marginal"] == reference["marginal"]
+        else:
+            assert reference["marginal"] > 100
+
+
+@pytest.mark.parametrize("query", [
+    {"top_n": 10},
+    {"constraints": {"SPD": 120}, "top_n": 5},
+    {"constraints": {"MAX_SPD": 125, "CD": 160}, "objective": "ATK_TOTAL", "top_n": 5},
+    {"objective": "PARETO", "pareto_stats": ["SPD", "ATK_TOTAL"]},
+])
+def test_search_builds_parametric_matches_per_base(query):
+    """기본 스탯 목록을 한 번에 평가한 결과가 기본 스탯별 search_builds와 같은지 테스트"""
+    runes = random_inventory(5, 10)
+    base_atks = [900, 1100, 750, 900]
+    base_spds = [104, 104, 110, 98]
+    batch = search_builds_parametric(runes, base_atks, base_spds, target="B", **query)
+
+    assert len(batch) == len(base_atks)
+    for atk, spd, results in zip(base_atks, base_spds, batch):
+        single = search_builds(runes, target="B", base_atk=atk, base_spd=spd, **query)
+        assert results == single
+
+
+def test_search_builds_parametric_length_mismatch():
+    """base_spds 길이가 다르면 ValueError"""
+    with pytest.raises(ValueError):
+        search_builds_parametric(random_inventory(0, 4), [900, 1000], [104])
+
+
+def greedy_diverse(results, top_n, min_diff=None, max_reuse=None):
+    """objective 내림차순 결과에서 다양성 조건을 만족하는 빌드를 차례로 고르는 기준 구현"""
+    chosen = []
+    usage = {}
+    for result in results:
+        key = tuple(result["slots"][slot]["rune_id"] for slot in range(1, 7))
+        if min_diff is not None and any(sum(a != b for a, b in zip(key, other)) < min_diff for other in chosen):
+            continue
+        if max_reuse is not None and any(usage.get(rune_id, 0) >= max_reuse for rune_id in key):
+            continue
+        chosen.append(key)
+        for rune_id in key:
+            usage[rune_id] = usage.get(rune_id, 0) + 1
+        if len(chosen) == top_n:
+            break
+    return chosen
+
+
+@pytest.mark.parametrize("options", [
+    {"min_diff": 2},
+    {"min_diff": 4},
+    {"max_reuse": 2},
+    {"min_diff": 3, "max_reuse": 3},
+])
+def test_search_builds_diverse_matches_greedy(options):
+    """다양성 조건 결과가 전체 결과에 대한 탐욕 선택과 같은지 테스트"""
+    for seed in range(2):
+        runes = random_inventory(seed, 8)
+        everything = search_builds(runes, top_n=100000, max_results=None)
+        results = search_builds(runes, top_n=8, **options)
+        keys = [tuple(r["slots"][slot]["rune_id"] for slot in range(1, 7)) for r in results]
+        assert keys == greedy_diverse(everything, 8, **options)
+
+
+@pytest.mark.parametrize("options", [
+    {"min_diff": 0},
+    {"min_diff": 7},
+    {"max_reuse": 0},
+    {"min_diff": 2, "objective": "PARETO"},
+    {"min_diff": 2, "mode": "fast"},
+    {"min_diff": 2, "engine": "mitm"},
+])
+def test_search_builds_diverse_invalid(options):
+    """지원하지 않는 다양성 조건 조합은 ValueError"""
+    with pytest.raises(ValueError):
+        search_builds(random_inventory(0, 4), **options)
@@ -0,0 +1,18 @@
+"""탐색 상태 테스트"""
+
+from src.sw_mcp.state import Frontier, trace_choices
+
+
+def test_frontier_trace_choices():
+    """struct-of-arrays 프런티어에서 선택 경로를 복원하는지 테스트"""
+    root = Frontier.root()
+    level1 = Frontier()
+    level1.append(0, 0, (1.0, 0.0, 0.0, 0.0, 0.0), (1, 0, 0, 0), root)
+    level1.append(0, 1, (2.0, 0.0, 0.0, 0.0, 0.0), (0, 1, 0, 0), root)
+    level2 = Frontier()
+    level2.append(1, 2, (4.0, 1.0, 0.0, 0.0, 0.0), (0, 0, 1, 0), level1)
+    
+    assert len(level2) == 1
+    assert level2.totals(0) == (6.0, 1.0, 0.0, 0.0, 0.0)
+    assert level2.set_counts(0) == (0, 1, 1, 0)
+    assert trace_choices([root, level1, level2], 0) == [1, 2]
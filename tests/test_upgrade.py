@@ -0,0 +1,95 @@
+"""룬 강화 몬테카를로 시뮬레이션 테스트"""
+
+import itertools
+import pytest
+from src.sw_mcp.types import SubStat
+from src.sw_mcp.scoring import find_best_intangible_assignment
+
+pytest.importorskip("numpy")
+
+from src.sw_mcp.upgrade import UpgradeSimulator, rank_upgrade_candidates
+
+
+@pytest.fixture
+def inventory(make_rune):
+    """완성된(+15) Fatal/Blade 룬 슬롯마다 2개"""
+    runes = []
+    for slot in range(1, 7):
+        main_stat_id = 10 if slot == 4 else 4
+        main_value = 80 if slot == 4 else 63
+        for i, set_id in enumerate([8, 4]):
+            runes.append(make_rune(
+                slot * 100 + i, slot, set_id, main_stat_id, main_value,
+                [SubStat(9, 16, False, 0), SubStat(10, 5 + i, False, 0),
+                 SubStat(2, 5, False, 0), SubStat(11, 5, False, 0)]
+            ))
+    return runes
+
+
+def brute_force_best(runes, target="B"):
+    """슬롯별 모든 조합의 최고 스코어"""
+    slots = [[r for r in runes if r.slot == slot] for slot in range(1, 7)]
+    return max(find_best_intangible_assignment(list(combo), target)[1] for combo in itertools.product(*slots))
+
+
+def test_main_stat_only_upgrade_matches_exact_gain(inventory, make_rune):
+    """메인 스탯만 오르는 룬(+12)의 상승폭이 전수 탐색 스코어 차이와 같은지 테스트"""
+    runes = inventory
+    subs = [SubStat(9, 16, False, 0), SubStat(10, 9, False, 0),
+            SubStat(2, 5, False, 0), SubStat(11, 5, False, 0)]
+    candidate = make_rune(999, 4, 8, 10, 40, subs, level=12)
+    upgraded = make_rune(999, 4, 8, 10, 80, subs)
+
+    simulator = UpgradeSimulator(runes + [candidate], target="B", top_builds=100, seed=0)
+    assert simulator.best_score == brute_force_best(runes + [candidate])
+    assert [r.rune_id for r in simulator.candidates()] == [999]
+
+    entry = simulator.simulate(trials=20)[0]
+    expected = brute_force_best(runes + [upgraded]) - simulator.best_score
+    assert expected > 0
+    assert entry["rune_id"] == 999
+    assert entry["expected_gain"] == expected
+    assert entry["max_gain"] == expected
+    assert entry["improve_prob"] == 1.0
+
+
+def test_ranking_prefers_useful_upgrades(inventory, make_rune):
+    """치확/치피 서브가 붙을 여지가 큰 룬이 쓸모없는 룬보다 앞에 오는지 테스트"""
+    runes = inventory
+    # +0 슬롯1 Fatal 룬 (서브 1개): 강화로 치확/치피가 붙을 수 있음
+    promising = make_rune(901, 1, 8, 4, 63, [SubStat(10, 7, False, 0)], level=0)
+    # +9 슬롯5 룬 (서브 4개가 모두 스코어와 무관): 한 번 남은 상승도 스코어에 영향 없음
+    useless = make_rune(902, 5, 8, 4, 63,
+                        [SubStat(2, 5, False, 0), SubStat(11, 5, False, 0),
+                         SubStat(12, 5, False, 0), SubStat(6, 5, False, 0)], level=9)
+
+    ranking = rank_upgrade_candidates(runes + [promising, useless], trials=500, seed=1)
+    assert [r["rune_id"] for r in ranking] == [901, 902]
+    assert ranking[0]["expected_gain"] > 0
+    assert 0 < ranking[0]["improve_prob"] <= 1
+    assert ranking[0]["p90_gain"] <= ranking[0]["max_gain"]
+    assert ranking[1]["expected_gain"] == 0
+
+    # 같은 시드는 같은 결과
+    again = rank_upgrade_candidates(runes + [promising, useless], trials=500, seed=1)
+    assert again == ranking
+
+
+def test_slot3_attack_substat_disqualifies(inventory, make_rune):
+    """슬롯3 룬에 ATK%/ATK+ 서브가 붙는 시행은 상승폭이 0인지 테스트"""
+    runes = inventory
+    # 서브 3개 (+9): 다음 강화에서 새 서브 하나 (ATK%/ATK+가 아니면 치확/치피 외 스탯만 남음)
+    candidate = make_rune(903, 3, 8, 4, 63,
+                          [SubStat(9, 30, False, 0), SubStat(10, 30, False, 0),
+                           SubStat(2, 5, False, 0)], level=9)
+    simulator = UpgradeSimulator(runes + [candidate], seed=2)
+    vec, eligible = simulator._roll([candidate], 400)
+    assert 0 < eligible.mean() < 1
+    entry = simulator.simulate(trials=400, runes=[candidate])[0]
+    assert entry["improve_prob"] <= eligible.mean()
+
+
+def test_invalid_trials(inventory):
+    """trials 검증 테스트"""
+    with pytest.raises(ValueError):
+        UpgradeSimulator(inventory).simulate(trials=0)